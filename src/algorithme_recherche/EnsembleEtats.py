@@ -0,0 +1,143 @@
+from jeu.etatCompact import CodageEtat
+from algorithme_recherche.utile import rang_etat, nombre_motifs, remonter_mouvements
+
+# Nombre maximal d'états atteignables pour lequel la table de bits est choisie automatiquement
+RANGS_MAX = 1 << 24
+
+class EnsembleDict:
+    """
+    @brief Ensemble des états vus, stockés par code compact dans un set
+
+    Les parents, si demandés, sont conservés dans un dictionnaire
+    code -> indice dans DIRECTIONS du déplacement d'arrivée. Convient à toutes
+    les tailles de plateau.
+    """
+    def __init__(self, codage: CodageEtat, code_initial: int, stocker_chemin: bool = False):
+        """
+        @param codage: Codage des états du plateau
+        @param code_initial: Code compact de l'état de départ, marqué comme vu
+        @param stocker_chemin: Conserve le déplacement d'arrivée de chaque état pour reconstruire le chemin
+        """
+        self.codage = codage
+        self.code_initial = code_initial
+        self.vus = {code_initial}
+        self.parents: dict[int, int] | None = {} if stocker_chemin else None
+
+    def ajouter(self, code: int, vide_parent: int, vide: int) -> bool:
+        """
+        @brief Marque un état comme vu
+        @param code: Code compact de l'état
+        @param vide_parent: Case vide de l'état depuis lequel il est atteint
+        @param vide: Case vide de l'état
+        @return: True si l'état n'avait pas encore été vu
+        """
+        if code in self.vus:
+            return False
+        self.vus.add(code)
+        if self.parents is not None:
+            self.parents[code] = self.codage.indices_directions[vide_parent][vide]
+        return True
+
+    def chemin(self, code: int) -> str:
+        """
+        @brief Reconstruit les déplacements depuis l'état de départ
+        @param code: Code compact d'un état vu
+        @return: Lettres de DIRECTIONS, du départ à code
+        """
+        return remonter_mouvements(self.codage, self.parents.__getitem__, code, self.code_initial)
+
+    def __contains__(self, code: int) -> bool:
+        return code in self.vus
+
+    def __len__(self) -> int:
+        return len(self.vus)
+
+class EnsembleRangs:
+    """
+    @brief Ensemble des états vus, marqués par leur rang (voir rang_etat) dans une table de bits
+
+    La table compte un bit par état atteignable (taille! / 2 bits, environ 23 Ko
+    pour le 3x3) au lieu d'un objet entier par état dans un set. Les parents,
+    si demandés, sont la direction (2 bits, indice dans DIRECTIONS) du
+    déplacement de la case vide qui a mené à l'état : le chemin est reconstruit
+    en rejouant les déplacements inverses depuis l'état d'arrivée.
+    Chaque état marqué doit appartenir à la même moitié de l'espace d'états
+    que l'état de départ, ce qui est le cas des états atteints par des mouvements.
+    """
+    def __init__(self, codage: CodageEtat, code_initial: int, stocker_chemin: bool = False):
+        """
+        @param codage: Codage des états du plateau
+        @param code_initial: Code compact de l'état de départ, marqué comme vu
+        @param stocker_chemin: Conserve la direction d'arrivée de chaque état pour reconstruire le chemin
+        """
+        self.codage = codage
+        self.code_initial = code_initial
+        nombre = nombre_motifs(codage.taille - 2, codage.taille)
+        self.bits = bytearray((nombre + 7) >> 3)
+        self.directions = bytearray((nombre + 3) >> 2) if stocker_chemin else None
+        rang = rang_etat(codage.vers_positions(code_initial))
+        self.bits[rang >> 3] |= 1 << (rang & 7)
+        self.taille = 1
+
+    def ajouter(self, code: int, vide_parent: int, vide: int) -> bool:
+        """
+        @brief Marque un état comme vu
+        @param code: Code compact de l'état
+        @param vide_parent: Case vide de l'état depuis lequel il est atteint
+        @param vide: Case vide de l'état
+        @return: True si l'état n'avait pas encore été vu
+        """
+        rang = rang_etat(self.codage.vers_positions(code))
+        octet, bit = rang >> 3, 1 << (rang & 7)
+        if self.bits[octet] & bit:
+            return False
+        self.bits[octet] |= bit
+        self.taille += 1
+        if self.directions is not None:
+            decalage = (rang & 3) << 1
+            self.directions[rang >> 2] |= self.codage.indices_directions[vide_parent][vide] << decalage
+        return True
+
+    def direction_arrivee(self, code: int) -> int:
+        """
+        @brief Indice dans DIRECTIONS du déplacement qui a mené à un état vu
+        """
+        rang = rang_etat(self.codage.vers_positions(code))
+        return (self.directions[rang >> 2] >> ((rang & 3) << 1)) & 3
+
+    def chemin(self, code: int) -> str:
+        """
+        @brief Reconstruit les déplacements depuis l'état de départ
+        @param code: Code compact d'un état vu
+        @return: Lettres de DIRECTIONS, du départ à code
+        """
+        return remonter_mouvements(self.codage, self.direction_arrivee, code, self.code_initial)
+
+    def __contains__(self, code: int) -> bool:
+        rang = rang_etat(self.codage.vers_positions(code))
+        return bool(self.bits[rang >> 3] & (1 << (rang & 7)))
+
+    def __len__(self) -> int:
+        return self.taille
+
+# Implémentations disponibles de l'ensemble des états vus, par nom
+ENSEMBLES = {
+    'set': EnsembleDict,
+    'rangs': EnsembleRangs,
+}
+
+def creer_ensemble(nom: str, codage: CodageEtat, code_initial: int, stocker_chemin: bool = False):
+    """
+    @brief Crée l'ensemble des états vus d'une recherche exhaustive
+    @param nom: 'set', 'rangs' ou 'auto' (table de bits si l'espace d'états compte au plus RANGS_MAX états)
+    @param codage: Codage des états du plateau
+    @param code_initial: Code compact de l'état de départ
+    @param stocker_chemin: Conserve de quoi reconstruire le chemin
+    @return: EnsembleDict ou EnsembleRangs
+    @throws ValueError si le nom est inconnu
+    """
+    if nom == 'auto':
+        nom = 'rangs' if nombre_motifs(codage.taille - 2, codage.taille) <= RANGS_MAX else 'set'
+    if nom not in ENSEMBLES:
+        raise ValueError(f"Ensemble inconnu : {nom} (disponibles : auto, {', '.join(ENSEMBLES)})")
+    return ENSEMBLES[nom](codage, code_initial, stocker_chemin)
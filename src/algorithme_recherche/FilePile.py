@@ -1,36 +1,68 @@
-class Element:
-    """
-    @brief Classe représentant un élément dans la structure de données FilePile
-    
-    Chaque élément contient un contenu et des références vers les éléments précédent et suivant.
-    """
-    def __init__(self, contenu):
-        self.precedent: 'Element | None' = None
-        self.prochain: 'Element | None' = None
-        self.contenu = contenu
+from array import array
+from collections import deque
+
+# Capacité initiale du tampon circulaire d'une FilePile compacte
+CAPACITE_INITIALE = 1024
 
 class FilePile:
     """
     @brief Structure de données hybride pouvant fonctionner comme une file ou une pile
+
+    Les éléments sont retirés au début : ajoutés à la fin ils forment une file,
+    ajoutés au début une pile. Par défaut ils sont conservés dans une deque ;
+    en mode compact ce sont des entiers positifs de 64 bits au plus (codes
+    compacts d'états, voir CodageEtat), rangés dans un tampon circulaire
+    array('Q') qui double de taille lorsqu'il est plein : aucun objet n'est
+    alloué par élément.
     """
-    def __init__(self):
-        self.start: 'Element | None' = None
-        self.end: 'Element | None' = None
-        self.size = 0
+    def __init__(self, compact: bool = False):
+        """
+        @param compact: Stocke des entiers dans un tableau array('Q') au lieu d'objets quelconques (défaut: False)
+        """
+        self.compact = compact
+        if compact:
+            self.tampon = array('Q', bytes(8 * CAPACITE_INITIALE))
+            self.debut = 0
+            self.size = 0
+        else:
+            self.elements: deque = deque()
 
-    def pop(self):
-        """Supprime et retourne l'élément au début de la file/pile."""
-        if not self.start:
-            return None
+    def _reserver(self, nombre: int):
+        """
+        @brief Double la capacité du tampon circulaire jusqu'à pouvoir contenir nombre éléments de plus
+        @param nombre: Nombre d'éléments à ajouter
 
-        contenu = self.start.contenu
-        self.start = self.start.prochain
+        Les éléments sont recopiés dans l'ordre à partir de l'indice 0.
+        """
+        capacite = len(self.tampon)
+        if self.size + nombre <= capacite:
+            return
+        while self.size + nombre > capacite:
+            capacite *= 2
+        tampon = self.tampon[self.debut:] + self.tampon[:self.debut]
+        tampon.extend(array('Q', bytes(8 * (capacite - len(tampon)))))
+        self.tampon = tampon
+        self.debut = 0
 
-        if self.start is None:
-            self.end = None
-        else:
-            self.start.precedent = None
+    def _ecrire(self, indice: int, valeurs: array):
+        """
+        @brief Copie des valeurs dans le tampon circulaire à partir d'un indice, en repartant au début si besoin
+        """
+        capacite = len(self.tampon)
+        fin = min(len(valeurs), capacite - indice)
+        self.tampon[indice:indice + fin] = valeurs[:fin]
+        self.tampon[:len(valeurs) - fin] = valeurs[fin:]
 
+    def pop(self):
+        """Supprime et retourne l'élément au début de la file/pile, None si elle est vide."""
+        if not self.compact:
+            return self.elements.popleft() if self.elements else None
+        if not self.size:
+            return None
+        contenu = self.tampon[self.debut]
+        self.debut += 1
+        if self.debut == len(self.tampon):
+            self.debut = 0
         self.size -= 1
         return contenu
 
@@ -39,16 +71,15 @@ class FilePile:
         @brief Ajoute un élément à la fin de la structure
         @param contenu: L'élément à ajouter
         """
-        elt = Element(contenu)
-        
-        if self.end is None: 
-            self.start = elt
-            self.end = elt
-        else:
-            self.end.prochain = elt
-            elt.precedent = self.end
-            self.end = elt
-        
+        if not self.compact:
+            self.elements.append(contenu)
+            return
+        if self.size == len(self.tampon):
+            self._reserver(1)
+        fin = self.debut + self.size
+        if fin >= len(self.tampon):
+            fin -= len(self.tampon)
+        self.tampon[fin] = contenu
         self.size += 1
 
     def pushFirst(self, contenu):
@@ -56,21 +87,50 @@ class FilePile:
         @brief Ajoute un élément au début de la structure
         @param contenu: L'élément à ajouter
         """
-        elt = Element(contenu)
-        
-        if self.start is None:
-            self.start = elt
-            self.end = elt
-        else:
-            elt.prochain = self.start
-            self.start.precedent = elt
-            self.start = elt 
+        if not self.compact:
+            self.elements.appendleft(contenu)
+            return
+        if self.size == len(self.tampon):
+            self._reserver(1)
+        self.debut = (self.debut or len(self.tampon)) - 1
+        self.tampon[self.debut] = contenu
         self.size += 1
 
+    def extendLast(self, contenus):
+        """
+        @brief Ajoute des éléments à la fin de la structure, dans l'ordre
+        @param contenus: Itérable des éléments à ajouter
+        """
+        if not self.compact:
+            self.elements.extend(contenus)
+            return
+        valeurs = array('Q', contenus)
+        self._reserver(len(valeurs))
+        fin = self.debut + self.size
+        self._ecrire(fin - len(self.tampon) if fin >= len(self.tampon) else fin, valeurs)
+        self.size += len(valeurs)
+
+    def extendFirst(self, contenus):
+        """
+        @brief Ajoute des éléments au début de la structure, un par un
+        @param contenus: Itérable des éléments à ajouter ; le dernier se retrouve en tête
+        """
+        if not self.compact:
+            self.elements.extendleft(contenus)
+            return
+        valeurs = array('Q', contenus)
+        valeurs.reverse()
+        self._reserver(len(valeurs))
+        self.debut -= len(valeurs)
+        if self.debut < 0:
+            self.debut += len(self.tampon)
+        self._ecrire(self.debut, valeurs)
+        self.size += len(valeurs)
+
     def __bool__(self):
         """Retourne True si la file/pile n'est pas vide, sinon False."""
-        return self.start is not None
+        return len(self) > 0
 
     def __len__(self):
         """Retourne la taille de la file/pile."""
-        return self.size
+        return self.size if self.compact else len(self.elements)
@@ -0,0 +1,75 @@
+class FilePriorite:
+    """
+    @brief File de priorité à seaux indexée par une priorité entière
+
+    Pour le jeu de taquin, f = g + h est un entier borné : chaque seau f contient
+    une pile par valeur de g. L'ajout et le retrait se font en O(1) amorti,
+    le retrait privilégiant le plus petit f puis, à f égal, le plus grand g
+    (les nœuds les plus profonds d'abord), en ordre LIFO.
+
+    La suppression est paresseuse : un élément remplacé par un meilleur chemin
+    n'est pas retiré de la file, c'est à l'appelant d'ignorer les entrées
+    périmées au moment du retrait.
+    """
+    def __init__(self):
+        self.seaux: list[list[list]] = []
+        self.nombres: list[int] = []
+        self.g_max: list[int] = []
+        self.f_min = 0
+        self.size = 0
+
+    def push(self, f: int, g: int, contenu) -> None:
+        """
+        @brief Ajoute un élément dans la file
+        @param f: Priorité de l'élément (plus petit = prioritaire)
+        @param g: Profondeur de l'élément (plus grand = prioritaire à f égal)
+        @param contenu: L'élément à ajouter
+        """
+        while f >= len(self.seaux):
+            self.seaux.append([])
+            self.nombres.append(0)
+            self.g_max.append(0)
+
+        piles = self.seaux[f]
+        while g >= len(piles):
+            piles.append([])
+        piles[g].append(contenu)
+
+        self.nombres[f] += 1
+        if g > self.g_max[f]:
+            self.g_max[f] = g
+        if f < self.f_min or self.size == 0:
+            self.f_min = f
+        self.size += 1
+
+    def pop(self):
+        """
+        @brief Supprime et retourne l'élément prioritaire
+        @return: Triplet (f, g, contenu) ou None si la file est vide
+        """
+        if self.size == 0:
+            return None
+
+        f = self.f_min
+        while not self.nombres[f]:
+            f += 1
+        self.f_min = f
+
+        piles = self.seaux[f]
+        g = self.g_max[f]
+        while not piles[g]:
+            g -= 1
+        self.g_max[f] = g
+
+        contenu = piles[g].pop()
+        self.nombres[f] -= 1
+        self.size -= 1
+        return f, g, contenu
+
+    def __bool__(self):
+        """Retourne True si la file n'est pas vide, sinon False."""
+        return self.size > 0
+
+    def __len__(self):
+        """Retourne le nombre d'éléments dans la file (entrées périmées comprises)."""
+        return self.size
@@ -1,12 +1,16 @@
 from jeu.jeuTaquin import JeuTaquin
 import time
-from algorithme_recherche.utile import reconstruire_chemin, key
+from fractions import Fraction
+from algorithme_recherche.utile import remonter_mouvements
+from algorithme_recherche.FilePriorite import FilePriorite
+from algorithme_recherche.heuristiques import obtenir_heuristique
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, LIMITE_TEMPS, LIMITE_NOEUDS, EPUISE
 
-def manhattan_distance(state: dict, k: int) -> int:
+def manhattan_distance(state: dict, etat_final: dict) -> int:
     """
     @brief Calcule la distance de Manhattan pour un état donné
     @param state: Dictionnaire représentant l'état actuel du puzzle
-    @param k: Dimension du puzzle (k x k)
+    @param etat_final: État final désiré
     @return: La distance de Manhattan totale
     
     Calcule la somme des distances de Manhattan de chaque tuile à sa position cible,
@@ -15,8 +19,7 @@ def manhattan_distance(state: dict, k: int) -> int:
     distance = 0
     for value, (x, y) in state.items():
         if value != 0:
-            target_i = (value - 1) // k
-            target_j = (value - 1) % k
+            target_i, target_j = etat_final[value]
             distance += abs(x - target_i) + abs(y - target_j)
             
             if (x, y) != (target_i, target_j):
@@ -24,104 +27,271 @@ def manhattan_distance(state: dict, k: int) -> int:
                 
     return distance
 
-def etat_vers_tuple(etat: dict) -> tuple:
+def lire_poids(poids) -> Fraction:
     """
-    @brief Convertit un état du jeu en tuple
-    @param etat: Dictionnaire représentant l'état du jeu
-    @return: Tuple représentant l'état du jeu
-    
-    Convertit un dictionnaire d'état en tuple pour permettre son utilisation comme clé de dictionnaire.
+    @brief Convertit un poids d'heuristique en fraction p/q de petit dénominateur
+    @param poids: Poids (entier, flottant, chaîne comme "1.5" ou "3/2", ou Fraction)
+    @return: Fraction au dénominateur d'au plus 100
+    @throws ValueError si le poids est inférieur à 1
+
+    La priorité q·g + p·h reste ainsi un entier borné, utilisable comme indice
+    de FilePriorite.
     """
-    return tuple(etat[i] for i in range(len(etat)))
+    poids = Fraction(poids).limit_denominator(100)
+    if poids < 1:
+        raise ValueError(f"Le poids de l'heuristique doit être au moins 1 : {poids}")
+    return poids
 
-def astar(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, limite_temps: float = 40.0, max_noeuds: int = 100000, stocker_chemin: bool = False):
+def _successeurs(codage, fonction_h, code: int, vide: int) -> list:
+    """
+    @brief Successeurs d'un état avec la variation de l'heuristique de chacun
+    @return: Liste de triplets (code, case vide, variation de h)
+    """
+    if fonction_h.table is not None:
+        return codage.successeurs_heuristique(code, vide, fonction_h.table)
+    positions = codage.vers_positions(code)
+    return [(code_suivant, vide_suivant, fonction_h.variation(positions, codage.valeur(code, vide_suivant), vide))
+            for code_suivant, vide_suivant in codage.successeurs(code, vide)]
+
+def astar(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, limite_temps: float = 40.0, max_noeuds: int | None = None, stocker_chemin: bool = False, verifier_heuristique: bool = False, heuristique: str = "manhattan_penalite",
+          statistiques: StatistiquesRecherche | None = None, poids=1):
     """
     @brief Implémente l'algorithme A* pour résoudre le jeu de taquin
     @param jeu: Instance de la classe JeuTaquin
     @param etat_initial: État initial du puzzle
     @param etat_final: État final désiré
     @param limite_temps: Temps maximum d'exécution en secondes (défaut: 40.0)
-    @param max_noeuds: Nombre maximum de nœuds à explorer par itération (défaut: 100000)
+    @param max_noeuds: Nombre maximum de nœuds développés, sans limite si None (défaut: None)
     @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param verifier_heuristique: Compare chaque mise à jour incrémentale de h au calcul complet (défaut: False)
+    @param heuristique: Nom de l'heuristique, voir heuristiques.HEURISTIQUES (défaut: "manhattan_penalite")
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @param poids: Poids w de l'heuristique, f = g + w·h, voir lire_poids (défaut: 1, recherche optimale)
     @return: État final si trouvé, None sinon
+    @throws ValueError si verifier_heuristique détecte une incohérence ou si le poids est inférieur à 1
     
-    Utilise l'algorithme A* avec une heuristique de distance de Manhattan pour trouver
-    le chemin optimal de l'état initial à l'état final. Inclut des mécanismes de
-    gestion de la mémoire et du temps d'exécution.
+    Utilise l'algorithme A* avec une heuristique (par défaut la distance de Manhattan) pour trouver
+    le chemin optimal de l'état initial à l'état final. Avec un poids w > 1 et une
+    heuristique admissible et cohérente, la solution est au plus w fois plus longue
+    que l'optimum mais bien moins de nœuds sont développés ; la borne est reportée
+    dans jeu.statistiques.borne.
+    Les états sont manipulés sous forme compacte (voir CodageEtat) et la frontière
+    est une file à seaux indexée par f (voir FilePriorite). L'heuristique d'un
+    successeur est mise à jour à partir de celle de son parent.
     """
     temps_debut = time.time()
-    noeuds_explores = 0
-    max_noeuds_dynamique = max_noeuds
-    branches_a_explorer = [] 
+    poids = lire_poids(poids)
+    p, q = poids.numerator, poids.denominator
+    developpes = 0
+    generes = 0
+    doublons = 0
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("astar")
+    jeu.statistiques = statistiques
+    prochain_releve = 0
     
-    etats_a_explorer = {}
+    codage = jeu.codage
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+
+    etats_a_explorer = FilePriorite()
     visites = set()  
-    couts_g = {etat_vers_tuple(etat_initial): 0}
+    couts_g = {code_initial: 0}
     
-    h_initial = manhattan_distance(etat_initial, jeu.get_k())
-    cle_etat_initiale = etat_vers_tuple(etat_initial)
-    etats_a_explorer[h_initial] = {cle_etat_initiale: (etat_initial, 0, h_initial)}
+    fonction_h = obtenir_heuristique(heuristique, codage, etat_final)
+    h_initial = fonction_h.evaluer_code(code_initial)
+    # Priorité entière q·g + p·h, proportionnelle à g + w·h
+    etats_a_explorer.push(p * h_initial, 0, (code_initial, codage.case_vide(code_initial), h_initial))
     
-    parent_states: dict[str, str | None] = {key(etat_initial): None} if stocker_chemin else {}
+    # Déplacement d'arrivée de chaque état (indice dans DIRECTIONS), le parent s'en déduit
+    parent_states: dict[int, int] = {}
 
     while etats_a_explorer:
         temps_actuel = time.time()
         temps_ecoule = temps_actuel - temps_debut
         
         if temps_ecoule > limite_temps:
+            statistiques.releve(developpes, generes, doublons, len(etats_a_explorer), len(visites))
+            statistiques.terminer(LIMITE_TEMPS)
             print(f"Limite de temps dépassée ({limite_temps} secondes)")
             return None
         
-        if noeuds_explores >= max_noeuds_dynamique:
-            branches_a_explorer.append((etats_a_explorer, visites, couts_g, parent_states))
-            
-            if branches_a_explorer:
-                etats_a_explorer, visites, couts_g, parent_states = branches_a_explorer.pop(0)
-                max_noeuds_dynamique += int(max_noeuds_dynamique * 0.15)
-            noeuds_explores = 0
-            continue
-        
-        score_f_min = min(etats_a_explorer.keys())
-        etats_possibles = etats_a_explorer[score_f_min] 
+        if max_noeuds is not None and developpes >= max_noeuds:
+            statistiques.releve(developpes, generes, doublons, len(etats_a_explorer), len(visites))
+            statistiques.terminer(LIMITE_NOEUDS)
+            print(f"Nombre maximum de nœuds dépassé ({max_noeuds})")
+            return None
         
-        cle_courante, (etat_courant, g_courant, f_courant) = etats_possibles.popitem()
-        noeuds_explores += 1
+        f_courant, g_courant, (code_courant, vide_courant, h_courant) = etats_a_explorer.pop()
         
-        if not etats_possibles:
-            del etats_a_explorer[score_f_min]
+        # Entrée périmée : l'état a déjà été développé ou atteint par un chemin plus court
+        if code_courant in visites or g_courant > couts_g[code_courant]:
+            continue
+        developpes += 1
+        if developpes >= prochain_releve:
+            prochain_releve = statistiques.releve(developpes, generes, doublons, len(etats_a_explorer), len(visites))
         
-        if etat_courant == etat_final:
+        if code_courant == code_final:
+            statistiques.releve(developpes, generes, doublons, len(etats_a_explorer), len(visites))
+            statistiques.terminer(RESOLU, g_courant, float(poids) if fonction_h.admissible else None)
             if stocker_chemin:
-                jeu.solution_path = reconstruire_chemin(parent_states, key(etat_courant))
-            return etat_courant
-        
-        visites.add(cle_courante)
+                jeu.enregistrer_solution(etat_initial, remonter_mouvements(codage, parent_states.__getitem__, code_courant, code_initial))
+            return codage.decoder(code_courant)
         
-        jeu.set_current_state(etat_courant)
-        mouvements_possibles = jeu.get_possible_moves()
+        visites.add(code_courant)
         
-        for etat_suivant in mouvements_possibles:
-            cle_suivante = etat_vers_tuple(etat_suivant)
+        for code_suivant, vide_suivant, delta_h in _successeurs(codage, fonction_h, code_courant, vide_courant):
             new_g_score = g_courant + 1 
+            generes += 1
             
-            h_suivant = manhattan_distance(etat_suivant, jeu.get_k())
-            f_suivant = new_g_score + h_suivant
-            
-            if cle_suivante in visites:
+            if code_suivant in visites:
+                doublons += 1
                 continue
             
-            if cle_suivante not in couts_g or new_g_score < couts_g[cle_suivante]:
-                couts_g[cle_suivante] = new_g_score
+            if code_suivant not in couts_g or new_g_score < couts_g[code_suivant]:
+                couts_g[code_suivant] = new_g_score
+                
+                h_suivant = h_courant + delta_h
+                if verifier_heuristique and h_suivant != fonction_h.evaluer_code(code_suivant):
+                    raise ValueError(f"Heuristique incrémentale incohérente : {h_suivant} au lieu de {fonction_h.evaluer_code(code_suivant)}")
+                f_suivant = q * new_g_score + p * h_suivant
                 
                 if stocker_chemin:
-                    parent_states[key(etat_suivant)] = key(etat_courant)
+                    parent_states[code_suivant] = codage.indices_directions[vide_courant][vide_suivant]
                 
-                if f_suivant not in etats_a_explorer:
-                    etats_a_explorer[f_suivant] = {}
-                etats_a_explorer[f_suivant][cle_suivante] = (etat_suivant, new_g_score, f_suivant)
+                etats_a_explorer.push(f_suivant, new_g_score, (code_suivant, vide_suivant, h_suivant))
+            else:
+                doublons += 1
     
+    statistiques.releve(developpes, generes, doublons, 0, len(visites))
+    statistiques.terminer(EPUISE)
     print("Aucune solution trouvée dans les limites imposées avec A*")
     return None
 
+def arastar(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, limite_temps: float = 40.0, stocker_chemin: bool = False, heuristique: str = "linear_conflict",
+            statistiques: StatistiquesRecherche | None = None, poids=3, pas=0.5):
+    """
+    @brief Implémente A* à poids décroissants (ARA*), qui améliore sa solution jusqu'à la limite de temps
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param limite_temps: Temps maximum d'exécution en secondes (défaut: 40.0)
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param heuristique: Nom de l'heuristique, voir heuristiques.HEURISTIQUES (défaut: "linear_conflict")
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @param poids: Poids de l'heuristique de la première recherche, voir lire_poids (défaut: 3)
+    @param pas: Diminution du poids entre deux recherches (défaut: 0.5)
+    @return: État final si une solution a été trouvée, None sinon
+    @throws ValueError si le poids est inférieur à 1 ou le pas n'est pas positif
+
+    Une première recherche pondérée (f = g + w·h) trouve vite une solution,
+    puis le poids diminue de pas en pas jusqu'à 1. Chaque recherche reprend la
+    frontière de la précédente : seuls les états dont le coût g a diminué après
+    leur développement (liste des incohérents) sont rouverts, une fois par
+    recherche. À l'expiration du temps, la meilleure solution trouvée est
+    retenue avec sa borne de sous-optimalité, min(w, longueur / min(g + h))
+    sur les états en attente, w étant le poids de la dernière recherche menée
+    à son terme ; la borne est reportée dans jeu.statistiques.borne et n'est
+    garantie que pour une heuristique admissible et cohérente.
+    """
+    temps_debut = time.time()
+    poids = lire_poids(poids)
+    pas = Fraction(pas).limit_denominator(100)
+    if pas <= 0:
+        raise ValueError(f"Le pas de diminution du poids doit être positif : {pas}")
+    developpes = 0
+    generes = 0
+    doublons = 0
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("arastar")
+    jeu.statistiques = statistiques
+    prochain_releve = 0
+
+    codage = jeu.codage
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+    fonction_h = obtenir_heuristique(heuristique, codage, etat_final)
+
+    couts_g = {code_initial: 0}
+    parent_states: dict[int, int] = {}
+    # États en attente de développement : code -> (case vide, h)
+    en_attente = {code_initial: (codage.case_vide(code_initial), fonction_h.evaluer_code(code_initial))}
+    longueur = None
+    mouvements = ''
+    borne = None
+    # Poids de la dernière recherche menée à son terme, qui borne aussi la sous-optimalité
+    poids_garanti = None
+    temps_depasse = False
+
+    while True:
+        # Nouvelle recherche : la frontière est reconstruite avec les priorités du poids courant
+        p, q = poids.numerator, poids.denominator
+        etats_a_explorer = FilePriorite()
+        for code, (vide, h) in en_attente.items():
+            etats_a_explorer.push(q * couts_g[code] + p * h, couts_g[code], (code, vide, h))
+        fermes = set()
+        incoherents = {}
+
+        while etats_a_explorer:
+            if time.time() - temps_debut > limite_temps:
+                temps_depasse = True
+                break
+            f_courant, g_courant, (code_courant, vide_courant, h_courant) = etats_a_explorer.pop()
+            if code_courant in fermes or g_courant > couts_g[code_courant]:
+                continue
+            # La recherche s'arrête dès que la solution connue est au moins aussi prioritaire que tout état en attente
+            if code_final in couts_g and q * couts_g[code_final] <= f_courant:
+                etats_a_explorer.push(f_courant, g_courant, (code_courant, vide_courant, h_courant))
+                break
+            fermes.add(code_courant)
+            developpes += 1
+            if developpes >= prochain_releve:
+                prochain_releve = statistiques.releve(developpes, generes, doublons, len(etats_a_explorer), len(couts_g))
+
+            for code_suivant, vide_suivant, delta_h in _successeurs(codage, fonction_h, code_courant, vide_courant):
+                new_g_score = g_courant + 1
+                generes += 1
+                if code_suivant in couts_g and new_g_score >= couts_g[code_suivant]:
+                    doublons += 1
+                    continue
+                couts_g[code_suivant] = new_g_score
+                parent_states[code_suivant] = codage.indices_directions[vide_courant][vide_suivant]
+                h_suivant = h_courant + delta_h
+                if code_suivant in fermes:
+                    incoherents[code_suivant] = (vide_suivant, h_suivant)
+                else:
+                    etats_a_explorer.push(q * new_g_score + p * h_suivant, new_g_score, (code_suivant, vide_suivant, h_suivant))
+
+        if code_final in couts_g and (longueur is None or couts_g[code_final] < longueur):
+            longueur = couts_g[code_final]
+            if stocker_chemin:
+                mouvements = remonter_mouvements(codage, parent_states.__getitem__, code_final, code_initial)
+
+        # États en attente de la recherche suivante : frontière non développée et incohérents
+        en_attente = incoherents
+        while etats_a_explorer:
+            _, g_courant, (code, vide, h) = etats_a_explorer.pop()
+            if code not in fermes and g_courant == couts_g[code]:
+                en_attente[code] = (vide, h)
 
+        if longueur is not None:
+            minimum = min((couts_g[code] + h for code, (_, h) in en_attente.items()), default=longueur)
+            if not temps_depasse:
+                poids_garanti = poids
+            borne = Fraction(1) if minimum >= longueur else Fraction(longueur, minimum)
+            if poids_garanti is not None:
+                borne = min(borne, poids_garanti)
+            print(f"Solution de {longueur} mouvements, au plus {float(borne):.3g} fois l'optimum (poids {float(poids):.3g})")
+        if temps_depasse or borne == 1 or poids == 1 or not en_attente:
+            break
+        poids = max(Fraction(1), poids - pas)
 
+    statistiques.releve(developpes, generes, doublons, len(en_attente), len(couts_g))
+    if longueur is None:
+        statistiques.terminer(LIMITE_TEMPS if temps_depasse else EPUISE)
+        print(f"Limite de temps dépassée ({limite_temps} secondes)" if temps_depasse else "Aucune solution trouvée avec ARA*")
+        return None
+    statistiques.terminer(RESOLU, longueur, float(borne) if fonction_h.admissible else None)
+    if stocker_chemin:
+        jeu.enregistrer_solution(etat_initial, mouvements)
+    return codage.decoder(code_final)
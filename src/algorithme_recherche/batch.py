@@ -0,0 +1,68 @@
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from jeu.jeuTaquin import JeuTaquin
+from algorithme_recherche.solveurs import resoudre
+
+def ignorer_interruption() -> None:
+    """
+    @brief Initialisation des processus de travail : Ctrl-C n'est traité que par le processus principal
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+def resoudre_instance(dimensions: tuple, code_initial: int, code_final: int, algorithme: str, limite_temps: float | None, options: dict) -> tuple:
+    """
+    @brief Résout une instance transmise sous forme compacte (exécuté dans un processus de travail)
+    @param dimensions: Couple (lignes, colonnes) du plateau
+    @param code_initial: Code compact de l'état initial (voir CodageEtat)
+    @param code_final: Code compact de l'état final
+    @param algorithme: Nom de l'algorithme (voir solveurs.ALGORITHMES)
+    @param limite_temps: Temps maximum accordé à la tâche en secondes, None pour aucune limite
+    @param options: Paramètres supplémentaires transmis à l'algorithme
+    @return: Triplet (résolu, temps d'exécution, statistiques de la recherche sous forme de dictionnaire)
+    """
+    jeu = JeuTaquin(*dimensions)
+    etat_initial = jeu.decoder_etat(code_initial)
+    etat_final = jeu.decoder_etat(code_final)
+    if limite_temps is not None:
+        options = {**options, 'limite_temps': limite_temps}
+    debut = time.time()
+    resultat = resoudre(algorithme, jeu, etat_initial, etat_final, **options)
+    temps = time.time() - debut
+    statistiques = jeu.statistiques.en_dict() if jeu.statistiques is not None else None
+    return resultat is not None, temps, statistiques
+
+def solve_batch(instances: list, algorithms: list, workers: int | None = None, timeout: float | None = None, options: dict | None = None):
+    """
+    @brief Résout un lot d'instances en parallèle sur un ensemble de processus
+    @param instances: Liste de triplets ((lignes, colonnes), code initial, code final) sous forme compacte
+    @param algorithms: Noms des algorithmes à lancer sur chaque instance
+    @param workers: Nombre de processus (défaut: nombre de cœurs)
+    @param timeout: Temps maximum par tâche en secondes, transmis à l'algorithme (défaut: None)
+    @param options: Paramètres supplémentaires par algorithme, {nom: {paramètre: valeur}}
+    @return: Générateur de dictionnaires {'instance', 'algorithme', 'resolu', 'temps', 'statistiques', 'erreur'}
+
+    Chaque couple (instance, algorithme) est une tâche indépendante et les
+    résultats sont produits au fur et à mesure qu'ils se terminent. En cas
+    d'interruption (Ctrl-C), les tâches en attente sont annulées, celles en cours
+    se terminent dans leur limite de temps et KeyboardInterrupt est propagée :
+    l'appelant conserve les résultats déjà reçus.
+    """
+    options = options or {}
+    executeur = ProcessPoolExecutor(max_workers=workers, initializer=ignorer_interruption)
+    try:
+        taches = {}
+        for indice, (dimensions, code_initial, code_final) in enumerate(instances):
+            for algorithme in algorithms:
+                tache = executeur.submit(resoudre_instance, dimensions, code_initial, code_final, algorithme, timeout, options.get(algorithme, {}))
+                taches[tache] = (indice, algorithme)
+
+        for tache in as_completed(taches):
+            indice, algorithme = taches[tache]
+            try:
+                resolu, temps, statistiques = tache.result()
+                yield {'instance': indice, 'algorithme': algorithme, 'resolu': resolu, 'temps': temps, 'statistiques': statistiques, 'erreur': None}
+            except Exception as e:
+                yield {'instance': indice, 'algorithme': algorithme, 'resolu': False, 'temps': float('inf'), 'statistiques': None, 'erreur': str(e)}
+    finally:
+        executeur.shutdown(wait=False, cancel_futures=True)
@@ -1,54 +1,177 @@
 from jeu.jeuTaquin import JeuTaquin
+import time
 from algorithme_recherche.FilePile import FilePile
-from algorithme_recherche.utile import key, reconstruire_chemin
+from jeu.etatCompact import DIRECTIONS, OPPOSES
+from algorithme_recherche.utile import remonter_mouvements
+from algorithme_recherche.EnsembleEtats import creer_ensemble
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, LIMITE_TEMPS, EPUISE
 
-def bfs(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, stocker_chemin: bool = False):
+def bfs(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, stocker_chemin: bool = False, limite_temps: float | None = None,
+        statistiques: StatistiquesRecherche | None = None, ensemble: str = "auto"):
     """
     @brief Implémente l'algorithme de parcours en largeur
     @param jeu: Instance de la classe JeuTaquin
     @param etat_initial: État initial du puzzle
     @param etat_final: État final désiré
     @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param limite_temps: Temps maximum d'exécution en secondes, sans limite si None (défaut: None)
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @param ensemble: Stockage des états vus, 'set', 'rangs' ou 'auto', voir EnsembleEtats.creer_ensemble (défaut: "auto")
     @return: État final si trouvé, None sinon
     
     Explore systématiquement tous les états possibles niveau par niveau jusqu'à
     trouver l'état final ou épuiser tous les états possibles.
+    Les états sont manipulés sous forme compacte (voir CodageEtat).
     """
-    visites = set()
-    file = FilePile()
+    temps_debut = time.time()
+    noeuds_explores = 0
+    generes = 0
+    doublons = 0
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("bfs")
+    jeu.statistiques = statistiques
+    prochain_releve = 0
+    codage = jeu.codage
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
 
-    file.pushLast(etat_initial)
-    cle_depart = key(etat_initial)
-    visites.add(cle_depart)
-    
-    parents: dict[str, str | None] | None = {cle_depart: None} if stocker_chemin else None
+    visites = creer_ensemble(ensemble, codage, code_initial, stocker_chemin)
+    # Si le code et la case vide tiennent ensemble sur 64 bits, la file les range
+    # dans un tableau d'entiers (case vide dans les bits de poids faible)
+    bits_vide = (codage.taille - 1).bit_length()
+    masque_vide = (1 << bits_vide) - 1
+    compact = codage.bits * codage.taille + bits_vide <= 64
+    file = FilePile(compact)
+
+    vide_initial = codage.case_vide(code_initial)
+    file.pushLast((code_initial << bits_vide) | vide_initial if compact else (code_initial, vide_initial))
+    # La file ne contient que deux niveaux consécutifs : restants compte les états du niveau courant
+    profondeur = -1
+    restants = 0
 
     while file:
-        etat_actuel = file.pop()
-        if etat_actuel is None:
-            continue
-            
-        cle_courante = key(etat_actuel)
-        
-        jeu.set_current_state(etat_actuel)
-
-        if etat_actuel == etat_final:
-            if stocker_chemin and parents is not None:
-                jeu.solution_path = reconstruire_chemin(parents, cle_courante)
-            return etat_actuel
-
-        mouvements_possibles = jeu.get_possible_moves()
-        
-        for etat_suivant in mouvements_possibles:
-            cle_suivante = key(etat_suivant)
-            
-            if cle_suivante not in visites:
-                visites.add(cle_suivante)
-                if stocker_chemin and parents is not None:
-                    parents[cle_suivante] = cle_courante
-                file.pushLast(etat_suivant)
+        if not restants:
+            profondeur += 1
+            restants = len(file)
+        restants -= 1
+        element_retire = file.pop()
+        if compact:
+            code_courant, vide_courant = element_retire >> bits_vide, element_retire & masque_vide
+        else:
+            code_courant, vide_courant = element_retire
+        noeuds_explores += 1
+        if noeuds_explores >= prochain_releve:
+            prochain_releve = statistiques.releve(noeuds_explores, generes, doublons, len(file), len(visites))
+        if limite_temps is not None and noeuds_explores & 0xFFF == 0 and time.time() - temps_debut > limite_temps:
+            statistiques.releve(noeuds_explores, generes, doublons, len(file), len(visites))
+            statistiques.terminer(LIMITE_TEMPS)
+            print(f"Limite de temps dépassée ({limite_temps} secondes)")
+            return None
+
+        if code_courant == code_final:
+            statistiques.releve(noeuds_explores, generes, doublons, len(file), len(visites))
+            statistiques.terminer(RESOLU, profondeur)
+            if stocker_chemin:
+                jeu.enregistrer_solution(etat_initial, visites.chemin(code_courant))
+            return codage.decoder(code_courant)
+
+        suivants = []
+        for code_suivant, vide_suivant in codage.successeurs(code_courant, vide_courant):
+            generes += 1
+            if visites.ajouter(code_suivant, vide_courant, vide_suivant):
+                suivants.append((code_suivant << bits_vide) | vide_suivant if compact else (code_suivant, vide_suivant))
+            else:
+                doublons += 1
+        file.extendLast(suivants)
 
+    statistiques.releve(noeuds_explores, generes, doublons, 0, len(visites))
+    statistiques.terminer(EPUISE)
     print("État final non trouvé avec bfs!")
     return None
 
+def bidirectional_bfs(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, stocker_chemin: bool = False, limite_temps: float | None = None,
+                      statistiques: StatistiquesRecherche | None = None):
+    """
+    @brief Implémente un parcours en largeur bidirectionnel
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param limite_temps: Temps maximum d'exécution en secondes, sans limite si None (défaut: None)
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @return: État final si trouvé, None sinon
+
+    Fait croître deux frontières, l'une depuis l'état initial et l'autre depuis
+    l'état final, en développant toujours un niveau complet de la plus petite.
+    Dès qu'un niveau rencontre l'autre recherche, le meilleur point de rencontre
+    de ce niveau donne un chemin optimal. Le nombre d'états explorés est de
+    l'ordre de b^(d/2) au lieu de b^d.
+    """
+    temps_debut = time.time()
+    noeuds_explores = 0
+    generes = 0
+    doublons = 0
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("bibfs")
+    jeu.statistiques = statistiques
+    prochain_releve = 0
+    codage = jeu.codage
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+
+    # Pour chaque sens : distance de chaque état vu et, si demandé, le déplacement qui y a mené depuis l'origine
+    distances = ({code_initial: 0}, {code_final: 0})
+    parents: tuple | None = ({}, {}) if stocker_chemin else None
+    frontieres = ([(code_initial, codage.case_vide(code_initial))], [(code_final, codage.case_vide(code_final))])
+
+    rencontre = code_initial if code_initial == code_final else None
+    meilleur = 0
+    while rencontre is None and frontieres[0] and frontieres[1]:
+        sens = 0 if len(frontieres[0]) <= len(frontieres[1]) else 1
+        vus, autres = distances[sens], distances[1 - sens]
+        parents_sens = parents[sens] if parents is not None else None
+
+        meilleur = None
+        suivante = []
+        for code_courant, vide_courant in frontieres[sens]:
+            profondeur = vus[code_courant] + 1
+            noeuds_explores += 1
+            if noeuds_explores >= prochain_releve:
+                prochain_releve = statistiques.releve(noeuds_explores, generes, doublons, len(frontieres[0]) + len(frontieres[1]) + len(suivante),
+                                                      len(distances[0]) + len(distances[1]))
+            if limite_temps is not None and noeuds_explores & 0xFFF == 0 and time.time() - temps_debut > limite_temps:
+                statistiques.terminer(LIMITE_TEMPS)
+                print(f"Limite de temps dépassée ({limite_temps} secondes)")
+                return None
+            for code_suivant, vide_suivant in codage.successeurs(code_courant, vide_courant):
+                generes += 1
+                if code_suivant in vus:
+                    doublons += 1
+                    continue
+                vus[code_suivant] = profondeur
+                if parents_sens is not None:
+                    parents_sens[code_suivant] = codage.indices_directions[vide_courant][vide_suivant]
+                if code_suivant in autres:
+                    longueur = profondeur + autres[code_suivant]
+                    if meilleur is None or longueur < meilleur:
+                        meilleur, rencontre = longueur, code_suivant
+                suivante.append((code_suivant, vide_suivant))
+        frontieres = (suivante, frontieres[1]) if sens == 0 else (frontieres[0], suivante)
+
+    statistiques.releve(noeuds_explores, generes, doublons, len(frontieres[0]) + len(frontieres[1]), len(distances[0]) + len(distances[1]))
+    if rencontre is None:
+        statistiques.terminer(EPUISE)
+        print("État final non trouvé avec bfs bidirectionnel!")
+        return None
+    statistiques.terminer(RESOLU, meilleur)
 
+    if stocker_chemin and parents is not None:
+        mouvements = [remonter_mouvements(codage, parents[0].__getitem__, rencontre, code_initial)]
+        # La recherche arrière a atteint la rencontre depuis l'état final : on refait ses déplacements à l'envers
+        code, vide = rencontre, codage.case_vide(rencontre)
+        while code != code_final:
+            direction = OPPOSES[DIRECTIONS[parents[1][code]]]
+            mouvements.append(direction)
+            code, vide = codage.deplacer(code, vide, direction)
+        jeu.enregistrer_solution(etat_initial, ''.join(mouvements))
+    return codage.decoder(code_final)
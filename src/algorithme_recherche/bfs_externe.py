@@ -0,0 +1,270 @@
+import heapq
+import mmap
+import os
+import shutil
+import sys
+import tempfile
+import time
+from array import array
+from jeu.jeuTaquin import JeuTaquin, lire_dimensions
+from jeu.etatCompact import CodageEtat, OPPOSES
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, LIMITE_TEMPS, EPUISE
+
+# Mémoire de travail par défaut, en octets
+MEMOIRE_DEFAUT = 256 * 1024 * 1024
+# Coût approximatif d'un état dans le set Python d'un bloc en mémoire (entrée du set et entier)
+OCTETS_PAR_ETAT = 100
+# Nombre d'états lus ou écrits d'un coup dans les fichiers
+TAILLE_TAMPON = 1 << 16
+
+def lire_codes(chemin: str):
+    """
+    @brief Parcourt un fichier de codes compacts (entiers non signés de 64 bits) projeté en mémoire
+    @param chemin: Fichier écrit par ecrire_codes ou fusionner
+    @return: Générateur des codes, dans l'ordre du fichier
+    """
+    if os.path.getsize(chemin) == 0:
+        return
+    with open(chemin, 'rb') as fichier, mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as donnees:
+        codes = memoryview(donnees).cast('Q')
+        try:
+            for debut in range(0, len(codes), TAILLE_TAMPON):
+                yield from codes[debut:debut + TAILLE_TAMPON].tolist()
+        finally:
+            codes.release()
+
+def ecrire_codes(chemin: str, codes) -> int:
+    """
+    @brief Écrit des codes compacts dans un fichier, par tampons
+    @param chemin: Fichier à créer
+    @param codes: Itérable de codes
+    @return: Nombre de codes écrits
+    """
+    nombre = 0
+    tampon = array('Q')
+    with open(chemin, 'wb') as fichier:
+        for code in codes:
+            tampon.append(code)
+            if len(tampon) >= TAILLE_TAMPON:
+                tampon.tofile(fichier)
+                nombre += len(tampon)
+                del tampon[:]
+        tampon.tofile(fichier)
+        nombre += len(tampon)
+    return nombre
+
+def contient(chemin: str, code: int) -> bool:
+    """
+    @brief Recherche dichotomique d'un code dans un fichier trié
+    """
+    if os.path.getsize(chemin) == 0:
+        return False
+    with open(chemin, 'rb') as fichier, mmap.mmap(fichier.fileno(), 0, access=mmap.ACCESS_READ) as donnees:
+        codes = memoryview(donnees).cast('Q')
+        try:
+            bas, haut = 0, len(codes)
+            while bas < haut:
+                milieu = (bas + haut) // 2
+                if codes[milieu] < code:
+                    bas = milieu + 1
+                else:
+                    haut = milieu
+            return bas < len(codes) and codes[bas] == code
+        finally:
+            codes.release()
+
+def fusionner(morceaux: list, exclus: list):
+    """
+    @brief Fusionne des fichiers triés en retirant les doublons et les codes des fichiers exclus
+    @param morceaux: Fichiers triés de codes candidats
+    @param exclus: Fichiers triés de codes à écarter (niveaux précédents)
+    @return: Générateur des codes distincts, triés, absents des fichiers exclus
+
+    C'est la détection différée des doublons : les successeurs sont d'abord
+    écrits sans vérification, puis comparés en un seul passage séquentiel aux
+    niveaux déjà connus.
+    """
+    exclusion = heapq.merge(*(lire_codes(chemin) for chemin in exclus))
+    suivant_exclu = next(exclusion, None)
+    precedent = None
+    for code in heapq.merge(*(lire_codes(chemin) for chemin in morceaux)):
+        if code == precedent:
+            continue
+        precedent = code
+        while suivant_exclu is not None and suivant_exclu < code:
+            suivant_exclu = next(exclusion, None)
+        if suivant_exclu != code:
+            yield code
+
+def explorer_niveaux(codage: CodageEtat, code_initial: int, code_final: int | None = None, repertoire: str | None = None,
+                     memoire: int = MEMOIRE_DEFAUT, profondeur_max: int | None = None, limite_temps: float | None = None,
+                     conserver: bool = False, rappel=None):
+    """
+    @brief Parcours en largeur sur disque : chaque niveau est un fichier trié de codes compacts
+    @param codage: Codage des états du plateau (au plus 64 bits par code)
+    @param code_initial: Code compact de l'état de départ
+    @param code_final: Code compact de l'état recherché, parcours complet si None (défaut: None)
+    @param repertoire: Répertoire de travail, répertoire temporaire si None (défaut: None)
+    @param memoire: Mémoire de travail en octets, qui fixe la taille des blocs triés en mémoire (défaut: MEMOIRE_DEFAUT)
+    @param profondeur_max: Dernier niveau à construire, sans limite si None (défaut: None)
+    @param limite_temps: Temps maximum d'exécution en secondes, sans limite si None (défaut: None)
+    @param conserver: Garde tous les fichiers de niveaux au lieu des deux derniers (défaut: False)
+    @param rappel: Fonction appelée avec (profondeur, taille) à chaque niveau terminé (défaut: None)
+    @return: Tuple (tailles des niveaux, profondeur de code_final ou None, fichiers des niveaux conservés, raison de fin)
+    @throws ValueError si les codes dépassent 64 bits
+
+    Les successeurs du niveau d sont accumulés dans un set jusqu'à la limite de
+    mémoire, puis écrits triés dans un fichier ; les fichiers sont ensuite
+    fusionnés en retirant les états des niveaux d - 1 et d. Dans le taquin un
+    successeur du niveau d ne peut appartenir qu'aux niveaux d - 1 ou d + 1,
+    aucun autre niveau n'est donc relu et seuls les derniers sont gardés sur disque.
+    Le répertoire temporaire est supprimé à la fin, sauf si conserver est vrai.
+    """
+    if codage.bits * codage.taille > 64:
+        raise ValueError(f"Le code d'une grille {codage.dimensions} ne tient pas sur 64 bits.")
+    temps_debut = time.time()
+    temporaire = repertoire is None
+    repertoire = tempfile.mkdtemp(prefix="bfs_externe_") if temporaire else repertoire
+    os.makedirs(repertoire, exist_ok=True)
+    limite_bloc = max(1, memoire // OCTETS_PAR_ETAT)
+
+    def fichier_niveau(profondeur: int) -> str:
+        return os.path.join(repertoire, f"niveau_{profondeur:03d}.bin")
+
+    ecrire_codes(fichier_niveau(0), [code_initial])
+    niveaux = [fichier_niveau(0)]
+    tailles = [1]
+    trouve = 0 if code_initial == code_final else None
+    raison = RESOLU if trouve is not None else EPUISE
+    if rappel is not None:
+        rappel(0, 1)
+
+    while trouve is None and tailles[-1] and (profondeur_max is None or len(tailles) <= profondeur_max):
+        profondeur = len(tailles)
+        morceaux = []
+        bloc = set()
+
+        def vider_bloc():
+            chemin = os.path.join(repertoire, f"morceau_{profondeur:03d}_{len(morceaux):04d}.bin")
+            ecrire_codes(chemin, sorted(bloc))
+            morceaux.append(chemin)
+            bloc.clear()
+
+        for numero, code in enumerate(lire_codes(niveaux[-1])):
+            for code_suivant, _ in codage.successeurs(code, codage.case_vide(code)):
+                bloc.add(code_suivant)
+            if len(bloc) >= limite_bloc:
+                vider_bloc()
+            if limite_temps is not None and numero & 0xFFF == 0 and time.time() - temps_debut > limite_temps:
+                raison = LIMITE_TEMPS
+                break
+        if raison == LIMITE_TEMPS:
+            break
+        if bloc or not morceaux:
+            vider_bloc()
+
+        chemin = fichier_niveau(profondeur)
+        tailles.append(ecrire_codes(chemin, fusionner(morceaux, niveaux[-2:])))
+        niveaux.append(chemin)
+        for morceau in morceaux:
+            os.remove(morceau)
+        if not conserver and len(niveaux) > 2:
+            os.remove(niveaux[-3])
+        if rappel is not None:
+            rappel(profondeur, tailles[-1])
+        if code_final is not None and contient(chemin, code_final):
+            trouve = profondeur
+            raison = RESOLU
+
+    if not tailles[-1]:
+        tailles.pop()
+    if not conserver:
+        niveaux = niveaux[-2:]
+    if temporaire and not conserver:
+        shutil.rmtree(repertoire, ignore_errors=True)
+        niveaux = []
+    return tailles, trouve, niveaux, raison
+
+def remonter_niveaux(codage: CodageEtat, niveaux: list, code_final: int) -> str:
+    """
+    @brief Reconstruit un chemin optimal à partir des fichiers de tous les niveaux
+    @param codage: Codage des états du plateau
+    @param niveaux: Fichiers des niveaux 0 à d, code_final étant au niveau d
+    @param code_final: Code compact de l'état d'arrivée
+    @return: Lettres de DIRECTIONS, du départ à code_final
+
+    Un prédécesseur au niveau d - 1 est cherché parmi les voisins de l'état
+    courant par recherche dichotomique dans le fichier du niveau.
+    """
+    mouvements = []
+    code, vide = code_final, codage.case_vide(code_final)
+    for chemin in reversed(niveaux[:-1]):
+        for code_precedent, vide_precedent in codage.successeurs(code, vide):
+            if contient(chemin, code_precedent):
+                mouvements.append(OPPOSES[codage.direction(vide, vide_precedent)])
+                code, vide = code_precedent, vide_precedent
+                break
+    mouvements.reverse()
+    return ''.join(mouvements)
+
+def bfs_externe(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, stocker_chemin: bool = False, limite_temps: float | None = None,
+                statistiques: StatistiquesRecherche | None = None, repertoire: str | None = None, memoire: int = MEMOIRE_DEFAUT):
+    """
+    @brief Parcours en largeur dont les niveaux sont stockés sur disque, voir explorer_niveaux
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké, ce qui garde tous les niveaux sur disque (défaut: False)
+    @param limite_temps: Temps maximum d'exécution en secondes, sans limite si None (défaut: None)
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @param repertoire: Répertoire de travail, répertoire temporaire si None (défaut: None)
+    @param memoire: Mémoire de travail en octets (défaut: MEMOIRE_DEFAUT)
+    @return: État final si trouvé, None sinon
+    """
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("bfs_externe")
+    jeu.statistiques = statistiques
+    codage = jeu.codage
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+
+    dossier = repertoire or tempfile.mkdtemp(prefix="bfs_externe_")
+    try:
+        tailles, profondeur, niveaux, raison = explorer_niveaux(codage, code_initial, code_final, dossier, memoire,
+                                                                limite_temps=limite_temps, conserver=stocker_chemin)
+        vus = sum(tailles)
+        statistiques.releve(vus - tailles[-1], 0, 0, max(tailles), vus)
+        statistiques.terminer(raison, profondeur)
+        if profondeur is None:
+            if raison == LIMITE_TEMPS:
+                print(f"Limite de temps dépassée ({limite_temps} secondes)")
+            else:
+                print("État final non trouvé avec bfs externe!")
+            return None
+        if stocker_chemin:
+            jeu.enregistrer_solution(etat_initial, remonter_niveaux(codage, niveaux, code_final))
+        return codage.decoder(code_final)
+    finally:
+        if repertoire is None:
+            shutil.rmtree(dossier, ignore_errors=True)
+
+def main():
+    """
+    @brief Énumère les niveaux depuis l'état final : python -m algorithme_recherche.bfs_externe <k ou LxC> [profondeur max] [répertoire] [mémoire en Mio]
+    """
+    dimensions = lire_dimensions(sys.argv[1]) if len(sys.argv) > 1 else (3, 3)
+    profondeur_max = int(sys.argv[2]) if len(sys.argv) > 2 else None
+    repertoire = sys.argv[3] if len(sys.argv) > 3 else None
+    memoire = int(sys.argv[4]) * 1024 * 1024 if len(sys.argv) > 4 else MEMOIRE_DEFAUT
+    jeu = JeuTaquin(*dimensions)
+    debut = time.time()
+
+    def afficher(profondeur: int, taille: int):
+        print(f"Niveau {profondeur:3d} : {taille} états ({time.time() - debut:.1f} secondes)")
+
+    tailles, _, _, _ = explorer_niveaux(jeu.codage, jeu.encoder_etat(jeu.final_positions), repertoire=repertoire,
+                                        memoire=memoire, profondeur_max=profondeur_max, rappel=afficher)
+    print(f"Total : {sum(tailles)} états sur {len(tailles)} niveaux")
+
+if __name__ == "__main__":
+    main()
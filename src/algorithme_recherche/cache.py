@@ -0,0 +1,204 @@
+import os
+import sqlite3
+from collections import OrderedDict
+from jeu.etatCompact import CodageEtat, DEPLACEMENTS
+from algorithme_recherche.utile import REPERTOIRE_TABLES
+
+# Fichier par défaut du cache persistant des solutions
+CHEMIN_CACHE = os.path.join(REPERTOIRE_TABLES, 'solutions.sqlite')
+# Nombre d'entrées gardées en mémoire par processus
+CAPACITE_MEMOIRE = 10000
+# Nombre d'entrées gardées sur disque ; au-delà, les moins récemment lues sont supprimées
+CAPACITE_DISQUE = 1000000
+
+def symetries(lignes: int, colonnes: int) -> list:
+    """
+    @brief Liste les symétries du plateau
+    @param lignes: Nombre de lignes
+    @param colonnes: Nombre de colonnes
+    @return: Liste de couples (image de chaque case, image de chaque direction), identité en premier
+
+    Un plateau rectangulaire a 4 symétries (identité, miroirs horizontal et
+    vertical, demi-tour), un plateau carré 8 (avec les quarts de tour et les
+    diagonales). Appliquée à l'état initial et à l'état final, une symétrie
+    donne un problème de même difficulté dont les solutions sont les images
+    des déplacements.
+    """
+    transformations = [
+        lambda i, j: (i, j),
+        lambda i, j: (i, colonnes - 1 - j),
+        lambda i, j: (lignes - 1 - i, j),
+        lambda i, j: (lignes - 1 - i, colonnes - 1 - j),
+    ]
+    if lignes == colonnes:
+        transformations += [
+            lambda i, j: (j, i),
+            lambda i, j: (colonnes - 1 - j, lignes - 1 - i),
+            lambda i, j: (j, lignes - 1 - i),
+            lambda i, j: (colonnes - 1 - j, i),
+        ]
+
+    resultat = []
+    for transformation in transformations:
+        cases = []
+        for case in range(lignes * colonnes):
+            i, j = transformation(*divmod(case, colonnes))
+            cases.append(i * colonnes + j)
+        # Les transformations sont affines : l'image d'un déplacement ne dépend pas de la case
+        origine = transformation(0, 0)
+        directions = {}
+        for direction, (di, dj) in DEPLACEMENTS.items():
+            i, j = transformation(di, dj)
+            image = (i - origine[0], j - origine[1])
+            directions[direction] = next(autre for autre, vecteur in DEPLACEMENTS.items() if vecteur == image)
+        resultat.append((cases, directions))
+    return resultat
+
+def transformer(codage: CodageEtat, code: int, cases: list) -> int:
+    """
+    @brief Image d'un état par une symétrie
+    @param codage: Codage des états du plateau
+    @param code: Code compact de l'état
+    @param cases: Image de chaque case (voir symetries)
+    @return: Code compact de l'état transformé
+    """
+    plateau = codage.vers_plateau(code)
+    image = [0] * codage.taille
+    for case, valeur in enumerate(plateau):
+        image[cases[case]] = valeur
+    return codage.depuis_plateau(image)
+
+class CacheSolutions:
+    """
+    @brief Cache des solutions déjà calculées, en mémoire (LRU) et sur disque (sqlite)
+
+    Une entrée associe un couple (état initial, état final) à ses déplacements
+    et indique si la solution est optimale. Le couple est d'abord ramené à une
+    forme canonique : parmi ses images par les symétries du plateau, celle dont
+    les codes compacts (final puis initial) sont les plus petits. Un problème et
+    son image miroir partagent donc la même entrée.
+    Les entrées lues ou écrites passent en tête d'une liste LRU de taille
+    bornée ; le fichier sqlite est partagé par tous les lancements et ses
+    entrées les moins récemment lues sont supprimées au-delà de sa capacité.
+    """
+    def __init__(self, chemin: str | None = CHEMIN_CACHE, capacite_memoire: int = CAPACITE_MEMOIRE, capacite_disque: int = CAPACITE_DISQUE):
+        """
+        @param chemin: Fichier sqlite, None pour un cache uniquement en mémoire (défaut: CHEMIN_CACHE)
+        @param capacite_memoire: Nombre maximal d'entrées en mémoire (défaut: CAPACITE_MEMOIRE)
+        @param capacite_disque: Nombre maximal d'entrées dans le fichier (défaut: CAPACITE_DISQUE)
+        """
+        self.capacite_memoire = capacite_memoire
+        self.capacite_disque = capacite_disque
+        self.entrees: OrderedDict = OrderedDict()
+        self._symetries: dict = {}
+        self.connexion = None
+        self.nombre = 0
+        if chemin is not None:
+            os.makedirs(os.path.dirname(os.path.abspath(chemin)), exist_ok=True)
+            self.connexion = sqlite3.connect(chemin)
+            self.connexion.execute("CREATE TABLE IF NOT EXISTS solutions (dimensions TEXT, code_initial TEXT, code_final TEXT, "
+                                   "mouvements TEXT, optimal INTEGER, acces INTEGER, PRIMARY KEY (dimensions, code_initial, code_final))")
+            self.connexion.execute("CREATE INDEX IF NOT EXISTS solutions_acces ON solutions (acces)")
+            self.connexion.commit()
+            self.nombre = self.connexion.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    def _canonique(self, codage: CodageEtat, code_initial: int, code_final: int) -> tuple:
+        """
+        @brief Forme canonique d'un problème
+        @return: Triplet (clé, directions vers la forme canonique, directions depuis la forme canonique)
+        """
+        if codage.dimensions not in self._symetries:
+            self._symetries[codage.dimensions] = symetries(codage.lignes, codage.colonnes)
+        meilleure = None
+        for cases, directions in self._symetries[codage.dimensions]:
+            candidat = (transformer(codage, code_final, cases), transformer(codage, code_initial, cases))
+            if meilleure is None or candidat < meilleure[0]:
+                meilleure = (candidat, directions)
+        (final, initial), directions = meilleure
+        inverses = {image: direction for direction, image in directions.items()}
+        return (codage.dimensions, f"{initial:x}", f"{final:x}"), directions, inverses
+
+    @staticmethod
+    def _remplace(connue, mouvements: str, optimal: bool) -> bool:
+        """
+        @brief Indique si une nouvelle solution est meilleure que celle connue (optimale, ou sinon plus courte)
+        """
+        if connue is None:
+            return True
+        if connue[1]:
+            return False
+        return optimal or len(mouvements) < len(connue[0])
+
+    def _memoriser(self, cle: tuple, entree: tuple) -> None:
+        self.entrees[cle] = entree
+        self.entrees.move_to_end(cle)
+        while len(self.entrees) > self.capacite_memoire:
+            self.entrees.popitem(last=False)
+
+    def chercher(self, codage: CodageEtat, code_initial: int, code_final: int, optimal: bool = False) -> tuple | None:
+        """
+        @brief Cherche la solution d'un problème
+        @param codage: Codage des états du plateau
+        @param code_initial: Code compact de l'état initial
+        @param code_final: Code compact de l'état final
+        @param optimal: N'accepte qu'une solution optimale (défaut: False)
+        @return: Couple (déplacements de la case vide, solution optimale ou non), None si absent
+        """
+        cle, _, inverses = self._canonique(codage, code_initial, code_final)
+        entree = self.entrees.get(cle)
+        if entree is None and self.connexion is not None:
+            ligne = self.connexion.execute("SELECT mouvements, optimal FROM solutions WHERE dimensions = ? AND code_initial = ? AND code_final = ?",
+                                           cle).fetchone()
+            if ligne is not None:
+                entree = (ligne[0], bool(ligne[1]))
+                self.connexion.execute("UPDATE solutions SET acces = (SELECT COALESCE(MAX(acces), 0) + 1 FROM solutions) "
+                                       "WHERE dimensions = ? AND code_initial = ? AND code_final = ?", cle)
+                self.connexion.commit()
+        if entree is None or (optimal and not entree[1]):
+            return None
+        self._memoriser(cle, entree)
+        mouvements, est_optimale = entree
+        return ''.join(inverses[direction] for direction in mouvements), est_optimale
+
+    def ajouter(self, codage: CodageEtat, code_initial: int, code_final: int, mouvements: str, optimal: bool) -> None:
+        """
+        @brief Enregistre la solution d'un problème, sauf si une solution au moins aussi bonne est déjà connue
+        @param codage: Codage des états du plateau
+        @param code_initial: Code compact de l'état initial
+        @param code_final: Code compact de l'état final
+        @param mouvements: Déplacements de la case vide, de l'état initial à l'état final
+        @param optimal: Indique si la solution est optimale
+        """
+        cle, directions, _ = self._canonique(codage, code_initial, code_final)
+        entree = (''.join(directions[direction] for direction in mouvements), optimal)
+        if not self._remplace(self.entrees.get(cle), mouvements, optimal):
+            return
+        self._memoriser(cle, entree)
+        if self.connexion is None:
+            return
+        ligne = self.connexion.execute("SELECT mouvements, optimal FROM solutions WHERE dimensions = ? AND code_initial = ? AND code_final = ?",
+                                       cle).fetchone()
+        if ligne is not None and not self._remplace((ligne[0], bool(ligne[1])), mouvements, optimal):
+            return
+        self.connexion.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, (SELECT COALESCE(MAX(acces), 0) + 1 FROM solutions))",
+                               (*cle, *entree))
+        if ligne is None:
+            self.nombre += 1
+        # Éviction par paquets d'un dixième de la capacité, pour ne pas supprimer à chaque ajout
+        if self.nombre > self.capacite_disque:
+            self.connexion.execute("DELETE FROM solutions WHERE rowid IN (SELECT rowid FROM solutions ORDER BY acces LIMIT ?)",
+                                   (self.nombre - self.capacite_disque + self.capacite_disque // 10,))
+            self.nombre = self.connexion.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+        self.connexion.commit()
+
+    def __len__(self) -> int:
+        """Retourne le nombre d'entrées du cache (sur disque s'il y en a un, en mémoire sinon)."""
+        return self.nombre if self.connexion is not None else len(self.entrees)
+
+    def fermer(self) -> None:
+        """
+        @brief Ferme le fichier sqlite
+        """
+        if self.connexion is not None:
+            self.connexion.close()
+            self.connexion = None
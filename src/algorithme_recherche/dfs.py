@@ -1,8 +1,12 @@
 from algorithme_recherche.FilePile import FilePile
 from jeu.jeuTaquin import JeuTaquin
-from algorithme_recherche.utile import key, reconstruire_chemin
+import time
+from algorithme_recherche.EnsembleEtats import creer_ensemble
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, LIMITE_TEMPS, EPUISE
+from algorithme_recherche.table import meme_classe
 
-def dfs(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, prof_max=100000, stocker_chemin: bool = False):
+def dfs(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, prof_max=100000, stocker_chemin: bool = False, limite_temps: float | None = None,
+        statistiques: StatistiquesRecherche | None = None, ensemble: str = "auto"):
     """
     @brief Implémente l'algorithme de parcours en profondeur
     @param jeu: Instance de la classe JeuTaquin
@@ -10,45 +14,181 @@ def dfs(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, prof_max=100000, s
     @param etat_final: État final désiré
     @param prof_max: Profondeur maximale de recherche (défaut: 100000)
     @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param limite_temps: Temps maximum d'exécution en secondes, sans limite si None (défaut: None)
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @param ensemble: Stockage des états vus, 'set', 'rangs' ou 'auto', voir EnsembleEtats.creer_ensemble (défaut: "auto")
     @return: État final si trouvé, None sinon
     
     Explore les états en profondeur d'abord jusqu'à une profondeur maximale donnée.
+    Les états sont manipulés sous forme compacte (voir CodageEtat).
     """
-    visites = set()
-    pile = FilePile()
-    pile.pushFirst((etat_initial, 0))
-    
-    cle_depart = key(etat_initial)
-    visites.add(cle_depart)
-    
-    parents: dict[str, str | None] | None = {cle_depart: None} if stocker_chemin else None
+    temps_debut = time.time()
+    noeuds_explores = 0
+    generes = 0
+    doublons = 0
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("dfs")
+    jeu.statistiques = statistiques
+    prochain_releve = 0
+    codage = jeu.codage
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+
+    visites = creer_ensemble(ensemble, codage, code_initial, stocker_chemin)
+    # Si le code, la case vide et la profondeur tiennent ensemble sur 64 bits, la pile
+    # les range dans un tableau d'entiers (profondeur puis case vide dans les bits de poids faible)
+    bits_vide = (codage.taille - 1).bit_length()
+    bits_profondeur = prof_max.bit_length()
+    masque_vide = (1 << bits_vide) - 1
+    masque_profondeur = (1 << bits_profondeur) - 1
+    compact = codage.bits * codage.taille + bits_vide + bits_profondeur <= 64
+    pile = FilePile(compact)
+    vide_initial = codage.case_vide(code_initial)
+    pile.pushFirst((code_initial << (bits_vide + bits_profondeur)) | (vide_initial << bits_profondeur) if compact else (code_initial, vide_initial, 0))
 
     while pile:
         element_retire = pile.pop()
-
-        if element_retire is None:
-            continue
-        
-        etat_actuel, profondeur = element_retire
-        cle_courante = key(etat_actuel)
-        
-        jeu.set_current_state(etat_actuel)
+        if compact:
+            code_courant = element_retire >> (bits_vide + bits_profondeur)
+            vide_courant = (element_retire >> bits_profondeur) & masque_vide
+            profondeur = element_retire & masque_profondeur
+        else:
+            code_courant, vide_courant, profondeur = element_retire
+        noeuds_explores += 1
+        if noeuds_explores >= prochain_releve:
+            prochain_releve = statistiques.releve(noeuds_explores, generes, doublons, len(pile), len(visites))
+        if limite_temps is not None and noeuds_explores & 0xFFF == 0 and time.time() - temps_debut > limite_temps:
+            statistiques.releve(noeuds_explores, generes, doublons, len(pile), len(visites))
+            statistiques.terminer(LIMITE_TEMPS)
+            print(f"Limite de temps dépassée ({limite_temps} secondes)")
+            return None
         
-        if etat_actuel == etat_final:
-            if stocker_chemin and parents is not None:
-                jeu.solution_path = reconstruire_chemin(parents, cle_courante)
-            return etat_actuel
+        if code_courant == code_final:
+            statistiques.releve(noeuds_explores, generes, doublons, len(pile), len(visites))
+            statistiques.terminer(RESOLU, profondeur)
+            if stocker_chemin:
+                jeu.enregistrer_solution(etat_initial, visites.chemin(code_courant))
+            return codage.decoder(code_courant)
 
         if profondeur < prof_max:
-            mouvements_possibles = jeu.get_possible_moves()
-            
-            for etat_suivant in mouvements_possibles:
-                cle_suivante = key(etat_suivant)
-                if cle_suivante not in visites:
-                    visites.add(cle_suivante)
-                    if stocker_chemin and parents is not None:
-                        parents[cle_suivante] = cle_courante
-                    pile.pushFirst((etat_suivant, profondeur + 1))
+            suivants = []
+            for code_suivant, vide_suivant in codage.successeurs(code_courant, vide_courant):
+                generes += 1
+                if visites.ajouter(code_suivant, vide_courant, vide_suivant):
+                    if compact:
+                        suivants.append((code_suivant << (bits_vide + bits_profondeur)) | (vide_suivant << bits_profondeur) | (profondeur + 1))
+                    else:
+                        suivants.append((code_suivant, vide_suivant, profondeur + 1))
+                else:
+                    doublons += 1
+            pile.extendFirst(suivants)
 
+    statistiques.releve(noeuds_explores, generes, doublons, 0, len(visites))
+    statistiques.terminer(EPUISE)
     print("État final non trouvé avec dfs!")
-    return None
\ No newline at end of file
+    return None
+
+def iddfs(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, prof_max: int = 80, stocker_chemin: bool = False, limite_temps: float | None = None,
+          statistiques: StatistiquesRecherche | None = None):
+    """
+    @brief Implémente le parcours en profondeur itératif (approfondissement progressif)
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param prof_max: Profondeur maximale de recherche (défaut: 80, diamètre de l'espace d'états du 4x4)
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param limite_temps: Temps maximum d'exécution en secondes, sans limite si None (défaut: None)
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @return: État final si trouvé, None sinon
+
+    Enchaîne des parcours en profondeur bornés par une limite croissante, sur
+    une pile explicite qui ne contient que le chemin courant : la mémoire est
+    proportionnelle à la profondeur et le chemin trouvé est le plus court.
+    Les cycles ne sont détectés que le long du chemin courant et la case vide
+    ne revient jamais directement sur la case qu'elle vient de quitter.
+    Chaque mouvement déplace la case vide d'une case : la longueur de tout
+    chemin a la parité de la distance de Manhattan de la case vide entre les
+    deux états, qui sert de première limite, augmentée ensuite de 2 en 2.
+    La frontière mesurée est la pile du chemin courant.
+    """
+    temps_debut = time.time()
+    noeuds_explores = 0
+    generes = 0
+    doublons = 0
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("iddfs")
+    jeu.statistiques = statistiques
+    prochain_releve = 0
+    codage = jeu.codage
+    voisins = codage.voisins
+    decalages = codage.decalages
+    masque = codage.masque
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+
+    if not meme_classe(codage, code_initial, code_final):
+        statistiques.terminer(EPUISE)
+        print("État non résolvable, état final non trouvé avec iddfs!")
+        return None
+
+    vide_initial = codage.case_vide(code_initial)
+    ligne, colonne = divmod(vide_initial, codage.colonnes)
+    ligne_finale, colonne_finale = divmod(codage.case_vide(code_final), codage.colonnes)
+    limite = abs(ligne - ligne_finale) + abs(colonne - colonne_finale)
+
+    # Pile du chemin courant : codes, cases vides et indice du prochain voisin à essayer
+    codes = [code_initial]
+    vides = [vide_initial]
+    trouve = code_initial == code_final
+    while not trouve and limite <= prof_max:
+        codes, vides, suivants, sur_chemin = [code_initial], [vide_initial], [0], {code_initial}
+        while codes and not trouve:
+            profondeur = len(codes) - 1
+            vide = vides[-1]
+            indice = suivants[-1]
+            if profondeur == limite or indice == len(voisins[vide]):
+                sur_chemin.discard(codes.pop())
+                vides.pop()
+                suivants.pop()
+                continue
+            if indice == 0:
+                noeuds_explores += 1
+                if noeuds_explores >= prochain_releve:
+                    prochain_releve = statistiques.releve(noeuds_explores, generes, doublons, len(codes), 0)
+                if limite_temps is not None and noeuds_explores & 0xFFF == 0 and time.time() - temps_debut > limite_temps:
+                    statistiques.releve(noeuds_explores, generes, doublons, len(codes), 0)
+                    statistiques.terminer(LIMITE_TEMPS)
+                    print(f"Limite de temps dépassée ({limite_temps} secondes)")
+                    return None
+            suivants[-1] = indice + 1
+
+            case = voisins[vide][indice]
+            if profondeur and case == vides[-2]:
+                doublons += 1
+                continue
+            generes += 1
+            code = codes[-1]
+            valeur = (code >> decalages[case]) & masque
+            code_suivant = code - (valeur << decalages[case]) + (valeur << decalages[vide])
+            if code_suivant in sur_chemin:
+                doublons += 1
+                continue
+            codes.append(code_suivant)
+            vides.append(case)
+            suivants.append(0)
+            sur_chemin.add(code_suivant)
+            trouve = code_suivant == code_final
+        limite += 2
+
+    if not trouve:
+        statistiques.releve(noeuds_explores, generes, doublons, 0, 0)
+        statistiques.terminer(EPUISE)
+        print("État final non trouvé avec iddfs!")
+        return None
+
+    statistiques.releve(noeuds_explores, generes, doublons, len(codes), 0)
+    statistiques.terminer(RESOLU, len(codes) - 1)
+    if stocker_chemin:
+        # Les cases successives de la case vide donnent les déplacements
+        jeu.enregistrer_solution(etat_initial, ''.join(codage.direction(vide, case) for vide, case in zip(vides, vides[1:])))
+    return codage.decoder(code_final)
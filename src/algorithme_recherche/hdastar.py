@@ -0,0 +1,244 @@
+import multiprocessing
+import os
+import queue
+import time
+from jeu.jeuTaquin import JeuTaquin
+from algorithme_recherche.FilePriorite import FilePriorite
+from algorithme_recherche.heuristiques import obtenir_heuristique
+from algorithme_recherche.utile import remonter_mouvements
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, LIMITE_TEMPS, LIMITE_NOEUDS, EPUISE
+
+INFINI = 2 ** 31 - 1
+TAILLE_ENVOI = 64
+
+def proprietaire(code: int, workers: int) -> int:
+    """
+    @brief Processus responsable d'un état (hachage multiplicatif du code compact)
+    """
+    return ((code * 0x9E3779B97F4A7C15) >> 32) % workers
+
+def travailleur(indice: int, workers: int, dimensions: tuple, code_final: int, etat_final: dict, heuristique: str, stocker_chemin: bool,
+                boites: list, resultats, meilleur, envoyes, recus, inactifs, developpes, arret) -> None:
+    """
+    @brief Boucle d'un processus HDA* : développe les états dont il est propriétaire
+    @param indice: Numéro du processus
+    @param workers: Nombre total de processus
+    @param dimensions: Couple (lignes, colonnes) du plateau
+    @param boites: File de réception de chaque processus
+    @param resultats: File de retour vers le processus principal
+    @param meilleur: Coût de la meilleure solution connue (partagé)
+    @param envoyes: Nombre d'états envoyés par chaque processus (partagé)
+    @param recus: Nombre d'états reçus par chaque processus (partagé)
+    @param inactifs: Indicateur d'inactivité de chaque processus (partagé)
+    @param developpes: Nombre de nœuds développés par chaque processus (partagé)
+    @param arret: Événement de fin de recherche
+
+    Un message est une liste de nœuds (code, case vide, g, h, déplacement d'arrivée),
+    le déplacement étant l'indice dans DIRECTIONS (None si le chemin n'est pas stocké).
+    Un processus est inactif lorsque sa frontière est vide ou que tous ses
+    nœuds ont f >= meilleur : ils ne peuvent plus améliorer la solution.
+    """
+    jeu = JeuTaquin(*dimensions)
+    codage = jeu.codage
+    fonction_h = obtenir_heuristique(heuristique, codage, etat_final)
+    table = fonction_h.table
+
+    frontiere = FilePriorite()
+    couts_g = {}
+    parents = {}
+    sorties = [[] for _ in range(workers)]
+    boite = boites[indice]
+    noeuds_explores = 0
+    generes = 0
+    doublons = 0
+    frontiere_max = 0
+
+    def recevoir(message: list) -> None:
+        nonlocal doublons, frontiere_max
+        for code, vide, g, h, direction in message:
+            if code not in couts_g or g < couts_g[code]:
+                couts_g[code] = g
+                if stocker_chemin:
+                    parents[code] = direction
+                frontiere.push(g + h, g, (code, vide, h))
+            else:
+                doublons += 1
+        if len(frontiere) > frontiere_max:
+            frontiere_max = len(frontiere)
+
+    def vider_sorties() -> None:
+        for destinataire, sortie in enumerate(sorties):
+            if sortie:
+                envoyes[indice] += len(sortie)
+                boites[destinataire].put(sortie)
+                sorties[destinataire] = []
+
+    while not arret.is_set():
+        try:
+            while True:
+                message = boite.get_nowait()
+                inactifs[indice] = 0
+                recevoir(message)
+                recus[indice] += len(message)
+        except queue.Empty:
+            pass
+
+        element = frontiere.pop() if frontiere else None
+        if element is not None and element[0] >= meilleur.value:
+            # Les nœuds restants ne peuvent plus améliorer la solution
+            frontiere.push(*element)
+            element = None
+
+        if element is None:
+            vider_sorties()
+            inactifs[indice] = 1
+            try:
+                message = boite.get(timeout=0.005)
+                inactifs[indice] = 0
+                recevoir(message)
+                recus[indice] += len(message)
+            except queue.Empty:
+                pass
+            continue
+
+        f_courant, g_courant, (code_courant, vide_courant, h_courant) = element
+        if g_courant > couts_g[code_courant]:
+            continue
+        noeuds_explores += 1
+
+        if code_courant == code_final:
+            with meilleur.get_lock():
+                if g_courant < meilleur.value:
+                    meilleur.value = g_courant
+            continue
+
+        if table is not None:
+            suivants = codage.successeurs_heuristique(code_courant, vide_courant, table)
+        else:
+            positions = codage.vers_positions(code_courant)
+            suivants = [(code_suivant, vide_suivant, fonction_h.variation(positions, codage.valeur(code_courant, vide_suivant), vide_courant))
+                        for code_suivant, vide_suivant in codage.successeurs(code_courant, vide_courant)]
+
+        generes += len(suivants)
+        for code_suivant, vide_suivant, delta_h in suivants:
+            direction = codage.indices_directions[vide_courant][vide_suivant] if stocker_chemin else None
+            noeud = (code_suivant, vide_suivant, g_courant + 1, h_courant + delta_h, direction)
+            destinataire = proprietaire(code_suivant, workers)
+            if destinataire == indice:
+                recevoir([noeud])
+            else:
+                sorties[destinataire].append(noeud)
+                if len(sorties[destinataire]) >= TAILLE_ENVOI:
+                    vider_sorties()
+
+        if noeuds_explores & 0xFF == 0:
+            developpes[indice] = noeuds_explores
+            vider_sorties()
+
+    # Les états encore en transit n'ont plus d'intérêt : ne pas bloquer la fin du processus
+    for file in boites:
+        file.cancel_join_thread()
+    resultats.put((indice, (noeuds_explores, generes, doublons, frontiere_max, len(couts_g)), parents if stocker_chemin else None))
+
+def hdastar(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, limite_temps: float = 40.0, max_noeuds: int | None = None,
+            stocker_chemin: bool = False, heuristique: str = "manhattan", workers: int | None = None,
+            statistiques: StatistiquesRecherche | None = None):
+    """
+    @brief Implémente l'algorithme A* parallèle à distribution par hachage (HDA*)
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param limite_temps: Temps maximum d'exécution en secondes (défaut: 40.0)
+    @param max_noeuds: Nombre maximum de nœuds développés par l'ensemble des processus, sans limite si None (défaut: None)
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param heuristique: Nom de l'heuristique, voir heuristiques.HEURISTIQUES (défaut: "manhattan")
+    @param workers: Nombre de processus (défaut: nombre de cœurs)
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @return: État final si trouvé, None sinon
+
+    Chaque processus possède la partie de l'espace d'états dont le code compact
+    est haché vers lui et développe sa propre frontière ; les successeurs sont
+    envoyés à leur propriétaire par files multiprocessing. Le coût de la
+    meilleure solution est partagé et élague les nœuds de f supérieur ou égal.
+    La recherche se termine lorsque tous les processus sont inactifs et que
+    tous les états envoyés ont été reçus, lors de deux relevés consécutifs
+    identiques : la solution retenue est alors optimale pour une heuristique
+    admissible. Les mesures sont les sommes des compteurs des processus,
+    transmis à la fin de la recherche ; pendant la recherche seul le nombre de
+    nœuds développés est relevé.
+    """
+    temps_debut = time.time()
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("hdastar")
+    jeu.statistiques = statistiques
+    workers = workers or os.cpu_count() or 1
+    codage = jeu.codage
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+    h_initial = obtenir_heuristique(heuristique, codage, etat_final).evaluer_code(code_initial)
+
+    contexte = multiprocessing.get_context()
+    boites = [contexte.Queue() for _ in range(workers)]
+    resultats = contexte.Queue()
+    meilleur = contexte.Value('i', INFINI)
+    envoyes = contexte.Array('q', workers, lock=False)
+    recus = contexte.Array('q', workers, lock=False)
+    inactifs = contexte.Array('b', workers, lock=False)
+    developpes = contexte.Array('q', workers, lock=False)
+    arret = contexte.Event()
+
+    envoyes[0] += 1
+    boites[proprietaire(code_initial, workers)].put([(code_initial, codage.case_vide(code_initial), 0, h_initial, None)])
+
+    processus = [contexte.Process(target=travailleur, args=(indice, workers, jeu.get_dimensions(), code_final, etat_final, heuristique, stocker_chemin,
+                                                             boites, resultats, meilleur, envoyes, recus, inactifs, developpes, arret), daemon=True)
+                 for indice in range(workers)]
+    for p in processus:
+        p.start()
+
+    termine = False
+    raison = EPUISE
+    releve_precedent = None
+    prochain_releve = 0
+    while not termine:
+        time.sleep(0.01)
+        total_developpes = sum(developpes)
+        if total_developpes >= prochain_releve:
+            prochain_releve = statistiques.releve(total_developpes, 0, 0, 0, 0)
+        if time.time() - temps_debut > limite_temps:
+            raison = LIMITE_TEMPS
+            print(f"Limite de temps dépassée ({limite_temps} secondes)")
+            break
+        if max_noeuds is not None and total_developpes > max_noeuds:
+            raison = LIMITE_NOEUDS
+            print(f"Nombre maximum de nœuds dépassé ({max_noeuds})")
+            break
+        if all(inactifs):
+            releve = (sum(envoyes), sum(recus))
+            termine = releve[0] == releve[1] and releve == releve_precedent and all(inactifs)
+            releve_precedent = releve
+        else:
+            releve_precedent = None
+
+    arret.set()
+    parents = {}
+    totaux = [0, 0, 0, 0, 0]
+    for _ in processus:
+        _, compteurs, parents_travailleur = resultats.get()
+        totaux = [total + compteur for total, compteur in zip(totaux, compteurs)]
+        if parents_travailleur:
+            parents.update(parents_travailleur)
+    for p in processus:
+        p.join()
+    statistiques.releve(*totaux)
+
+    if not termine or meilleur.value == INFINI:
+        statistiques.terminer(raison)
+        if termine:
+            print("Aucune solution trouvée avec HDA*")
+        return None
+    statistiques.terminer(RESOLU, meilleur.value)
+
+    if stocker_chemin:
+        jeu.enregistrer_solution(etat_initial, remonter_mouvements(codage, parents.__getitem__, code_final, code_initial))
+    return codage.decoder(code_final)
@@ -0,0 +1,322 @@
+from jeu.etatCompact import CodageEtat
+from algorithme_recherche.pdb import charger_pdb
+
+class Heuristique:
+    """
+    @brief Interface commune des heuristiques utilisées par les algorithmes informés
+
+    Une heuristique travaille sur la liste des positions des tuiles
+    (positions[valeur] = case) et fournit une évaluation complète ainsi
+    qu'une mise à jour incrémentale lors du déplacement d'une tuile.
+    Les heuristiques additives par tuile exposent en plus leur table de coûts
+    (table[valeur][case]), ce qui permet aux algorithmes d'utiliser
+    CodageEtat.successeurs_heuristique et d'éviter tout décodage.
+    """
+    nom = ""
+    admissible = True
+
+    def __init__(self, codage: CodageEtat, etat_final: dict):
+        """
+        @brief Initialise l'heuristique pour un plateau et un état final
+        @param codage: Codage des états du plateau
+        @param etat_final: État final désiré
+        """
+        self.codage = codage
+        self.positions_finales = codage.vers_positions(codage.encoder(etat_final))
+        self.table = None
+
+    def evaluer(self, positions: list) -> int:
+        """
+        @brief Évalue complètement l'heuristique
+        @param positions: Liste où l'indice est la valeur de la tuile et la valeur sa case
+        @return: Estimation du nombre de mouvements restants
+        """
+        raise NotImplementedError
+
+    def variation(self, positions: list, valeur: int, arrivee: int) -> int:
+        """
+        @brief Calcule la variation de l'heuristique lors d'un mouvement
+        @param positions: Positions des tuiles avant le mouvement
+        @param valeur: Tuile déplacée (vers la case vide)
+        @param arrivee: Case d'arrivée de la tuile (case vide avant le mouvement)
+        @return: h(après) - h(avant)
+        """
+        if self.table is not None:
+            couts = self.table[valeur]
+            return couts[arrivee] - couts[positions[valeur]]
+        suivantes = positions.copy()
+        suivantes[valeur], suivantes[0] = arrivee, positions[valeur]
+        return self.evaluer(suivantes) - self.evaluer(positions)
+
+    def evaluer_code(self, code: int) -> int:
+        """
+        @brief Évalue l'heuristique d'un état compact
+        @param code: Code entier de l'état (voir CodageEtat)
+        @return: Estimation du nombre de mouvements restants
+        """
+        return self.evaluer(self.codage.vers_positions(code))
+
+class HeuristiqueTable(Heuristique):
+    """
+    @brief Heuristique somme de coûts indépendants par tuile
+    """
+    def evaluer(self, positions: list) -> int:
+        table = self.table
+        return sum(table[valeur][case] for valeur, case in enumerate(positions))
+
+def table_manhattan(codage: CodageEtat, positions_finales: list, penalite: bool = False) -> list:
+    """
+    @brief Précalcule le coût de Manhattan de chaque tuile dans chaque case
+    @param codage: Codage des états du plateau
+    @param positions_finales: Case finale de chaque tuile
+    @param penalite: Ajoute 1 pour chaque tuile mal placée, comme manhattan_distance (défaut: False)
+    @return: Table où table[valeur][case] est la contribution de la tuile à l'heuristique
+
+    La case vide (valeur 0) a une contribution nulle partout. Sans pénalité,
+    l'heuristique obtenue est admissible.
+    """
+    colonnes = codage.colonnes
+    table = [[0] * codage.taille]
+    for valeur in range(1, codage.taille):
+        target_i, target_j = divmod(positions_finales[valeur], colonnes)
+        couts = []
+        for case in range(codage.taille):
+            x, y = divmod(case, colonnes)
+            distance = abs(x - target_i) + abs(y - target_j)
+            couts.append(distance + 1 if distance and penalite else distance)
+        table.append(couts)
+    return table
+
+class Manhattan(HeuristiqueTable):
+    """
+    @brief Distance de Manhattan (admissible)
+    """
+    nom = "manhattan"
+
+    def __init__(self, codage: CodageEtat, etat_final: dict):
+        super().__init__(codage, etat_final)
+        self.table = table_manhattan(codage, self.positions_finales)
+
+class ManhattanPenalite(HeuristiqueTable):
+    """
+    @brief Distance de Manhattan plus 1 par tuile mal placée
+
+    Historiquement utilisée par astar ; elle surestime le coût et n'est donc
+    pas admissible, mais guide la recherche plus agressivement.
+    """
+    nom = "manhattan_penalite"
+    admissible = False
+
+    def __init__(self, codage: CodageEtat, etat_final: dict):
+        super().__init__(codage, etat_final)
+        self.table = table_manhattan(codage, self.positions_finales, penalite=True)
+
+class TuilesMalPlacees(HeuristiqueTable):
+    """
+    @brief Nombre de tuiles hors de leur case finale (admissible)
+    """
+    nom = "misplaced"
+
+    def __init__(self, codage: CodageEtat, etat_final: dict):
+        super().__init__(codage, etat_final)
+        self.table = [[0] * codage.taille]
+        for valeur in range(1, codage.taille):
+            self.table.append([int(case != self.positions_finales[valeur]) for case in range(codage.taille)])
+
+def plus_longue_sous_suite_croissante(valeurs: list) -> int:
+    """
+    @brief Longueur de la plus longue sous-suite strictement croissante
+    """
+    fins = []
+    for valeur in valeurs:
+        i = 0
+        while i < len(fins) and fins[i] < valeur:
+            i += 1
+        if i == len(fins):
+            fins.append(valeur)
+        else:
+            fins[i] = valeur
+    return len(fins)
+
+class ConflitsLineaires(Heuristique):
+    """
+    @brief Distance de Manhattan plus les conflits linéaires (admissible)
+
+    Deux tuiles d'une même ligne (ou colonne), qui est aussi leur ligne finale,
+    et dont l'ordre est inversé par rapport à l'état final sont en conflit :
+    l'une des deux doit quitter la ligne, ce qui coûte 2 mouvements de plus.
+    Pour chaque ligne, le nombre de tuiles à retirer est la taille de la ligne
+    moins sa plus longue sous-suite ordonnée.
+    """
+    nom = "linear_conflict"
+
+    def __init__(self, codage: CodageEtat, etat_final: dict):
+        super().__init__(codage, etat_final)
+        self.manhattan = table_manhattan(codage, self.positions_finales)
+        colonnes = codage.colonnes
+        self.lignes_finales = [position // colonnes for position in self.positions_finales]
+        self.colonnes_finales = [position % colonnes for position in self.positions_finales]
+
+    def conflits_ligne(self, positions: list, ligne: int) -> int:
+        k = self.codage.colonnes
+        tuiles = [(positions[valeur] % k, self.colonnes_finales[valeur]) for valeur in range(1, len(positions))
+                  if positions[valeur] // k == ligne and self.lignes_finales[valeur] == ligne]
+        tuiles.sort()
+        return len(tuiles) - plus_longue_sous_suite_croissante([colonne for _, colonne in tuiles])
+
+    def conflits_colonne(self, positions: list, colonne: int) -> int:
+        k = self.codage.colonnes
+        tuiles = [(positions[valeur] // k, self.lignes_finales[valeur]) for valeur in range(1, len(positions))
+                  if positions[valeur] % k == colonne and self.colonnes_finales[valeur] == colonne]
+        tuiles.sort()
+        return len(tuiles) - plus_longue_sous_suite_croissante([ligne for _, ligne in tuiles])
+
+    def evaluer(self, positions: list) -> int:
+        manhattan = self.manhattan
+        h = sum(manhattan[valeur][case] for valeur, case in enumerate(positions))
+        for i in range(self.codage.lignes):
+            h += 2 * self.conflits_ligne(positions, i)
+        for j in range(self.codage.colonnes):
+            h += 2 * self.conflits_colonne(positions, j)
+        return h
+
+    def variation(self, positions: list, valeur: int, arrivee: int) -> int:
+        # Un mouvement vertical ne modifie que les conflits des deux lignes concernées,
+        # un mouvement horizontal ceux des deux colonnes concernées
+        k = self.codage.colonnes
+        depart = positions[valeur]
+        couts = self.manhattan[valeur]
+        delta = couts[arrivee] - couts[depart]
+        if depart % k == arrivee % k:
+            lignes, conflits = (depart // k, arrivee // k), self.conflits_ligne
+        else:
+            lignes, conflits = (depart % k, arrivee % k), self.conflits_colonne
+        avant = sum(conflits(positions, ligne) for ligne in lignes)
+        positions[valeur], positions[0] = arrivee, depart
+        apres = sum(conflits(positions, ligne) for ligne in lignes)
+        positions[valeur], positions[0] = depart, arrivee
+        return delta + 2 * (apres - avant)
+
+_tables_marche: dict = {}
+
+def table_marche(k: int, depart: tuple) -> dict:
+    """
+    @brief Précalcule les distances de marche selon une dimension
+    @param k: Nombre de lignes (problème vertical) ou de colonnes (problème horizontal) du plateau
+    @param depart: État final abstrait (comptes, ligne de la case vide)
+    @return: Dictionnaire associant à chaque état abstrait sa distance à l'état final
+
+    Un état abstrait compte, pour chaque ligne i, le nombre de tuiles dont la
+    ligne finale est j (comptes[i * k + j]). Un mouvement fait passer une tuile
+    d'une ligne voisine de la case vide vers la ligne de la case vide. Le
+    problème horizontal est le même en remplaçant les lignes par les colonnes.
+    """
+    if (k, depart) in _tables_marche:
+        return _tables_marche[(k, depart)]
+    distances = {depart: 0}
+    couche = [depart]
+    profondeur = 0
+    while couche:
+        profondeur += 1
+        suivante = []
+        for comptes, vide in couche:
+            for ligne in (vide - 1, vide + 1):
+                if not 0 <= ligne < k:
+                    continue
+                for j in range(k):
+                    if comptes[ligne * k + j]:
+                        nouveaux = list(comptes)
+                        nouveaux[ligne * k + j] -= 1
+                        nouveaux[vide * k + j] += 1
+                        etat = (tuple(nouveaux), ligne)
+                        if etat not in distances:
+                            distances[etat] = profondeur
+                            suivante.append(etat)
+        couche = suivante
+    _tables_marche[(k, depart)] = distances
+    return distances
+
+class DistanceMarche(Heuristique):
+    """
+    @brief Distance de marche (walking distance, admissible)
+
+    Somme des distances d'un problème relâché vertical, où seules comptent les
+    lignes des tuiles, et du problème horizontal équivalent sur les colonnes.
+    Les deux tables sont calculées une fois par plateau et par état final.
+    Elle domine la distance de Manhattan mais sa construction devient coûteuse
+    au-delà du 4x4.
+    """
+    nom = "walking_distance"
+
+    def __init__(self, codage: CodageEtat, etat_final: dict):
+        super().__init__(codage, etat_final)
+        colonnes = codage.colonnes
+        self.lignes_finales = [position // colonnes for position in self.positions_finales]
+        self.colonnes_finales = [position % colonnes for position in self.positions_finales]
+        self.verticale = table_marche(codage.lignes, self.abstraire(self.positions_finales, self.lignes_finales, True))
+        self.horizontale = table_marche(colonnes, self.abstraire(self.positions_finales, self.colonnes_finales, False))
+
+    def abstraire(self, positions: list, cibles: list, vertical: bool) -> tuple:
+        colonnes = self.codage.colonnes
+        k = self.codage.lignes if vertical else colonnes
+        comptes = [0] * (k * k)
+        for valeur in range(1, len(positions)):
+            ligne = positions[valeur] // colonnes if vertical else positions[valeur] % colonnes
+            comptes[ligne * k + cibles[valeur]] += 1
+        vide = positions[0] // colonnes if vertical else positions[0] % colonnes
+        return tuple(comptes), vide
+
+    def evaluer(self, positions: list) -> int:
+        return (self.verticale[self.abstraire(positions, self.lignes_finales, True)]
+                + self.horizontale[self.abstraire(positions, self.colonnes_finales, False)])
+
+class BaseMotifs(Heuristique):
+    """
+    @brief Heuristique additive par bases de motifs disjoints (voir pdb.py)
+    """
+    nom = "pdb"
+
+    def __init__(self, codage: CodageEtat, etat_final: dict):
+        super().__init__(codage, etat_final)
+        self.bases = charger_pdb(codage, self.positions_finales)
+        self.groupe_de = [None] * codage.taille
+        for base in self.bases:
+            for valeur in base.groupe:
+                self.groupe_de[valeur] = base
+
+    def evaluer(self, positions: list) -> int:
+        return sum(base.valeur(positions) for base in self.bases)
+
+    def variation(self, positions: list, valeur: int, arrivee: int) -> int:
+        base = self.groupe_de[valeur]
+        if base is None:
+            return 0
+        depart = positions[valeur]
+        avant = base.valeur(positions)
+        positions[valeur] = arrivee
+        apres = base.valeur(positions)
+        positions[valeur] = depart
+        return apres - avant
+
+# Registre des heuristiques disponibles, par nom
+HEURISTIQUES = {
+    Manhattan.nom: Manhattan,
+    ManhattanPenalite.nom: ManhattanPenalite,
+    TuilesMalPlacees.nom: TuilesMalPlacees,
+    ConflitsLineaires.nom: ConflitsLineaires,
+    DistanceMarche.nom: DistanceMarche,
+    BaseMotifs.nom: BaseMotifs,
+}
+
+def obtenir_heuristique(nom: str, codage: CodageEtat, etat_final: dict) -> Heuristique:
+    """
+    @brief Instancie une heuristique à partir de son nom
+    @param nom: Nom de l'heuristique (clé de HEURISTIQUES)
+    @param codage: Codage des états du plateau
+    @param etat_final: État final désiré
+    @return: Instance de l'heuristique
+    @throws ValueError si le nom est inconnu
+    """
+    if nom not in HEURISTIQUES:
+        raise ValueError(f"Heuristique inconnue : {nom} (disponibles : {', '.join(HEURISTIQUES)})")
+    return HEURISTIQUES[nom](codage, etat_final)
@@ -0,0 +1,120 @@
+from jeu.jeuTaquin import JeuTaquin
+import time
+from algorithme_recherche.heuristiques import obtenir_heuristique
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, LIMITE_TEMPS, EPUISE
+
+def idastar(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, limite_temps: float = 40.0, stocker_chemin: bool = False, heuristique: str = "manhattan",
+            statistiques: StatistiquesRecherche | None = None):
+    """
+    @brief Implémente l'algorithme IDA* pour résoudre le jeu de taquin
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param limite_temps: Temps maximum d'exécution en secondes (défaut: 40.0)
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param heuristique: Nom de l'heuristique, voir heuristiques.HEURISTIQUES (défaut: "manhattan")
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @return: État final si trouvé, None sinon
+
+    Enchaîne des parcours en profondeur bornés par un seuil sur f = g + h, le
+    seuil suivant étant le plus petit f ayant dépassé le seuil courant. Le plateau
+    est modifié sur place (mouvement puis annulation) et la case vide ne revient
+    jamais directement sur la case qu'elle vient de quitter. La mémoire utilisée
+    est proportionnelle à la profondeur de la solution.
+    Avec une heuristique admissible (Manhattan, bases de motifs), le chemin
+    trouvé est optimal. La frontière mesurée est la pile du chemin courant et
+    les doublons sont les retours directs sur la case précédente.
+    """
+    temps_debut = time.time()
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("idastar")
+    jeu.statistiques = statistiques
+    codage = jeu.codage
+    voisins = codage.voisins
+    fonction_h = obtenir_heuristique(heuristique, codage, etat_final)
+    table = fonction_h.table
+    variation = fonction_h.variation
+
+    plateau = codage.vers_plateau(codage.encoder(etat_initial))
+    positions = codage.vers_positions(codage.encoder(etat_initial))
+    plateau_final = codage.vers_plateau(codage.encoder(etat_final))
+    chemin = [plateau.index(0)]
+    noeuds_explores = 0
+    generes = 0
+    doublons = 0
+    prochain_releve = 0
+    temps_depasse = False
+
+    def recherche(g: int, h: int, seuil: int, vide: int, precedent: int) -> int:
+        """
+        @brief Parcours en profondeur borné depuis la position courante du plateau
+        @return: -1 si l'état final est atteint, sinon le plus petit f dépassant le seuil
+        """
+        nonlocal noeuds_explores, generes, doublons, prochain_releve, temps_depasse
+        f = g + h
+        if f > seuil:
+            return f
+        if h == 0 and plateau == plateau_final:
+            return -1
+
+        noeuds_explores += 1
+        if noeuds_explores >= prochain_releve:
+            prochain_releve = statistiques.releve(noeuds_explores, generes, doublons, len(chemin), 0)
+        if noeuds_explores & 0xFFF == 0 and time.time() - temps_debut > limite_temps:
+            temps_depasse = True
+            return -1
+
+        minimum = float('inf')
+        for case in voisins[vide]:
+            if case == precedent:
+                doublons += 1
+                continue
+            generes += 1
+            valeur = plateau[case]
+            if table is not None:
+                couts = table[valeur]
+                h_suivant = h + couts[vide] - couts[case]
+            else:
+                h_suivant = h + variation(positions, valeur, vide)
+
+            plateau[vide] = valeur
+            plateau[case] = 0
+            positions[valeur] = vide
+            positions[0] = case
+            chemin.append(case)
+            resultat = recherche(g + 1, h_suivant, seuil, case, vide)
+            if resultat == -1:
+                return -1
+            chemin.pop()
+            plateau[case] = valeur
+            plateau[vide] = 0
+            positions[valeur] = case
+            positions[0] = vide
+
+            if resultat < minimum:
+                minimum = resultat
+        return minimum
+
+    h_initial = fonction_h.evaluer(positions)
+    seuil = h_initial
+    while True:
+        resultat = recherche(0, h_initial, seuil, chemin[0], -1)
+        statistiques.releve(noeuds_explores, generes, doublons, len(chemin), 0)
+        if temps_depasse:
+            statistiques.terminer(LIMITE_TEMPS)
+            print(f"Limite de temps dépassée ({limite_temps} secondes)")
+            return None
+        if resultat == -1:
+            break
+        if resultat == float('inf'):
+            statistiques.terminer(EPUISE)
+            print("Aucune solution trouvée avec IDA*")
+            return None
+        seuil = resultat
+    statistiques.terminer(RESOLU, len(chemin) - 1)
+
+    if stocker_chemin:
+        # Les cases successives de la case vide donnent les déplacements
+        jeu.enregistrer_solution(etat_initial, ''.join(codage.direction(vide, case) for vide, case in zip(chemin, chemin[1:])))
+
+    return codage.decoder(codage.depuis_plateau(plateau_final))
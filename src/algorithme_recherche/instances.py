@@ -0,0 +1,139 @@
+import argparse
+import random
+import struct
+from jeu.jeuTaquin import JeuTaquin, lire_dimensions
+from jeu.etatCompact import CodageEtat
+
+# Entête d'un fichier d'instances : signature, version, lignes, colonnes, octets par code, nombre d'instances
+SIGNATURE = b'TAQN'
+VERSION = 1
+ENTETE = struct.Struct('<4sBBBBI')
+# Profondeur optimale inconnue dans un fichier d'instances
+PROFONDEUR_INCONNUE = 255
+
+def generer_aleatoires(dimensions: tuple, nombre: int, graine: int) -> list:
+    """
+    @brief Génère des états aléatoires résolvables, uniformes, reproductibles à partir d'une graine
+    @param dimensions: Couple (lignes, colonnes) du plateau
+    @param nombre: Nombre d'instances
+    @param graine: Graine du générateur aléatoire
+    @return: Liste de couples (code initial, profondeur optimale ou None)
+    """
+    jeu = JeuTaquin(*dimensions)
+    generateur = random.Random(f"{graine}-{jeu.codage.dimensions}")
+    return [(jeu.encoder_etat(jeu.generate_random_state(generateur)), None) for _ in range(nombre)]
+
+def generer_marches(dimensions: tuple, nombre: int, graine: int, longueurs: list) -> list:
+    """
+    @brief Génère des états par marches aléatoires depuis l'état final, nombre par longueur
+    @param dimensions: Couple (lignes, colonnes) du plateau
+    @param nombre: Nombre d'instances par longueur
+    @param graine: Graine du générateur aléatoire
+    @param longueurs: Longueurs des marches (voir JeuTaquin.generate_random_walk_state)
+    @return: Liste de couples (code initial, None) ; la profondeur optimale est au plus la longueur
+
+    Contrairement aux états uniformes, la difficulté suit la longueur de la
+    marche, ce qui permet de mesurer les algorithmes sur le 4x4 et au-delà.
+    """
+    jeu = JeuTaquin(*dimensions)
+    generateur = random.Random(f"{graine}-{jeu.codage.dimensions}")
+    return [(jeu.encoder_etat(jeu.generate_random_walk_state(longueur, generateur)), None)
+            for longueur in longueurs for _ in range(nombre)]
+
+def generer_par_profondeur(dimensions: tuple, nombre: int, graine: int, profondeurs: list) -> list:
+    """
+    @brief Tire des états de distance optimale connue, nombre par profondeur (grilles d'au plus 10 cases)
+    @param dimensions: Couple (lignes, colonnes) du plateau
+    @param nombre: Nombre d'instances par profondeur
+    @param graine: Graine du générateur aléatoire
+    @param profondeurs: Distances optimales voulues
+    @return: Liste de couples (code initial, profondeur optimale)
+    @throws ValueError si le plateau est trop grand pour la table complète
+
+    Les états sont lus dans la table de l'espace d'états complet (voir table.py) ;
+    une profondeur qui compte moins de nombre états les fournit tous.
+    """
+    from algorithme_recherche.table import etats_a_profondeur
+    jeu = JeuTaquin(*dimensions)
+    code_final = jeu.encoder_etat(jeu.final_positions)
+    generateur = random.Random(f"{graine}-{jeu.codage.dimensions}")
+    instances = []
+    for profondeur in profondeurs:
+        codes = etats_a_profondeur(jeu.codage, code_final, profondeur)
+        instances += [(code, profondeur) for code in generateur.sample(codes, min(nombre, len(codes)))]
+    return instances
+
+def ecrire_instances(chemin: str, jeu: JeuTaquin, instances: list) -> None:
+    """
+    @brief Écrit des instances dans un fichier binaire compact
+    @param chemin: Fichier à créer
+    @param jeu: Jeu dont les instances sont tirées (dimensions et état final)
+    @param instances: Liste de couples (code initial, profondeur optimale ou None)
+
+    Après l'entête et le code de l'état final, chaque instance occupe le code
+    compact de son état (octets petit-boutistes, 8 octets jusqu'au 4x4) suivi
+    d'un octet de profondeur (PROFONDEUR_INCONNUE si elle n'est pas connue).
+    """
+    codage = jeu.codage
+    octets = (codage.bits * codage.taille + 7) // 8
+    donnees = bytearray(ENTETE.pack(SIGNATURE, VERSION, codage.lignes, codage.colonnes, octets, len(instances)))
+    donnees += codage.encoder(jeu.final_positions).to_bytes(octets, 'little')
+    for code, profondeur in instances:
+        donnees += code.to_bytes(octets, 'little')
+        donnees.append(PROFONDEUR_INCONNUE if profondeur is None else profondeur)
+    with open(chemin, 'wb') as f:
+        f.write(donnees)
+
+def lire_instances(chemin: str) -> tuple:
+    """
+    @brief Relit un fichier écrit par ecrire_instances
+    @param chemin: Fichier d'instances
+    @return: Triplet (jeu avec les dimensions et l'état final du fichier, code de l'état final, liste de couples (code initial, profondeur ou None))
+    @throws ValueError si le fichier n'est pas un fichier d'instances
+    """
+    with open(chemin, 'rb') as f:
+        donnees = f.read()
+    if len(donnees) < ENTETE.size:
+        raise ValueError(f"{chemin} : fichier d'instances trop court.")
+    signature, version, lignes, colonnes, octets, nombre = ENTETE.unpack_from(donnees)
+    if signature != SIGNATURE or version != VERSION:
+        raise ValueError(f"{chemin} : ce n'est pas un fichier d'instances (version {VERSION}).")
+    if len(donnees) != ENTETE.size + octets + nombre * (octets + 1):
+        raise ValueError(f"{chemin} : taille incohérente avec {nombre} instances.")
+    position = ENTETE.size
+    code_final = int.from_bytes(donnees[position:position + octets], 'little')
+    position += octets
+    jeu = JeuTaquin(lignes, colonnes, CodageEtat(lignes, colonnes).decoder(code_final))
+    instances = []
+    for _ in range(nombre):
+        code = int.from_bytes(donnees[position:position + octets], 'little')
+        profondeur = donnees[position + octets]
+        instances.append((code, None if profondeur == PROFONDEUR_INCONNUE else profondeur))
+        position += octets + 1
+    return jeu, code_final, instances
+
+def main():
+    """
+    @brief Génère un fichier d'instances : python -m algorithme_recherche.instances <k ou LxC> <fichier> [--marche L... | --profondeur d...]
+    """
+    parser = argparse.ArgumentParser(description="Génère un fichier compact d'instances du jeu de taquin")
+    parser.add_argument('taille', type=lire_dimensions, help="Taille de grille, k pour k x k ou LxC")
+    parser.add_argument('fichier', help="Fichier d'instances à écrire")
+    groupe = parser.add_mutually_exclusive_group()
+    groupe.add_argument('--marche', type=int, nargs='+', help="Longueurs des marches aléatoires depuis l'état final")
+    groupe.add_argument('--profondeur', type=int, nargs='+', help="Distances optimales exactes (grilles d'au plus 10 cases)")
+    parser.add_argument('--nombre', type=int, default=100, help="Nombre d'instances (par longueur ou profondeur, défaut: 100)")
+    parser.add_argument('--graine', type=int, default=0, help="Graine des tirages (défaut: 0)")
+    arguments = parser.parse_args()
+
+    if arguments.marche:
+        instances = generer_marches(arguments.taille, arguments.nombre, arguments.graine, arguments.marche)
+    elif arguments.profondeur:
+        instances = generer_par_profondeur(arguments.taille, arguments.nombre, arguments.graine, arguments.profondeur)
+    else:
+        instances = generer_aleatoires(arguments.taille, arguments.nombre, arguments.graine)
+    ecrire_instances(arguments.fichier, JeuTaquin(*arguments.taille), instances)
+    print(f"{len(instances)} instances écrites dans {arguments.fichier}")
+
+if __name__ == "__main__":
+    main()
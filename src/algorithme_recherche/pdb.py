@@ -0,0 +1,169 @@
+import mmap
+import os
+import sys
+import time
+from array import array
+from jeu.etatCompact import CodageEtat
+from algorithme_recherche.utile import REPERTOIRE_TABLES, rang_motif, motif_depuis_rang, nombre_motifs
+
+# Découpages disjoints par défaut des tuiles (hors case vide) selon les dimensions du plateau
+GROUPES_DEFAUT = {
+    (2, 2): ((1, 2, 3),),
+    (3, 3): ((1, 2, 3, 4), (5, 6, 7, 8)),
+    (4, 4): ((1, 5, 6, 9, 10, 13), (7, 8, 11, 12, 14, 15), (2, 3, 4)),
+    (2, 5): ((1, 2, 3, 6, 7, 8), (4, 5, 9)),
+    (2, 6): ((1, 2, 3, 7, 8, 9), (4, 5, 6, 10, 11)),
+    (3, 4): ((1, 2, 5, 6, 9, 10), (3, 4, 7, 8, 11)),
+}
+
+INCONNU = 255
+
+_bases_chargees: dict = {}
+
+class BaseMotif:
+    """
+    @brief Table des distances d'un groupe de tuiles, indexée par rang_motif
+    """
+    def __init__(self, groupe: tuple, taille: int, donnees):
+        """
+        @param groupe: Tuiles du motif
+        @param taille: Nombre de cases du plateau
+        @param donnees: Table d'octets (bytearray ou mmap) de nombre_motifs entrées
+        """
+        self.groupe = groupe
+        self.taille = taille
+        self.donnees = donnees
+
+    def valeur(self, positions: list) -> int:
+        """
+        @brief Retourne le nombre minimal de mouvements des tuiles du groupe
+        @param positions: Liste où l'indice est la valeur de la tuile et la valeur sa case
+        """
+        return self.donnees[rang_motif([positions[valeur] for valeur in self.groupe], self.taille)]
+
+def construire_base(codage: CodageEtat, positions_finales: list, groupe: tuple) -> bytearray:
+    """
+    @brief Construit la table d'un groupe par parcours en largeur rétrograde depuis l'état final
+    @param codage: Codage des états du plateau
+    @param positions_finales: Case finale de chaque tuile
+    @param groupe: Tuiles du motif
+    @return: Table des distances indexée par rang_motif
+
+    Seuls les déplacements des tuiles du groupe sont comptés. Les cases libres
+    accessibles par la case vide sans déplacer de tuile du groupe forment une
+    région ; un nœud du parcours est un couple (motif, région), la région étant
+    représentée par sa plus petite case.
+    """
+    taille = codage.taille
+    voisins = codage.voisins
+    nombre = len(groupe)
+    distances = bytearray([INCONNU]) * nombre_motifs(nombre, taille)
+    vus = bytearray(len(distances) * taille // 8 + 1)
+
+    def region(occupees: list, depart: int) -> list:
+        cases = [depart]
+        dans_region = [False] * taille
+        dans_region[depart] = True
+        for case in cases:
+            for voisine in voisins[case]:
+                if not dans_region[voisine] and occupees[voisine] < 0:
+                    dans_region[voisine] = True
+                    cases.append(voisine)
+        return cases
+
+    cases_finales = [positions_finales[valeur] for valeur in groupe]
+    occupees = [-1] * taille
+    for i, case in enumerate(cases_finales):
+        occupees[case] = i
+    rang = rang_motif(cases_finales, taille)
+    noeud = rang * taille + min(region(occupees, positions_finales[0]))
+    vus[noeud >> 3] |= 1 << (noeud & 7)
+    distances[rang] = 0
+
+    couche = array('q', [noeud])
+    profondeur = 0
+    while couche:
+        profondeur += 1
+        suivante = array('q')
+        for noeud in couche:
+            rang, representant = divmod(noeud, taille)
+            cases = motif_depuis_rang(rang, nombre, taille)
+            occupees = [-1] * taille
+            for i, case in enumerate(cases):
+                occupees[case] = i
+            for libre in region(occupees, representant):
+                for voisine in voisins[libre]:
+                    i = occupees[voisine]
+                    if i < 0:
+                        continue
+                    # La tuile i glisse dans la case libre, la case vide prend sa place
+                    cases[i] = libre
+                    occupees[libre], occupees[voisine] = i, -1
+                    rang_suivant = rang_motif(cases, taille)
+                    suivant = rang_suivant * taille + min(region(occupees, voisine))
+                    if not vus[suivant >> 3] & (1 << (suivant & 7)):
+                        vus[suivant >> 3] |= 1 << (suivant & 7)
+                        suivante.append(suivant)
+                        if distances[rang_suivant] == INCONNU:
+                            distances[rang_suivant] = profondeur
+                    cases[i] = voisine
+                    occupees[libre], occupees[voisine] = -1, i
+        couche = suivante
+    return distances
+
+def chemin_base(codage: CodageEtat, positions_finales: list, groupe: tuple, repertoire: str | None = None) -> str:
+    """
+    @brief Nom du fichier d'une table, qui dépend du plateau, de l'état final et du groupe
+    """
+    code_final = codage.depuis_plateau(sorted(range(codage.taille), key=lambda valeur: positions_finales[valeur]))
+    nom = f"pdb_{codage.dimensions}_{code_final:x}_{'-'.join(map(str, groupe))}.bin"
+    return os.path.join(repertoire or REPERTOIRE_TABLES, nom)
+
+def charger_pdb(codage: CodageEtat, positions_finales: list, groupes: tuple | None = None, repertoire: str | None = None) -> list:
+    """
+    @brief Charge (et construit au besoin) les tables d'un découpage en groupes disjoints
+    @param codage: Codage des états du plateau
+    @param positions_finales: Case finale de chaque tuile
+    @param groupes: Groupes de tuiles disjoints (défaut: GROUPES_DEFAUT selon les dimensions)
+    @param repertoire: Répertoire des fichiers de tables (défaut: REPERTOIRE_TABLES)
+    @return: Liste de BaseMotif
+    @throws ValueError si aucun découpage n'est disponible pour ces dimensions
+
+    Les tables sont écrites une fois sur disque puis projetées en mémoire (mmap) ;
+    elles restent chargées pour toutes les recherches suivantes du processus.
+    """
+    if groupes is None:
+        if (codage.lignes, codage.colonnes) not in GROUPES_DEFAUT:
+            raise ValueError(f"Aucun découpage par défaut pour une grille {codage.dimensions}.")
+        groupes = GROUPES_DEFAUT[(codage.lignes, codage.colonnes)]
+
+    bases = []
+    for groupe in groupes:
+        chemin = chemin_base(codage, positions_finales, groupe, repertoire)
+        if chemin not in _bases_chargees:
+            if not os.path.exists(chemin):
+                print(f"Construction de la base de motifs {groupe}...")
+                debut = time.time()
+                distances = construire_base(codage, positions_finales, groupe)
+                os.makedirs(os.path.dirname(chemin), exist_ok=True)
+                with open(chemin, 'wb') as f:
+                    f.write(distances)
+                print(f"Base de motifs écrite dans {chemin} ({time.time() - debut:.1f} secondes)")
+            with open(chemin, 'rb') as f:
+                donnees = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            _bases_chargees[chemin] = BaseMotif(groupe, codage.taille, donnees)
+        bases.append(_bases_chargees[chemin])
+    return bases
+
+def main():
+    """
+    @brief Précalcule les tables par défaut : python -m algorithme_recherche.pdb <k ou LxC>...
+    """
+    from jeu.jeuTaquin import JeuTaquin, lire_dimensions
+    for argument in sys.argv[1:] or ['3']:
+        jeu = JeuTaquin(*lire_dimensions(argument))
+        codage = jeu.codage
+        charger_pdb(codage, codage.vers_positions(codage.encoder(jeu.final_positions)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+from jeu.jeuTaquin import JeuTaquin
+import heapq
+import itertools
+import time
+from algorithme_recherche.heuristiques import obtenir_heuristique
+from algorithme_recherche.table import meme_classe
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, LIMITE_TEMPS, LIMITE_NOEUDS, EPUISE
+
+# Taille moyenne d'un nœud en mémoire (objet Noeud, liste de ses enfants et entrées de tas), pour convertir un budget en Mo
+OCTETS_PAR_NOEUD = 400
+INFINI = float('inf')
+# Rapport entre la taille d'un tas et le nombre de nœuds en mémoire au-delà duquel ses entrées périmées sont supprimées
+COMPACTAGE = 2
+
+class Noeud:
+    """
+    @brief Nœud de l'arbre de recherche de SMA*
+
+    Un nœud connaît les cases vides des successeurs qu'il n'a pas encore
+    générés et, pour les successeurs oubliés faute de mémoire, la valeur f
+    qu'ils avaient : elle reste un minorant du coût des solutions qui passent
+    par eux et sert de priorité lorsqu'il faut les régénérer.
+    """
+    __slots__ = ('code', 'vide', 'g', 'h', 'f', 'parent', 'enfants', 'a_generer', 'oublies', 'vivant')
+
+    def __init__(self, code: int, vide: int, g: int, h: int, f, parent: 'Noeud | None', a_generer: list):
+        self.code = code
+        self.vide = vide
+        self.g = g
+        self.h = h
+        self.f = f
+        self.parent = parent
+        self.enfants: list = []
+        self.a_generer = a_generer
+        self.oublies: dict | None = None
+        self.vivant = True
+
+    def cle(self):
+        """
+        @brief Minorant du f du prochain successeur à générer, None s'il n'en reste aucun
+        """
+        if self.a_generer:
+            return self.f
+        if self.oublies:
+            return min(self.oublies.values())
+        return None
+
+def smastar(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, limite_temps: float = 40.0, max_noeuds: int | None = None, memoire_mo: float | None = None,
+            stocker_chemin: bool = False, heuristique: str = "manhattan", statistiques: StatistiquesRecherche | None = None):
+    """
+    @brief Implémente A* à mémoire bornée simplifié (SMA*)
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param limite_temps: Temps maximum d'exécution en secondes (défaut: 40.0)
+    @param max_noeuds: Nombre maximal de nœuds gardés en mémoire (défaut: celui de memoire_mo, 1 000 000 si aucun budget n'est donné)
+    @param memoire_mo: Budget mémoire en mégaoctets, converti en nœuds avec OCTETS_PAR_NOEUD (défaut: None)
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param heuristique: Nom de l'heuristique, voir heuristiques.HEURISTIQUES (défaut: "manhattan")
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @return: État final si trouvé, None sinon
+    @throws ValueError si le budget est inférieur à 2 nœuds
+
+    Comme A*, développe d'abord le nœud de plus petit f (le plus profond à f
+    égal), mais génère ses successeurs un par un. Quand le budget est atteint,
+    la feuille de plus grand f (la moins profonde à f égal) est oubliée : son
+    f est conservé par son parent, qui la régénérera si ce f redevient le plus
+    petit. Lorsqu'un nœud a généré tous ses successeurs, son f devient le plus
+    petit f de ses successeurs et la mise à jour remonte vers la racine.
+    Un successeur qui atteint la profondeur max_noeuds - 1 sans être l'état
+    final reçoit f infini : le chemin ne tiendrait pas dans le budget.
+    Avec une heuristique admissible, la solution est optimale dès que le
+    chemin optimal tient dans le budget. Comme dans IDA*, la case vide ne
+    revient jamais directement sur la case qu'elle vient de quitter.
+    La frontière mesurée est la file des nœuds à développer, les états fermés
+    sont les nœuds gardés en mémoire.
+    """
+    temps_debut = time.time()
+    if max_noeuds is None:
+        max_noeuds = int(memoire_mo * 2 ** 20 // OCTETS_PAR_NOEUD) if memoire_mo is not None else 1000000
+    if max_noeuds < 2:
+        raise ValueError(f"Le budget de SMA* doit compter au moins 2 nœuds : {max_noeuds}")
+    developpes = 0
+    generes = 0
+    doublons = 0
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("smastar")
+    jeu.statistiques = statistiques
+    prochain_releve = 0
+
+    codage = jeu.codage
+    voisins = codage.voisins
+    decalages = codage.decalages
+    masque = codage.masque
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+    fonction_h = obtenir_heuristique(heuristique, codage, etat_final)
+    table = fonction_h.table
+
+    if not meme_classe(codage, code_initial, code_final):
+        statistiques.terminer(EPUISE)
+        print("État non résolvable, aucune solution trouvée avec SMA*")
+        return None
+
+    vide_initial = codage.case_vide(code_initial)
+    h_initial = fonction_h.evaluer_code(code_initial)
+    racine = Noeud(code_initial, vide_initial, 0, h_initial, h_initial, None, list(voisins[vide_initial]))
+    nombre = 1
+    compteur = itertools.count()
+    # Nœuds à développer, par (minorant du prochain f, profondeur décroissante) ; feuilles par (f décroissant, profondeur)
+    ouverts = [(racine.f, 0, next(compteur), racine)]
+    feuilles = []
+    trouve = None
+
+    while ouverts:
+        cle, _, _, noeud = heapq.heappop(ouverts)
+        # Entrée périmée : nœud oublié, sans successeur à générer ou dont la priorité a changé
+        if not noeud.vivant or cle != noeud.cle():
+            continue
+        if cle == INFINI:
+            break
+        if noeud.code == code_final:
+            trouve = noeud
+            break
+        developpes += 1
+        if developpes >= prochain_releve:
+            prochain_releve = statistiques.releve(developpes, generes, doublons, len(ouverts), nombre)
+        if developpes & 0xFFF == 0 and time.time() - temps_debut > limite_temps:
+            statistiques.releve(developpes, generes, doublons, len(ouverts), nombre)
+            statistiques.terminer(LIMITE_TEMPS)
+            print(f"Limite de temps dépassée ({limite_temps} secondes)")
+            return None
+
+        # Génère un successeur : d'abord les nouveaux, puis les oubliés par f croissant
+        code, vide = noeud.code, noeud.vide
+        if noeud.a_generer:
+            case = noeud.a_generer.pop()
+            f_oublie = None
+        else:
+            case = min(noeud.oublies, key=noeud.oublies.__getitem__)
+            f_oublie = noeud.oublies.pop(case)
+        generes += 1
+        valeur = (code >> decalages[case]) & masque
+        code_suivant = code - (valeur << decalages[case]) + (valeur << decalages[vide])
+        if table is not None:
+            h_suivant = noeud.h + table[valeur][vide] - table[valeur][case]
+        else:
+            h_suivant = noeud.h + fonction_h.variation(codage.vers_positions(code), valeur, vide)
+        g_suivant = noeud.g + 1
+        if code_suivant != code_final and g_suivant >= max_noeuds - 1:
+            f_suivant = INFINI
+        else:
+            f_suivant = max(noeud.f, g_suivant + h_suivant, f_oublie or 0)
+        # Le retour direct sur la case précédente n'est jamais généré
+        a_generer = [voisine for voisine in voisins[case] if voisine != vide]
+        doublons += 1
+        enfant = Noeud(code_suivant, case, g_suivant, h_suivant, f_suivant, noeud, a_generer)
+        noeud.enfants.append(enfant)
+        nombre += 1
+        heapq.heappush(ouverts, (f_suivant, -g_suivant, next(compteur), enfant))
+        heapq.heappush(feuilles, (-f_suivant, g_suivant, next(compteur), enfant))
+
+        # Mise à jour des f vers la racine, pour les nœuds dont tous les successeurs sont connus
+        courant = noeud
+        while courant is not None and not courant.a_generer:
+            nouveau = min(fils.f for fils in courant.enfants) if courant.enfants else INFINI
+            if courant.oublies:
+                nouveau = min(nouveau, min(courant.oublies.values()))
+            if nouveau == courant.f:
+                break
+            courant.f = nouveau
+            if not courant.enfants and courant is not racine:
+                heapq.heappush(feuilles, (-nouveau, courant.g, next(compteur), courant))
+            courant = courant.parent
+        if noeud.cle() is not None:
+            heapq.heappush(ouverts, (noeud.cle(), -noeud.g, next(compteur), noeud))
+
+        # Les entrées périmées des deux tas sont éliminées dès qu'elles dominent, la mémoire reste ainsi proportionnelle au budget
+        if len(ouverts) > COMPACTAGE * nombre:
+            ouverts = [entree for entree in ouverts if entree[3].vivant and entree[0] == entree[3].cle()]
+            heapq.heapify(ouverts)
+        if len(feuilles) > COMPACTAGE * nombre:
+            feuilles = [entree for entree in feuilles if entree[3].vivant and not entree[3].enfants and -entree[0] == entree[3].f]
+            heapq.heapify(feuilles)
+
+        # Budget atteint : oubli des pires feuilles
+        while nombre > max_noeuds and feuilles:
+            moins_f, _, _, feuille = heapq.heappop(feuilles)
+            if not feuille.vivant or feuille.enfants or feuille is racine or -moins_f != feuille.f:
+                continue
+            feuille.vivant = False
+            nombre -= 1
+            parent = feuille.parent
+            parent.enfants.remove(feuille)
+            if parent.oublies is None:
+                parent.oublies = {}
+            parent.oublies[feuille.vide] = feuille.f
+            heapq.heappush(ouverts, (parent.cle(), -parent.g, next(compteur), parent))
+            if not parent.enfants and parent is not racine:
+                heapq.heappush(feuilles, (-parent.f, parent.g, next(compteur), parent))
+
+    statistiques.releve(developpes, generes, doublons, len(ouverts), nombre)
+    if trouve is None:
+        # Toutes les branches ont reçu f infini : aucun chemin ne tient dans le budget
+        statistiques.terminer(LIMITE_NOEUDS)
+        print(f"Aucune solution trouvée avec SMA* dans un budget de {max_noeuds} nœuds")
+        return None
+    statistiques.terminer(RESOLU, trouve.g, 1.0 if fonction_h.admissible else None)
+
+    if stocker_chemin:
+        cases = []
+        noeud = trouve
+        while noeud is not None:
+            cases.append(noeud.vide)
+            noeud = noeud.parent
+        cases.reverse()
+        jeu.enregistrer_solution(etat_initial, ''.join(codage.direction(vide, case) for vide, case in zip(cases, cases[1:])))
+    return codage.decoder(code_final)
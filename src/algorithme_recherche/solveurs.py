@@ -0,0 +1,92 @@
+import inspect
+from jeu.jeuTaquin import JeuTaquin
+from algorithme_recherche.astar import astar, arastar, lire_poids
+from algorithme_recherche.bfs import bfs, bidirectional_bfs
+from algorithme_recherche.bfs_externe import bfs_externe
+from algorithme_recherche.dfs import dfs, iddfs
+from algorithme_recherche.idastar import idastar
+from algorithme_recherche.hdastar import hdastar
+from algorithme_recherche.smastar import smastar
+from algorithme_recherche.table import table
+from algorithme_recherche.vectorise import bfs_vectorise, astar_vectorise
+from algorithme_recherche.heuristiques import HEURISTIQUES
+from algorithme_recherche.cache import CacheSolutions
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU
+
+# Registre des algorithmes de recherche, par nom
+ALGORITHMES = {
+    'astar': astar,
+    'arastar': arastar,
+    'bfs': bfs,
+    'bibfs': bidirectional_bfs,
+    'bfs_externe': bfs_externe,
+    'dfs': dfs,
+    'iddfs': iddfs,
+    'idastar': idastar,
+    'smastar': smastar,
+    'hdastar': hdastar,
+    'table': table,
+    'bfs_vectorise': bfs_vectorise,
+    'astar_vectorise': astar_vectorise,
+}
+
+# Algorithmes dont la solution est toujours optimale ; les autres le sont selon leur heuristique ou leur borne
+ALGORITHMES_OPTIMAUX = ('bfs', 'bibfs', 'bfs_externe', 'iddfs', 'table', 'bfs_vectorise')
+
+def solution_optimale(nom: str, options: dict, statistiques: StatistiquesRecherche | None) -> bool:
+    """
+    @brief Indique si la solution rendue par un algorithme est garantie optimale
+    @param nom: Nom de l'algorithme (clé de ALGORITHMES)
+    @param options: Paramètres transmis à l'algorithme
+    @param statistiques: Statistiques de la recherche, dont la borne de sous-optimalité si l'algorithme la calcule
+    """
+    if statistiques is not None and statistiques.borne is not None:
+        return statistiques.borne == 1
+    if nom in ALGORITHMES_OPTIMAUX:
+        return True
+    parametres = inspect.signature(ALGORITHMES[nom]).parameters
+    if 'heuristique' not in parametres:
+        return False
+    if 'poids' in parametres and lire_poids(options.get('poids', parametres['poids'].default)) != 1:
+        return False
+    return HEURISTIQUES[options.get('heuristique', parametres['heuristique'].default)].admissible
+
+def resoudre(nom: str, jeu: JeuTaquin, etat_initial: dict, etat_final: dict, cache: CacheSolutions | None = None, **options):
+    """
+    @brief Lance un algorithme de recherche à partir de son nom
+    @param nom: Nom de l'algorithme (clé de ALGORITHMES)
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param cache: Cache des solutions consulté avant la recherche et complété après (défaut: None, pas de cache)
+    @param options: Paramètres supplémentaires transmis à l'algorithme
+    @return: État final si trouvé, None sinon
+    @throws ValueError si le nom est inconnu
+
+    Avec un cache, un algorithme optimal n'accepte qu'une solution optimale ;
+    une solution trouvée est lue sans recherche, les statistiques portent
+    alors le nom "cache" et aucun nœud développé. Le chemin est toujours
+    demandé à l'algorithme pour pouvoir l'enregistrer.
+    """
+    if nom not in ALGORITHMES:
+        raise ValueError(f"Algorithme inconnu : {nom} (disponibles : {', '.join(ALGORITHMES)})")
+    if cache is None:
+        return ALGORITHMES[nom](jeu, etat_initial, etat_final, **options)
+
+    codage = jeu.codage
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+    trouvee = cache.chercher(codage, code_initial, code_final, solution_optimale(nom, options, None))
+    if trouvee is not None:
+        mouvements, optimal = trouvee
+        statistiques = options.get('statistiques') or StatistiquesRecherche()
+        statistiques.demarrer("cache")
+        statistiques.terminer(RESOLU, len(mouvements), 1.0 if optimal else None)
+        jeu.statistiques = statistiques
+        jeu.enregistrer_solution(etat_initial, mouvements)
+        return codage.decoder(code_final)
+
+    resultat = ALGORITHMES[nom](jeu, etat_initial, etat_final, **{**options, 'stocker_chemin': True})
+    if resultat is not None:
+        cache.ajouter(codage, code_initial, code_final, jeu.solution_path, solution_optimale(nom, options, jeu.statistiques))
+    return resultat
@@ -0,0 +1,143 @@
+import time
+import tracemalloc
+
+# Raisons de fin d'une recherche
+RESOLU = "resolu"
+LIMITE_TEMPS = "limite_temps"
+LIMITE_NOEUDS = "limite_noeuds"
+EPUISE = "epuise"
+
+# Nombre de nœuds développés entre deux relevés des tailles de la frontière et des états fermés
+PAS_RELEVE = 1024
+
+class StatistiquesRecherche:
+    """
+    @brief Mesures d'une recherche : nœuds, tailles maximales, mémoire et raison de fin
+
+    Les algorithmes comptent dans des variables locales et transmettent leurs
+    compteurs par releve() tous les PAS_RELEVE nœuds développés (ou plus souvent
+    si le rappel le demande), puis par terminer() : le coût dans la boucle
+    principale se limite à une comparaison d'entiers. Les tailles maximales de
+    la frontière et des états fermés sont celles observées lors des relevés.
+    Après une recherche, les statistiques sont disponibles dans jeu.statistiques.
+    """
+    def __init__(self, rappel=None, intervalle: int = 10000, suivre_memoire: bool = False):
+        """
+        @param rappel: Fonction appelée avec ces statistiques tous les intervalle nœuds développés (défaut: None)
+        @param intervalle: Nombre de nœuds développés entre deux appels du rappel (défaut: 10000)
+        @param suivre_memoire: Mesure le pic d'allocation avec tracemalloc, ce qui ralentit la recherche (défaut: False)
+        """
+        self.rappel = rappel
+        self.intervalle = intervalle
+        self.suivre_memoire = suivre_memoire
+        self._memoire_demarree = False
+        self._remettre_a_zero(None)
+
+    def _remettre_a_zero(self, algorithme: str | None) -> None:
+        self.algorithme = algorithme
+        self.noeuds_developpes = 0
+        self.noeuds_generes = 0
+        self.doublons = 0
+        self.frontiere_max = 0
+        self.fermes_max = 0
+        self.profondeur = None
+        self.borne = None
+        self.temps = 0.0
+        self.memoire_max = None
+        self.raison = None
+        self._prochain_rappel = self.intervalle if self.rappel is not None else None
+        self._debut = time.time()
+
+    def demarrer(self, algorithme: str | None = None) -> None:
+        """
+        @brief Remet les compteurs à zéro et lance la mesure de la mémoire au début d'une recherche
+        @param algorithme: Nom de l'algorithme mesuré
+        """
+        self._remettre_a_zero(algorithme)
+        if self.suivre_memoire:
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+                self._memoire_demarree = True
+            self._debut = time.time()
+
+    def releve(self, developpes: int, generes: int, doublons: int, frontiere: int, fermes: int) -> int:
+        """
+        @brief Met à jour les compteurs et déclenche le rappel si besoin
+        @param developpes: Nombre de nœuds développés
+        @param generes: Nombre de successeurs générés
+        @param doublons: Nombre de successeurs écartés car déjà vus
+        @param frontiere: Taille actuelle de la frontière
+        @param fermes: Nombre actuel d'états fermés (ou vus)
+        @return: Nombre de nœuds développés auquel faire le prochain relevé
+        """
+        self.noeuds_developpes = developpes
+        self.noeuds_generes = generes
+        self.doublons = doublons
+        if frontiere > self.frontiere_max:
+            self.frontiere_max = frontiere
+        if fermes > self.fermes_max:
+            self.fermes_max = fermes
+        self.temps = time.time() - self._debut
+
+        prochain = developpes + PAS_RELEVE
+        if self._prochain_rappel is not None:
+            if developpes >= self._prochain_rappel:
+                self.rappel(self)
+                self._prochain_rappel = developpes + self.intervalle
+            prochain = min(prochain, self._prochain_rappel)
+        return prochain
+
+    def terminer(self, raison: str, profondeur: int | None = None, borne: float | None = None) -> None:
+        """
+        @brief Enregistre la fin de la recherche
+        @param raison: RESOLU, LIMITE_TEMPS, LIMITE_NOEUDS ou EPUISE
+        @param profondeur: Longueur de la solution en mouvements, si trouvée
+        @param borne: Rapport maximal garanti entre cette longueur et l'optimum, si connu (1.0 pour une solution optimale)
+        """
+        self.raison = raison
+        self.profondeur = profondeur
+        self.borne = borne
+        self.temps = time.time() - self._debut
+        if self.suivre_memoire:
+            self.memoire_max = tracemalloc.get_traced_memory()[1]
+            if self._memoire_demarree:
+                tracemalloc.stop()
+                self._memoire_demarree = False
+
+    @property
+    def noeuds_par_seconde(self) -> float:
+        """
+        @brief Vitesse de développement des nœuds
+        """
+        return self.noeuds_developpes / self.temps if self.temps > 0 else 0.0
+
+    def en_dict(self) -> dict:
+        """
+        @brief Retourne les mesures sous forme de dictionnaire (sérialisable, sans le rappel)
+        """
+        return {
+            'algorithme': self.algorithme,
+            'raison': self.raison,
+            'profondeur': self.profondeur,
+            'borne': self.borne,
+            'temps': self.temps,
+            'noeuds_developpes': self.noeuds_developpes,
+            'noeuds_generes': self.noeuds_generes,
+            'doublons': self.doublons,
+            'frontiere_max': self.frontiere_max,
+            'fermes_max': self.fermes_max,
+            'noeuds_par_seconde': self.noeuds_par_seconde,
+            'memoire_max': self.memoire_max,
+        }
+
+    def __str__(self) -> str:
+        texte = (f"{self.algorithme} : {self.raison}, profondeur {self.profondeur}, {self.noeuds_developpes} nœuds développés, "
+                 f"{self.noeuds_generes} générés, {self.doublons} doublons, frontière max {self.frontiere_max}, "
+                 f"fermés max {self.fermes_max}, {self.noeuds_par_seconde:.0f} nœuds/s")
+        if self.borne is not None:
+            texte += f", au plus {self.borne:.3g} fois l'optimum"
+        if self.memoire_max is not None:
+            texte += f", pic mémoire {self.memoire_max / 1024:.0f} Kio"
+        return texte
@@ -0,0 +1,188 @@
+import mmap
+import os
+import sys
+import time
+from jeu.jeuTaquin import JeuTaquin, lire_dimensions
+from jeu.etatCompact import CodageEtat, DIRECTIONS, OPPOSES, parite_permutation
+from algorithme_recherche.utile import REPERTOIRE_TABLES, rang_etat, motif_depuis_rang, nombre_motifs
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, EPUISE
+
+# Au-delà de 10 cases (3x3, 2x4, 2x5) l'espace d'états ne tient plus en mémoire
+CASES_MAX = 10
+INCONNU = 255
+
+_tables_chargees: dict = {}
+
+def construire_table(codage: CodageEtat, code_final: int) -> bytearray:
+    """
+    @brief Parcourt en largeur tout l'espace d'états depuis l'état final
+    @param codage: Codage des états du plateau
+    @param code_final: Code compact de l'état final
+    @return: Table indexée par rang_etat : (distance << 2) | indice du prochain mouvement
+
+    Le prochain mouvement est l'indice dans DIRECTIONS du déplacement de la
+    case vide qui rapproche d'un pas de l'état final ; INCONNU marque les rangs
+    non atteignables.
+    """
+    taille = codage.taille
+    table = bytearray([INCONNU]) * nombre_motifs(taille - 2, taille)
+    table[rang_etat(codage.vers_positions(code_final))] = 0
+
+    couche = [(code_final, codage.case_vide(code_final))]
+    profondeur = 0
+    while couche:
+        profondeur += 1
+        suivante = []
+        for code, vide in couche:
+            for code_suivant, vide_suivant in codage.successeurs(code, vide):
+                rang = rang_etat(codage.vers_positions(code_suivant))
+                if table[rang] == INCONNU:
+                    # Pour revenir, la case vide refait le chemin inverse
+                    retour = OPPOSES[codage.direction(vide, vide_suivant)]
+                    table[rang] = (profondeur << 2) | DIRECTIONS.index(retour)
+                    suivante.append((code_suivant, vide_suivant))
+        couche = suivante
+    return table
+
+def meme_classe(codage: CodageEtat, code: int, code_final: int) -> bool:
+    """
+    @brief Indique si un état peut atteindre l'état final
+    @param codage: Codage des états du plateau
+    @param code: Code compact de l'état
+    @param code_final: Code compact de l'état final
+    @return: True si les deux états sont dans la même moitié de l'espace d'états
+
+    Chaque mouvement échange la case vide avec une voisine : il change à la
+    fois la parité de la permutation des cases et celle de la distance de
+    Manhattan de la case vide. rang_etat ne distingue pas les deux moitiés,
+    ce test doit donc précéder toute lecture de la table.
+    """
+    ligne, colonne = divmod(codage.case_vide(code), codage.colonnes)
+    ligne_finale, colonne_finale = divmod(codage.case_vide(code_final), codage.colonnes)
+    parite_vide = (abs(ligne - ligne_finale) + abs(colonne - colonne_finale)) & 1
+    parite_plateaux = parite_permutation(codage.vers_plateau(code)) ^ parite_permutation(codage.vers_plateau(code_final))
+    return parite_vide == parite_plateaux
+
+def charger_table(codage: CodageEtat, code_final: int, repertoire: str | None = None):
+    """
+    @brief Charge (et construit au besoin) la table complète d'un plateau et d'un état final
+    @param codage: Codage des états du plateau
+    @param code_final: Code compact de l'état final
+    @param repertoire: Répertoire des fichiers de tables (défaut: REPERTOIRE_TABLES)
+    @return: Table projetée en mémoire (mmap), voir construire_table
+    @throws ValueError si le plateau compte plus de CASES_MAX cases
+    """
+    if codage.taille > CASES_MAX:
+        raise ValueError(f"L'espace d'états d'une grille {codage.dimensions} est trop grand pour être précalculé.")
+    chemin = os.path.join(repertoire or REPERTOIRE_TABLES, f"espace_{codage.dimensions}_{code_final:x}.bin")
+    if chemin not in _tables_chargees:
+        if not os.path.exists(chemin):
+            print(f"Construction de la table complète {codage.dimensions}...")
+            debut = time.time()
+            table = construire_table(codage, code_final)
+            os.makedirs(os.path.dirname(chemin), exist_ok=True)
+            with open(chemin, 'wb') as f:
+                f.write(table)
+            print(f"Table écrite dans {chemin} ({time.time() - debut:.1f} secondes)")
+        with open(chemin, 'rb') as f:
+            _tables_chargees[chemin] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    return _tables_chargees[chemin]
+
+def distance_optimale(jeu: JeuTaquin, etat: dict, etat_final: dict) -> int | None:
+    """
+    @brief Retourne le nombre minimal de mouvements entre deux états
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat: État de départ
+    @param etat_final: État final désiré
+    @return: Distance optimale, None si l'état n'est pas résolvable
+    """
+    codage = jeu.codage
+    code = codage.encoder(etat)
+    code_final = codage.encoder(etat_final)
+    donnees = charger_table(codage, code_final)
+    if not meme_classe(codage, code, code_final):
+        return None
+    entree = donnees[rang_etat(codage.vers_positions(code))]
+    return None if entree == INCONNU else entree >> 2
+
+def etats_a_profondeur(codage: CodageEtat, code_final: int, profondeur: int) -> list:
+    """
+    @brief Liste les états dont la distance optimale à l'état final vaut profondeur
+    @param codage: Codage des états du plateau
+    @param code_final: Code compact de l'état final
+    @param profondeur: Nombre minimal de mouvements recherché
+    @return: Codes compacts des états, dans l'ordre des rangs
+    """
+    donnees = charger_table(codage, code_final)
+    taille = codage.taille
+    codes = []
+    for rang in range(len(donnees)):
+        if donnees[rang] == INCONNU or donnees[rang] >> 2 != profondeur:
+            continue
+        # Les deux dernières tuiles occupent les cases restantes, dans l'ordre de bonne parité
+        cases = motif_depuis_rang(rang, taille - 2, taille)
+        restantes = sorted(set(range(taille)) - set(cases))
+        plateau = [0] * taille
+        for valeur, case in enumerate(cases + restantes):
+            plateau[case] = valeur
+        code = codage.depuis_plateau(plateau)
+        if not meme_classe(codage, code, code_final):
+            plateau[restantes[0]], plateau[restantes[1]] = plateau[restantes[1]], plateau[restantes[0]]
+            code = codage.depuis_plateau(plateau)
+        codes.append(code)
+    return codes
+
+def table(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, stocker_chemin: bool = False, limite_temps: float | None = None,
+          statistiques: StatistiquesRecherche | None = None):
+    """
+    @brief Résout le jeu par simple lecture de la table de l'espace d'états complet
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param limite_temps: Ignoré, la lecture est toujours immédiate ; présent pour l'uniformité avec les autres algorithmes
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @return: État final si trouvé, None sinon
+    @throws ValueError si le plateau compte plus de CASES_MAX cases
+
+    Aucune recherche : à chaque pas la table donne le mouvement optimal, le
+    chemin est donc parcouru en O(profondeur).
+    """
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("table")
+    jeu.statistiques = statistiques
+    codage = jeu.codage
+    code_final = codage.encoder(etat_final)
+    donnees = charger_table(codage, code_final)
+
+    code = codage.encoder(etat_initial)
+    if not meme_classe(codage, code, code_final):
+        statistiques.terminer(EPUISE)
+        print("État non résolvable, absent de la table!")
+        return None
+    vide = codage.case_vide(code)
+    mouvements = []
+    while True:
+        entree = donnees[rang_etat(codage.vers_positions(code))]
+        if entree >> 2 == 0:
+            break
+        direction = DIRECTIONS[entree & 3]
+        code, vide = codage.deplacer(code, vide, direction)
+        mouvements.append(direction)
+    statistiques.releve(len(mouvements), len(mouvements), 0, 0, 0)
+    statistiques.terminer(RESOLU, len(mouvements))
+
+    if stocker_chemin:
+        jeu.enregistrer_solution(etat_initial, ''.join(mouvements))
+    return codage.decoder(code)
+
+def main():
+    """
+    @brief Précalcule les tables complètes : python -m algorithme_recherche.table <k ou LxC>...
+    """
+    for argument in sys.argv[1:] or ['2', '3']:
+        jeu = JeuTaquin(*lire_dimensions(argument))
+        charger_table(jeu.codage, jeu.encoder_etat(jeu.final_positions))
+
+if __name__ == "__main__":
+    main()
@@ -1,28 +1,77 @@
+import os
+from jeu.etatCompact import CodageEtat, DIRECTIONS, OPPOSES
 
-def key(state: dict) -> str:
-    """
-    @brief Génère une clé unique pour un état
-    @param state: Dictionnaire représentant un état du jeu
-    @return: Chaîne de caractères unique représentant l'état
-    
-    Convertit un état en une chaîne de caractères unique pour
-    l'utiliser comme clé de dictionnaire ou dans un ensemble.
-    """
-    return ''.join(str(state[value]) for value in range(len(state)))
-
-def reconstruire_chemin(parents: dict, end_key: str) -> list:
-    """
-    @brief Reconstruit le chemin de la solution à partir du dictionnaire des parents
-    @param parents: Dictionnaire associant à chaque état son parent
-    @param end_key: Clé de l'état final
-    @return: Liste des états formant le chemin de la solution
-    
-    Utilise le dictionnaire des parents pour reconstruire le chemin
-    de l'état initial à l'état final.
-    """
-    path = []
-    while end_key is not None:
-        path.append(end_key)
-        end_key = parents[end_key]
-    path.reverse()
-    return path
+# Répertoire des tables précalculées (bases de motifs, espaces d'états complets)
+REPERTOIRE_TABLES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tables')
+
+
+def remonter_mouvements(codage: CodageEtat, direction_arrivee, code: int, code_initial: int) -> str:
+    """
+    @brief Reconstruit les déplacements de la case vide de l'état initial jusqu'à un état
+    @param codage: Codage des états du plateau
+    @param direction_arrivee: Fonction associant à un code l'indice dans DIRECTIONS du déplacement qui y a mené
+    @param code: Code compact de l'état d'arrivée
+    @param code_initial: Code compact de l'état initial
+    @return: Chaîne des lettres de DIRECTIONS, rejouable avec JeuTaquin.moves
+
+    Chaque état ne retient que 2 bits (le déplacement d'arrivée) : son parent
+    s'obtient en appliquant le déplacement inverse.
+    """
+    vide = codage.case_vide(code)
+    mouvements = []
+    while code != code_initial:
+        direction = DIRECTIONS[direction_arrivee(code)]
+        mouvements.append(direction)
+        code, vide = codage.deplacer(code, vide, OPPOSES[direction])
+    mouvements.reverse()
+    return ''.join(mouvements)
+
+def rang_motif(cases: list, taille: int) -> int:
+    """
+    @brief Calcule le rang d'un arrangement de tuiles distinctes sur le plateau
+    @param cases: Cases occupées par les tuiles du motif, dans l'ordre du groupe
+    @param taille: Nombre de cases du plateau
+    @return: Entier entre 0 et taille! / (taille - len(cases))! - 1
+    """
+    rang = 0
+    occupees = 0
+    for i, case in enumerate(cases):
+        # Chaque case déjà occupée et plus petite décale l'indice parmi les cases libres
+        rang = rang * (taille - i) + case - (occupees & ((1 << case) - 1)).bit_count()
+        occupees |= 1 << case
+    return rang
+
+def motif_depuis_rang(rang: int, nombre: int, taille: int) -> list:
+    """
+    @brief Opération inverse de rang_motif
+    @param rang: Rang de l'arrangement
+    @param nombre: Nombre de tuiles du motif
+    @param taille: Nombre de cases du plateau
+    @return: Cases occupées par les tuiles du motif
+    """
+    chiffres = [0] * nombre
+    for i in range(nombre - 1, -1, -1):
+        rang, chiffres[i] = divmod(rang, taille - i)
+    libres = list(range(taille))
+    return [libres.pop(chiffre) for chiffre in chiffres]
+
+def nombre_motifs(nombre: int, taille: int) -> int:
+    """
+    @brief Nombre d'arrangements de nombre tuiles sur taille cases
+    """
+    total = 1
+    for i in range(nombre):
+        total *= taille - i
+    return total
+
+def rang_etat(positions: list) -> int:
+    """
+    @brief Calcule un rang parfait d'un état atteignable
+    @param positions: Liste où l'indice est la valeur de la tuile et la valeur sa case
+    @return: Entier entre 0 et taille! / 2 - 1
+
+    Les positions des deux dernières tuiles sont omises : parmi les deux
+    façons de les placer dans les deux cases restantes, une seule a la bonne
+    parité et est atteignable depuis l'état final.
+    """
+    return rang_motif(positions[:-2], len(positions))
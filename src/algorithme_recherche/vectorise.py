@@ -0,0 +1,248 @@
+import time
+from jeu.jeuTaquin import JeuTaquin
+from jeu.etatCompact import CodageEtat, DIRECTIONS, DEPLACEMENTS, OPPOSES
+from algorithme_recherche.heuristiques import obtenir_heuristique
+from algorithme_recherche.statistiques import StatistiquesRecherche, RESOLU, LIMITE_TEMPS, EPUISE
+from algorithme_recherche.utile import remonter_mouvements
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Marque le déplacement d'arrivée de l'état de départ
+AUCUN = 255
+
+def verifier_numpy(codage: CodageEtat) -> None:
+    """
+    @brief Vérifie que le moteur vectorisé est utilisable pour ce plateau
+    @throws ImportError si NumPy n'est pas installé
+    @throws ValueError si un code compact ne tient pas dans un entier de 64 bits (plateaux de plus de 16 cases)
+    """
+    if np is None:
+        raise ImportError("Les algorithmes vectorisés nécessitent NumPy (pip install numpy).")
+    if codage.bits * codage.taille > 64:
+        raise ValueError(f"Le code d'une grille {codage.dimensions} ne tient pas sur 64 bits.")
+
+def developper_lot(codage: CodageEtat, codes, vides, mouvements):
+    """
+    @brief Calcule en bloc les successeurs d'un lot d'états
+    @param codage: Codage des états du plateau
+    @param codes: Codes compacts des états (tableau uint64)
+    @param vides: Case vide de chaque état (tableau intp)
+    @param mouvements: Déplacement d'arrivée de chaque état (indice dans DIRECTIONS, AUCUN pour le départ)
+    @return: Liste, par direction, de tuples (indice de la direction, indices des parents, codes suivants, nouvelles cases vides, tuiles déplacées, anciennes cases vides)
+
+    Même principe que CodageEtat.successeurs, appliqué à tout le lot par
+    opérations NumPy : la tuile voisine est lue dans le code par décalage et
+    masque, puis déplacée dans la case vide. Le retour immédiat sur l'état
+    parent est écarté.
+    """
+    hauteur, largeur = codage.lignes, codage.colonnes
+    decalages = np.array(codage.decalages, dtype=np.uint64)
+    masque = np.uint64(codage.masque)
+    lignes, colonnes = vides // largeur, vides % largeur
+    resultats = []
+    for indice, direction in enumerate(DIRECTIONS):
+        di, dj = DEPLACEMENTS[direction]
+        valides = ((lignes + di >= 0) & (lignes + di < hauteur) & (colonnes + dj >= 0) & (colonnes + dj < largeur)
+                   & (mouvements != DIRECTIONS.index(OPPOSES[direction])))
+        parents = np.nonzero(valides)[0]
+        if not len(parents):
+            continue
+        anciennes = vides[parents]
+        cases = anciennes + (di * largeur + dj)
+        codes_parents = codes[parents]
+        tuiles = (codes_parents >> decalages[cases]) & masque
+        suivants = codes_parents - (tuiles << decalages[cases]) + (tuiles << decalages[anciennes])
+        resultats.append((indice, parents, suivants, cases, tuiles.astype(np.intp), anciennes))
+    return resultats
+
+def bfs_vectorise(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, stocker_chemin: bool = False, limite_temps: float | None = None,
+                  statistiques: StatistiquesRecherche | None = None):
+    """
+    @brief Parcours en largeur synchrone par niveaux, chaque niveau étant traité en bloc avec NumPy
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param limite_temps: Temps maximum d'exécution en secondes, sans limite si None (défaut: None)
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @return: État final si trouvé, None sinon
+    @throws ImportError si NumPy n'est pas installé
+    @throws ValueError pour les plateaux de plus de 16 cases
+
+    Un niveau est un tableau trié de codes compacts uint64. Les successeurs
+    d'un niveau sont dédoublonnés par np.unique ; dans le graphe du taquin les
+    voisins d'un niveau d sont aux niveaux d - 1 ou d + 1 (jamais d, le graphe
+    étant biparti), il suffit donc de retirer ceux du niveau précédent.
+    Les niveaux antérieurs ne sont conservés que si le chemin est demandé.
+    """
+    codage = jeu.codage
+    verifier_numpy(codage)
+    temps_debut = time.time()
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("bfs_vectorise")
+    jeu.statistiques = statistiques
+    developpes = generes = doublons = vus = 0
+
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+    niveau = np.array([code_initial], dtype=np.uint64)
+    vides = np.array([codage.case_vide(code_initial)], dtype=np.intp)
+    mouvements = np.array([AUCUN], dtype=np.uint8)
+    precedent = np.empty(0, dtype=np.uint64)
+    niveaux = []
+    final = np.uint64(code_final)
+    profondeur = 0
+
+    while len(niveau):
+        vus += len(niveau)
+        if stocker_chemin:
+            niveaux.append((niveau, mouvements))
+        if np.any(niveau == final):
+            developpes += int(np.searchsorted(niveau, final)) + 1
+            statistiques.releve(developpes, generes, doublons, len(niveau), vus)
+            statistiques.terminer(RESOLU, profondeur)
+            break
+        developpes += len(niveau)
+        if limite_temps is not None and time.time() - temps_debut > limite_temps:
+            statistiques.releve(developpes, generes, doublons, len(niveau), vus)
+            statistiques.terminer(LIMITE_TEMPS)
+            print(f"Limite de temps dépassée ({limite_temps} secondes)")
+            return None
+
+        lots = developper_lot(codage, niveau, vides, mouvements)
+        suivants = np.concatenate([lot[2] for lot in lots])
+        nouvelles_vides = np.concatenate([lot[3] for lot in lots])
+        nouveaux_mouvements = np.concatenate([np.full(len(lot[2]), lot[0], dtype=np.uint8) for lot in lots])
+        generes += len(suivants)
+
+        suivants, premiers = np.unique(suivants, return_index=True)
+        garder = ~np.isin(suivants, precedent, assume_unique=True)
+        doublons += len(nouvelles_vides) - int(np.count_nonzero(garder))
+        precedent = niveau
+        niveau = suivants[garder]
+        vides = nouvelles_vides[premiers][garder]
+        mouvements = nouveaux_mouvements[premiers][garder]
+        profondeur += 1
+        statistiques.releve(developpes, generes, doublons, len(niveau), vus)
+    else:
+        statistiques.terminer(EPUISE)
+        print("État final non trouvé avec bfs vectorisé!")
+        return None
+
+    if stocker_chemin:
+        # Chaque niveau donne le déplacement d'arrivée, le parent est au niveau précédent
+        chemin = []
+        code, vide = code_final, codage.case_vide(code_final)
+        for codes_niveau, mouvements_niveau in reversed(niveaux[1:]):
+            direction = DIRECTIONS[int(mouvements_niveau[np.searchsorted(codes_niveau, np.uint64(code))])]
+            chemin.append(direction)
+            code, vide = codage.deplacer(code, vide, OPPOSES[direction])
+        chemin.reverse()
+        jeu.enregistrer_solution(etat_initial, ''.join(chemin))
+    return codage.decoder(code_final)
+
+def astar_vectorise(jeu: JeuTaquin, etat_initial: dict, etat_final: dict, limite_temps: float = 40.0, stocker_chemin: bool = False,
+                    heuristique: str = "manhattan", statistiques: StatistiquesRecherche | None = None):
+    """
+    @brief A* par lots : tous les nœuds de même f sont développés ensemble avec NumPy
+    @param jeu: Instance de la classe JeuTaquin
+    @param etat_initial: État initial du puzzle
+    @param etat_final: État final désiré
+    @param limite_temps: Temps maximum d'exécution en secondes (défaut: 40.0)
+    @param stocker_chemin: Indique si le chemin de solution doit être stocké (défaut: False)
+    @param heuristique: Nom d'une heuristique additive par tuile (table de coûts), voir heuristiques.HEURISTIQUES (défaut: "manhattan")
+    @param statistiques: Mesures à remplir, disponibles ensuite dans jeu.statistiques (défaut: nouvelles mesures)
+    @return: État final si trouvé, None sinon
+    @throws ImportError si NumPy n'est pas installé
+    @throws ValueError si l'heuristique n'a pas de table de coûts ou pour les plateaux de plus de 16 cases
+
+    La frontière est un dictionnaire f -> lots de tableaux (codes, cases vides,
+    g, h, déplacements d'arrivée). Le lot de plus petit f est dédoublonné, privé
+    des états déjà fermés (tableau trié de codes), puis développé en bloc ; h
+    est mis à jour par la table de coûts comme dans successeurs_heuristique.
+    Avec une heuristique cohérente (Manhattan, tuiles mal placées), un état
+    est fermé à son premier développement avec son g optimal.
+    """
+    codage = jeu.codage
+    verifier_numpy(codage)
+    fonction_h = obtenir_heuristique(heuristique, codage, etat_final)
+    if fonction_h.table is None:
+        raise ValueError(f"L'heuristique {heuristique} n'a pas de table de coûts par tuile, elle ne peut pas être vectorisée.")
+    table = np.array(fonction_h.table, dtype=np.int32)
+
+    temps_debut = time.time()
+    statistiques = statistiques or StatistiquesRecherche()
+    statistiques.demarrer("astar_vectorise")
+    jeu.statistiques = statistiques
+    developpes = generes = doublons = en_attente = 0
+
+    code_initial = codage.encoder(etat_initial)
+    code_final = codage.encoder(etat_final)
+    final = np.uint64(code_final)
+    h_initial = fonction_h.evaluer_code(code_initial)
+    seaux = {h_initial: [(np.array([code_initial], dtype=np.uint64), np.array([codage.case_vide(code_initial)], dtype=np.intp),
+                          np.zeros(1, dtype=np.int32), np.array([h_initial], dtype=np.int32), np.array([AUCUN], dtype=np.uint8))]}
+    en_attente = 1
+    fermes = np.empty(0, dtype=np.uint64)
+    mouvements_fermes = np.empty(0, dtype=np.uint8)
+
+    while seaux:
+        if time.time() - temps_debut > limite_temps:
+            statistiques.releve(developpes, generes, doublons, en_attente, len(fermes))
+            statistiques.terminer(LIMITE_TEMPS)
+            print(f"Limite de temps dépassée ({limite_temps} secondes)")
+            return None
+
+        f = min(seaux)
+        lots = seaux.pop(f)
+        codes, vides, g, h, mouvements = (np.concatenate([lot[i] for lot in lots]) for i in range(5))
+        en_attente -= len(codes)
+
+        # Un même état peut figurer plusieurs fois dans le lot ou être déjà fermé
+        codes, premiers = np.unique(codes, return_index=True)
+        vides, g, h, mouvements = vides[premiers], g[premiers], h[premiers], mouvements[premiers]
+        ouverts = ~np.isin(codes, fermes, assume_unique=True)
+        doublons += len(premiers) - int(np.count_nonzero(ouverts))
+        codes, vides, g, h, mouvements = codes[ouverts], vides[ouverts], g[ouverts], h[ouverts], mouvements[ouverts]
+        if not len(codes):
+            continue
+        developpes += len(codes)
+
+        fermes = np.concatenate([fermes, codes])
+        mouvements_fermes = np.concatenate([mouvements_fermes, mouvements])
+        ordre = np.argsort(fermes, kind='stable')
+        fermes, mouvements_fermes = fermes[ordre], mouvements_fermes[ordre]
+
+        trouve = np.nonzero(codes == final)[0]
+        if len(trouve):
+            profondeur = int(g[trouve[0]])
+            statistiques.releve(developpes, generes, doublons, en_attente, len(fermes))
+            statistiques.terminer(RESOLU, profondeur)
+            if stocker_chemin:
+                def direction_arrivee(code: int) -> int:
+                    return int(mouvements_fermes[np.searchsorted(fermes, np.uint64(code))])
+                jeu.enregistrer_solution(etat_initial, remonter_mouvements(codage, direction_arrivee, code_final, code_initial))
+            return codage.decoder(code_final)
+
+        for indice, parents, suivants, cases, tuiles, anciennes in developper_lot(codage, codes, vides, mouvements):
+            generes += len(suivants)
+            h_suivants = h[parents] + table[tuiles, anciennes] - table[tuiles, cases]
+            g_suivants = g[parents] + 1
+            garder = ~np.isin(suivants, fermes)
+            doublons += len(suivants) - int(np.count_nonzero(garder))
+            f_suivants = (g_suivants + h_suivants)[garder]
+            lot = (suivants[garder], cases[garder], g_suivants[garder], h_suivants[garder],
+                   np.full(int(np.count_nonzero(garder)), indice, dtype=np.uint8))
+            for valeur_f in np.unique(f_suivants):
+                choisis = f_suivants == valeur_f
+                seaux.setdefault(int(valeur_f), []).append(tuple(tableau[choisis] for tableau in lot))
+            en_attente += len(f_suivants)
+
+        statistiques.releve(developpes, generes, doublons, en_attente, len(fermes))
+
+    statistiques.terminer(EPUISE)
+    print("Aucune solution trouvée avec A* vectorisé")
+    return None
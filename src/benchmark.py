@@ -0,0 +1,308 @@
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+from datetime import datetime
+from jeu.jeuTaquin import JeuTaquin, lire_dimensions
+from algorithme_recherche.batch import resoudre_instance, solve_batch
+from algorithme_recherche.heuristiques import HEURISTIQUES
+from algorithme_recherche.instances import generer_aleatoires, generer_marches, generer_par_profondeur, lire_instances
+from algorithme_recherche.solveurs import ALGORITHMES
+
+# Algorithmes qui acceptent le paramètre heuristique
+ALGORITHMES_HEURISTIQUES = ('astar', 'arastar', 'idastar', 'smastar', 'hdastar')
+# Colonnes des fichiers de résultats, dans l'ordre d'écriture CSV
+COLONNES = ['taille', 'algorithme', 'heuristique', 'instance', 'code_initial', 'profondeur_optimale', 'resolu', 'temps', 'raison',
+            'profondeur', 'borne', 'noeuds_developpes', 'noeuds_generes', 'doublons', 'frontiere_max', 'fermes_max', 'noeuds_par_seconde',
+            'memoire_max', 'erreur']
+
+def etiquette(dimensions: tuple):
+    """
+    @brief Nom d'une taille de grille dans les résultats : k pour une grille carrée, "LxC" sinon
+    """
+    lignes, colonnes = dimensions
+    return lignes if lignes == colonnes else f"{lignes}x{colonnes}"
+
+def lire_fichier_instances(dimensions: tuple, chemin: str) -> list:
+    """
+    @brief Lit un corpus d'instances, une par ligne : les valeurs du plateau lues ligne par ligne
+    @param dimensions: Couple (lignes, colonnes) du plateau
+    @param chemin: Chemin du fichier (lignes vides et commentaires # ignorés)
+    @return: Liste de couples (code initial, profondeur optimale ou None)
+    @throws ValueError si une ligne n'est pas une permutation de 0 à lignes * colonnes - 1
+
+    Permet par exemple de rejouer les 100 instances de Korf pour le 4x4. La
+    profondeur optimale peut être donnée en fin de ligne après un ':'.
+    Les instances sont résolues vers l'état final du jeu (case vide en bas à droite).
+    """
+    jeu = JeuTaquin(*dimensions)
+    taille = jeu.size
+    instances = []
+    with open(chemin, encoding='utf-8') as f:
+        for numero, ligne in enumerate(f, 1):
+            ligne = ligne.split('#')[0].strip()
+            if not ligne:
+                continue
+            valeurs, _, profondeur = ligne.partition(':')
+            plateau = [int(valeur) for valeur in valeurs.replace(',', ' ').split()]
+            if sorted(plateau) != list(range(taille)):
+                raise ValueError(f"{chemin}:{numero} : {taille} valeurs distinctes de 0 à {taille - 1} attendues.")
+            instances.append((jeu.codage.depuis_plateau(plateau), int(profondeur) if profondeur.strip() else None))
+    return instances
+
+def variantes(algorithmes: list, heuristiques: list | None) -> list:
+    """
+    @brief Associe chaque algorithme aux heuristiques demandées
+    @return: Liste de couples (algorithme, heuristique ou None)
+    """
+    resultat = []
+    for algorithme in algorithmes:
+        if algorithme in ALGORITHMES_HEURISTIQUES and heuristiques:
+            resultat += [(algorithme, heuristique) for heuristique in heuristiques]
+        else:
+            resultat.append((algorithme, None))
+    return resultat
+
+def lancer(dimensions: tuple, instances: list, algorithme: str, heuristique: str | None, limite_temps: float | None, workers: int,
+           code_final: int | None = None):
+    """
+    @brief Résout toutes les instances d'un corpus avec un algorithme
+    @param code_final: Code compact de l'état final (défaut: état final habituel du plateau)
+    @return: Générateur de lignes de résultats (voir COLONNES)
+
+    Avec un seul processus les instances sont résolues dans l'ordre, dans le
+    processus courant ; sinon elles sont réparties par solve_batch.
+    """
+    if code_final is None:
+        jeu = JeuTaquin(*dimensions)
+        code_final = jeu.encoder_etat(jeu.final_positions)
+    options = {'heuristique': heuristique} if heuristique else {}
+
+    if workers > 1:
+        resultats = solve_batch([(dimensions, code, code_final) for code, _ in instances], [algorithme], workers=workers,
+                                timeout=limite_temps, options={algorithme: options})
+    else:
+        def resultats():
+            for indice, (code, _) in enumerate(instances):
+                try:
+                    resolu, temps, statistiques = resoudre_instance(dimensions, code, code_final, algorithme, limite_temps, options)
+                    yield {'instance': indice, 'resolu': resolu, 'temps': temps, 'statistiques': statistiques, 'erreur': None}
+                except Exception as e:
+                    yield {'instance': indice, 'resolu': False, 'temps': float('inf'), 'statistiques': None, 'erreur': str(e)}
+        resultats = resultats()
+
+    for resultat in resultats:
+        code, profondeur_optimale = instances[resultat['instance']]
+        ligne = {'taille': etiquette(dimensions), 'algorithme': algorithme, 'heuristique': heuristique, 'instance': resultat['instance'],
+                 'code_initial': f"{code:x}", 'profondeur_optimale': profondeur_optimale, 'resolu': resultat['resolu'],
+                 'temps': resultat['temps'], 'erreur': resultat['erreur']}
+        statistiques = resultat['statistiques'] or {}
+        for colonne in COLONNES:
+            if colonne in statistiques and colonne not in ligne:
+                ligne[colonne] = statistiques[colonne]
+        yield ligne
+
+def centile(valeurs: list, p: float) -> float | None:
+    """
+    @brief Centile par la méthode du rang le plus proche
+    @param valeurs: Valeurs triées
+    @param p: Centile voulu entre 0 et 100
+    """
+    if not valeurs:
+        return None
+    rang = max(1, -(-len(valeurs) * p // 100))
+    return valeurs[int(rang) - 1]
+
+def resumer(lignes: list) -> dict:
+    """
+    @brief Regroupe les lignes par (taille, algorithme, heuristique) et calcule les indicateurs
+    @return: Dictionnaire {(taille, algorithme, heuristique): indicateurs}
+
+    Les centiles des temps et des nœuds ne portent que sur les instances
+    résolues ; la vitesse est le total des nœuds développés divisé par le
+    total des temps de ces instances.
+    """
+    groupes = {}
+    for ligne in lignes:
+        groupes.setdefault((ligne['taille'], ligne['algorithme'], ligne['heuristique']), []).append(ligne)
+
+    resume = {}
+    for cle, groupe in groupes.items():
+        resolues = [ligne for ligne in groupe if ligne['resolu']]
+        temps = sorted(ligne['temps'] for ligne in resolues)
+        noeuds = sorted(ligne.get('noeuds_developpes') or 0 for ligne in resolues)
+        non_optimales = sum(1 for ligne in resolues
+                            if ligne['profondeur_optimale'] is not None and ligne.get('profondeur') not in (None, ligne['profondeur_optimale']))
+        resume[cle] = {
+            'instances': len(groupe),
+            'resolues': len(resolues),
+            'non_optimales': non_optimales,
+            'p50': centile(temps, 50),
+            'p95': centile(temps, 95),
+            'p99': centile(temps, 99),
+            'noeuds_p50': centile(noeuds, 50),
+            'noeuds_par_seconde': sum(noeuds) / sum(temps) if temps and sum(temps) > 0 else 0.0,
+        }
+    return resume
+
+def afficher_resume(resume: dict) -> None:
+    """
+    @brief Affiche le résumé sous forme de tableau
+    """
+    print(f"\n{'taille':>6} {'algorithme':<10} {'heuristique':<18} {'résolues':>9} {'p50 (s)':>10} {'p95 (s)':>10} {'p99 (s)':>10} "
+          f"{'nœuds p50':>10} {'nœuds/s':>10}")
+    for (taille, algorithme, heuristique), indicateurs in sorted(resume.items(), key=lambda element: str(element[0])):
+        def temps(valeur):
+            return f"{valeur:10.4f}" if valeur is not None else f"{'-':>10}"
+        resolues = f"{indicateurs['resolues']}/{indicateurs['instances']}"
+        print(f"{taille:>6} {algorithme:<10} {heuristique or '-':<18} {resolues:>9} {temps(indicateurs['p50'])} {temps(indicateurs['p95'])} "
+              f"{temps(indicateurs['p99'])} {indicateurs['noeuds_p50'] or 0:>10} {indicateurs['noeuds_par_seconde']:>10.0f}")
+        if indicateurs['non_optimales']:
+            print(f"       attention : {indicateurs['non_optimales']} solution(s) plus longue(s) que l'optimum")
+
+def ecrire_resultats(chemin: str, lignes: list, parametres: dict) -> None:
+    """
+    @brief Écrit les lignes de résultats en JSON (avec les paramètres du lancement) ou en CSV selon l'extension
+    """
+    dossier = os.path.dirname(chemin)
+    if dossier:
+        os.makedirs(dossier, exist_ok=True)
+    if chemin.endswith('.csv'):
+        with open(chemin, 'w', newline='', encoding='utf-8') as f:
+            ecrivain = csv.DictWriter(f, fieldnames=COLONNES, extrasaction='ignore')
+            ecrivain.writeheader()
+            ecrivain.writerows(lignes)
+    else:
+        with open(chemin, 'w', encoding='utf-8') as f:
+            json.dump({'parametres': parametres, 'resultats': lignes}, f, indent=1)
+    print(f"\nRésultats sauvegardés dans {chemin}")
+
+def lire_resultats(chemin: str) -> list:
+    """
+    @brief Relit un fichier écrit par ecrire_resultats
+    @return: Liste des lignes de résultats
+    """
+    if chemin.endswith('.csv'):
+        with open(chemin, newline='', encoding='utf-8') as f:
+            lignes = list(csv.DictReader(f))
+        for ligne in lignes:
+            ligne['taille'] = int(ligne['taille']) if ligne['taille'].isdigit() else ligne['taille']
+            ligne['heuristique'] = ligne['heuristique'] or None
+            ligne['resolu'] = ligne['resolu'] == 'True'
+            ligne['temps'] = float(ligne['temps'])
+            for colonne in ('profondeur_optimale', 'profondeur', 'noeuds_developpes'):
+                ligne[colonne] = int(ligne[colonne]) if ligne.get(colonne) else None
+            ligne['borne'] = float(ligne['borne']) if ligne.get('borne') else None
+        return lignes
+    with open(chemin, encoding='utf-8') as f:
+        return json.load(f)['resultats']
+
+def comparer(chemin_reference: str, chemin_nouveau: str, seuil: float, ecart_min: float = 0.001) -> int:
+    """
+    @brief Compare deux fichiers de résultats et signale les régressions
+    @param chemin_reference: Résultats de référence
+    @param chemin_nouveau: Résultats à évaluer
+    @param seuil: Dégradation relative tolérée (0.1 pour 10 %)
+    @param ecart_min: Écart absolu de temps en secondes en dessous duquel une dégradation est du bruit de mesure (défaut: 0.001)
+    @return: Nombre de régressions
+
+    Pour chaque groupe (taille, algorithme, heuristique) présent dans les deux
+    fichiers, le p50 et le p95 des temps, le p50 des nœuds développés et le
+    nombre d'instances résolues sont comparés.
+    """
+    reference = resumer(lire_resultats(chemin_reference))
+    nouveau = resumer(lire_resultats(chemin_nouveau))
+    regressions = 0
+    print(f"{'taille':>6} {'algorithme':<10} {'heuristique':<18} {'indicateur':<12} {'référence':>12} {'nouveau':>12} {'écart':>8}")
+    for cle in sorted(set(reference) & set(nouveau), key=str):
+        for indicateur in ('p50', 'p95', 'noeuds_p50', 'resolues'):
+            avant, apres = reference[cle][indicateur], nouveau[cle][indicateur]
+            if not avant or apres is None:
+                continue
+            ecart = (apres - avant) / avant
+            # Moins d'instances résolues est une régression, plus de temps ou de nœuds aussi
+            if indicateur == 'resolues':
+                regression = ecart < -seuil
+            else:
+                regression = ecart > seuil and (indicateur == 'noeuds_p50' or apres - avant > ecart_min)
+            regressions += regression
+            marque = "  RÉGRESSION" if regression else ""
+            taille, algorithme, heuristique = cle
+            print(f"{taille:>6} {algorithme:<10} {heuristique or '-':<18} {indicateur:<12} {avant:>12.6g} {apres:>12.6g} {ecart:>+8.1%}{marque}")
+    for cle in sorted(set(reference) ^ set(nouveau), key=str):
+        print(f"Groupe {cle} présent dans un seul des deux fichiers")
+    print(f"\n{regressions} régression(s) au-delà de {seuil:.0%}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Banc d'essai reproductible des algorithmes de recherche du jeu de taquin")
+    commandes = parser.add_subparsers(dest='commande', required=True)
+
+    lancement = commandes.add_parser('lancer', help="Résout un corpus d'instances et enregistre les résultats")
+    lancement.add_argument('--tailles', type=lire_dimensions, nargs='+', default=[(3, 3)],
+                           help="Tailles de grille, k pour k x k ou LxC (défaut: 3)")
+    lancement.add_argument('--algorithmes', nargs='+', default=['astar', 'idastar'], choices=list(ALGORITHMES),
+                           help="Algorithmes à comparer (défaut: astar idastar)")
+    lancement.add_argument('--heuristiques', nargs='+', choices=list(HEURISTIQUES),
+                           help="Heuristiques des algorithmes informés, une variante par heuristique (défaut: celle de l'algorithme)")
+    lancement.add_argument('--corpus', choices=['aleatoire', 'marche', 'profondeur', 'fichier'], default='aleatoire',
+                           help="aleatoire : états tirés avec la graine ; marche : marches aléatoires de longueurs --longueurs depuis l'état final ; "
+                                "profondeur : états de distance optimale donnée (au plus 10 cases) ; "
+                                "fichier : instances lues dans --fichier (texte, ou .bin écrit par algorithme_recherche.instances)")
+    lancement.add_argument('--nombre', type=int, default=100,
+                           help="Nombre d'instances (par longueur ou profondeur pour les corpus marche et profondeur)")
+    lancement.add_argument('--graine', type=int, default=0, help="Graine des tirages (défaut: 0)")
+    lancement.add_argument('--profondeurs', type=int, nargs='+', default=[10, 15, 20, 25, 30], help="Profondeurs du corpus profondeur")
+    lancement.add_argument('--longueurs', type=int, nargs='+', default=[10, 20, 30, 40, 50], help="Longueurs des marches du corpus marche")
+    lancement.add_argument('--fichier', help="Fichier d'instances pour le corpus fichier (voir lire_fichier_instances)")
+    lancement.add_argument('--limite-temps', type=float, default=40.0, help="Temps maximum par instance en secondes (défaut: 40)")
+    lancement.add_argument('--workers', type=int, default=1, help="Nombre de processus (défaut: 1, temps plus stables)")
+    lancement.add_argument('--sortie', help="Fichier de résultats .json ou .csv (défaut: test/benchmark_<date>.json)")
+
+    comparaison = commandes.add_parser('comparer', help="Compare deux fichiers de résultats")
+    comparaison.add_argument('reference', help="Résultats de référence")
+    comparaison.add_argument('nouveau', help="Résultats à évaluer")
+    comparaison.add_argument('--seuil', type=float, default=0.10, help="Dégradation relative tolérée (défaut: 0.10)")
+    comparaison.add_argument('--ecart-min', type=float, default=0.001, help="Écart de temps ignoré, en secondes (défaut: 0.001)")
+
+    arguments = parser.parse_args()
+
+    if arguments.commande == 'comparer':
+        sys.exit(1 if comparer(arguments.reference, arguments.nouveau, arguments.seuil, arguments.ecart_min) else 0)
+
+    if arguments.corpus == 'fichier' and not arguments.fichier:
+        parser.error("le corpus fichier nécessite --fichier")
+
+    lignes = []
+    try:
+        for dimensions in arguments.tailles:
+            code_final = None
+            if arguments.corpus == 'profondeur':
+                instances = generer_par_profondeur(dimensions, arguments.nombre, arguments.graine, arguments.profondeurs)
+            elif arguments.corpus == 'marche':
+                instances = generer_marches(dimensions, arguments.nombre, arguments.graine, arguments.longueurs)
+            elif arguments.corpus == 'fichier' and arguments.fichier.endswith('.bin'):
+                # Le fichier binaire fixe lui-même les dimensions et l'état final
+                jeu, code_final, instances = lire_instances(arguments.fichier)
+                dimensions = jeu.get_dimensions()
+            elif arguments.corpus == 'fichier':
+                instances = lire_fichier_instances(dimensions, arguments.fichier)
+            else:
+                instances = generer_aleatoires(dimensions, arguments.nombre, arguments.graine)
+
+            for algorithme, heuristique in variantes(arguments.algorithmes, arguments.heuristiques):
+                print(f"Grille {dimensions[0]}x{dimensions[1]} : {algorithme}{f' ({heuristique})' if heuristique else ''} sur {len(instances)} instances")
+                lignes += lancer(dimensions, instances, algorithme, heuristique, arguments.limite_temps, arguments.workers, code_final)
+    except KeyboardInterrupt:
+        print("\n\nInterruption détectée. Sauvegarde des résultats partiels...")
+
+    parametres = {**vars(arguments), 'date': datetime.now().isoformat(timespec='seconds'),
+                  'python': platform.python_version(), 'machine': platform.machine()}
+    sortie = arguments.sortie or os.path.join(os.path.dirname(__file__), 'test', f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    afficher_resume(resumer(lignes))
+    ecrire_resultats(sortie, lignes, parametres)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,220 @@
+# Directions de déplacement de la case vide, avec les lettres de JeuTaquin.moves
+DIRECTIONS = 'hbgd'
+DEPLACEMENTS = {'h': (-1, 0), 'b': (1, 0), 'g': (0, -1), 'd': (0, 1)}
+OPPOSES = {'h': 'b', 'b': 'h', 'g': 'd', 'd': 'g'}
+
+def parite_permutation(permutation: list) -> int:
+    """
+    @brief Calcule la parité d'une permutation par décomposition en cycles, en O(n)
+    @param permutation: Liste contenant chaque entier de 0 à len - 1 une fois
+    @return: 0 si la permutation est paire, 1 sinon
+    """
+    vus = [False] * len(permutation)
+    parite = 0
+    for depart in range(len(permutation)):
+        if vus[depart]:
+            continue
+        longueur = 0
+        case = depart
+        while not vus[case]:
+            vus[case] = True
+            case = permutation[case]
+            longueur += 1
+        parite ^= (longueur - 1) & 1
+    return parite
+
+class CodageEtat:
+    """
+    @brief Représentation compacte d'un état du jeu de taquin sous forme d'entier
+
+    Le plateau (lignes x colonnes) est lu ligne par ligne et chaque case occupe
+    un champ de bits (4 bits jusqu'à 16 cases, davantage au-delà) contenant la
+    valeur de la tuile qui s'y trouve. La case 0 se trouve dans les bits de
+    poids faible.
+    L'indice de la case vide est conservé à côté du code par les algorithmes,
+    ce qui permet de générer un successeur en O(1) par opérations sur les bits.
+    """
+    def __init__(self, lignes: int, colonnes: int | None = None):
+        """
+        @brief Initialise le codage pour un plateau lignes x colonnes
+        @param lignes: Nombre de lignes du plateau
+        @param colonnes: Nombre de colonnes du plateau (défaut: plateau carré)
+        """
+        colonnes = colonnes or lignes
+        self.lignes = lignes
+        self.colonnes = colonnes
+        self.dimensions = f"{lignes}x{colonnes}"
+        self.taille = lignes * colonnes
+        self.bits = max(4, (self.taille - 1).bit_length())
+        self.masque = (1 << self.bits) - 1
+        self.decalages = [case * self.bits for case in range(self.taille)]
+
+        # voisins[case] : cases atteignables par la case vide depuis cette case
+        # indices_directions[case][voisine] : indice dans DIRECTIONS du déplacement correspondant
+        self.voisins = []
+        self.indices_directions = []
+        for case in range(self.taille):
+            i, j = divmod(case, colonnes)
+            cases = []
+            indices = {}
+            for indice, direction in enumerate(DIRECTIONS):
+                di, dj = DEPLACEMENTS[direction]
+                ni, nj = i + di, j + dj
+                if 0 <= ni < lignes and 0 <= nj < colonnes:
+                    cases.append(ni * colonnes + nj)
+                    indices[ni * colonnes + nj] = indice
+            self.voisins.append(cases)
+            self.indices_directions.append(indices)
+
+    def encoder(self, etat: dict) -> int:
+        """
+        @brief Convertit un état au format dictionnaire en entier compact
+        @param etat: Dictionnaire associant chaque valeur à sa position (ligne, colonne)
+        @return: Code entier de l'état
+        """
+        code = 0
+        for valeur, (i, j) in etat.items():
+            code |= valeur << self.decalages[i * self.colonnes + j]
+        return code
+
+    def decoder(self, code: int) -> dict:
+        """
+        @brief Convertit un code entier en état au format dictionnaire
+        @param code: Code entier de l'état
+        @return: Dictionnaire associant chaque valeur à sa position (ligne, colonne)
+        """
+        etat = {}
+        for case in range(self.taille):
+            etat[(code >> self.decalages[case]) & self.masque] = divmod(case, self.colonnes)
+        return etat
+
+    def vers_plateau(self, code: int) -> list:
+        """
+        @brief Convertit un code en liste des valeurs lues ligne par ligne
+        @param code: Code entier de l'état
+        @return: Liste où l'indice est la case et la valeur la tuile qui s'y trouve
+        """
+        return [(code >> decalage) & self.masque for decalage in self.decalages]
+
+    def depuis_plateau(self, plateau: list) -> int:
+        """
+        @brief Convertit une liste de valeurs lues ligne par ligne en code
+        @param plateau: Liste où l'indice est la case et la valeur la tuile
+        @return: Code entier de l'état
+        """
+        code = 0
+        for case, valeur in enumerate(plateau):
+            code |= valeur << self.decalages[case]
+        return code
+
+    def valeur(self, code: int, case: int) -> int:
+        """
+        @brief Retourne la valeur de la tuile placée dans une case
+        @param code: Code entier de l'état
+        @param case: Indice de la case (ligne * colonnes + colonne)
+        @return: Valeur de la tuile
+        """
+        return (code >> self.decalages[case]) & self.masque
+
+    def case_vide(self, code: int) -> int:
+        """
+        @brief Retourne l'indice de la case vide d'un code
+        @param code: Code entier de l'état
+        @return: Indice de la case contenant 0
+        """
+        for case in range(self.taille):
+            if not (code >> self.decalages[case]) & self.masque:
+                return case
+        raise ValueError("Il n'y a pas de case avec un 0.")
+
+    def successeurs(self, code: int, vide: int) -> list:
+        """
+        @brief Calcule les états atteignables en un mouvement
+        @param code: Code entier de l'état courant
+        @param vide: Indice de la case vide dans l'état courant
+        @return: Liste de couples (code suivant, nouvelle case vide)
+
+        La case vide contient 0, déplacer la tuile v de la case c vers la case
+        vide revient donc à retirer v à la position c et à l'ajouter à la position vide.
+        """
+        decalages = self.decalages
+        masque = self.masque
+        decalage_vide = decalages[vide]
+        suivants = []
+        for case in self.voisins[vide]:
+            valeur = (code >> decalages[case]) & masque
+            suivants.append((code - (valeur << decalages[case]) + (valeur << decalage_vide), case))
+        return suivants
+
+    def successeurs_heuristique(self, code: int, vide: int, table: list) -> list:
+        """
+        @brief Calcule les états atteignables en un mouvement et la variation de l'heuristique
+        @param code: Code entier de l'état courant
+        @param vide: Indice de la case vide dans l'état courant
+        @param table: Coût additif par tuile, table[valeur][case]
+        @return: Liste de triplets (code suivant, nouvelle case vide, variation de h)
+
+        Un mouvement ne déplace qu'une tuile, de sa case vers la case vide :
+        pour une heuristique somme de coûts par tuile, la variation vaut
+        table[valeur][vide] - table[valeur][case] et se calcule en O(1).
+        """
+        decalages = self.decalages
+        masque = self.masque
+        decalage_vide = decalages[vide]
+        suivants = []
+        for case in self.voisins[vide]:
+            valeur = (code >> decalages[case]) & masque
+            couts = table[valeur]
+            suivants.append((code - (valeur << decalages[case]) + (valeur << decalage_vide), case, couts[vide] - couts[case]))
+        return suivants
+
+    def vers_positions(self, code: int) -> list:
+        """
+        @brief Convertit un code en liste des positions de chaque tuile
+        @param code: Code entier de l'état
+        @return: Liste où l'indice est la valeur de la tuile et la valeur sa case
+        """
+        positions = [0] * self.taille
+        for case, decalage in enumerate(self.decalages):
+            positions[(code >> decalage) & self.masque] = case
+        return positions
+
+    def deplacer(self, code: int, vide: int, direction: str):
+        """
+        @brief Déplace la case vide dans une direction
+        @param code: Code entier de l'état courant
+        @param vide: Indice de la case vide dans l'état courant
+        @param direction: Une des lettres de DIRECTIONS ('h', 'b', 'g' ou 'd')
+        @return: Couple (code suivant, nouvelle case vide), None si le mouvement est impossible
+        """
+        i, j = divmod(vide, self.colonnes)
+        di, dj = DEPLACEMENTS[direction]
+        if not (0 <= i + di < self.lignes and 0 <= j + dj < self.colonnes):
+            return None
+        case = vide + di * self.colonnes + dj
+        valeur = (code >> self.decalages[case]) & self.masque
+        return code - (valeur << self.decalages[case]) + (valeur << self.decalages[vide]), case
+
+    def direction(self, vide: int, case: int) -> str:
+        """
+        @brief Retourne la direction du déplacement de la case vide entre deux cases voisines
+        """
+        return DIRECTIONS[self.indices_directions[vide][case]]
+
+    def rejouer(self, code: int, mouvements: str) -> list:
+        """
+        @brief Applique une suite de déplacements de la case vide
+        @param code: Code entier de l'état de départ
+        @param mouvements: Lettres de DIRECTIONS
+        @return: Liste des codes des états traversés, départ compris
+        @throws ValueError si un déplacement sort du plateau
+        """
+        vide = self.case_vide(code)
+        codes = [code]
+        for direction in mouvements:
+            suivant = self.deplacer(code, vide, direction)
+            if suivant is None:
+                raise ValueError(f"Déplacement impossible : {direction}")
+            code, vide = suivant
+            codes.append(code)
+        return codes
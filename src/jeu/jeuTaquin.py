@@ -1,26 +1,93 @@
 import random
+from jeu.etatCompact import CodageEtat, parite_permutation
+
+def etat_final_standard(lignes: int, colonnes: int) -> dict:
+    """
+    @brief Calcule l'état final habituel : tuiles dans l'ordre, case vide en bas à droite
+    @param lignes: Nombre de lignes du plateau
+    @param colonnes: Nombre de colonnes du plateau
+    @return: Dictionnaire associant chaque valeur à sa position finale
+    """
+    final_state = {i: divmod(i - 1, colonnes) for i in range(1, lignes * colonnes)}
+    final_state[0] = (lignes - 1, colonnes - 1)
+    return final_state
+
+def etat_final_spirale(lignes: int, colonnes: int) -> dict:
+    """
+    @brief Calcule un état final en spirale : tuiles dans le sens horaire depuis le coin haut gauche, case vide au centre
+    @param lignes: Nombre de lignes du plateau
+    @param colonnes: Nombre de colonnes du plateau
+    @return: Dictionnaire associant chaque valeur à sa position finale
+    """
+    cases = []
+    haut, bas, gauche, droite = 0, lignes - 1, 0, colonnes - 1
+    while haut <= bas and gauche <= droite:
+        cases += [(haut, j) for j in range(gauche, droite + 1)]
+        cases += [(i, droite) for i in range(haut + 1, bas + 1)]
+        if haut < bas:
+            cases += [(bas, j) for j in range(droite - 1, gauche - 1, -1)]
+        if gauche < droite:
+            cases += [(i, gauche) for i in range(bas - 1, haut, -1)]
+        haut, bas, gauche, droite = haut + 1, bas - 1, gauche + 1, droite - 1
+    final_state = {i: cases[i - 1] for i in range(1, lignes * colonnes)}
+    final_state[0] = cases[-1]
+    return final_state
+
+def etat_depuis_plateau(plateau: list, colonnes: int) -> dict:
+    """
+    @brief Construit un état à partir des valeurs du plateau lues ligne par ligne
+    @param plateau: Liste où l'indice est la case et la valeur la tuile qui s'y trouve (0 pour la case vide)
+    @param colonnes: Nombre de colonnes du plateau
+    @return: Dictionnaire associant chaque valeur à sa position
+    """
+    return {valeur: divmod(case, colonnes) for case, valeur in enumerate(plateau)}
+
+def lire_dimensions(texte: str) -> tuple:
+    """
+    @brief Lit les dimensions d'un plateau : "k" pour k x k ou "LxC" pour L lignes et C colonnes
+    @param texte: Dimensions saisies
+    @return: Couple (lignes, colonnes)
+    @throws ValueError si le texte n'est pas de cette forme
+    """
+    lignes, _, colonnes = texte.strip().lower().partition('x')
+    lignes = int(lignes)
+    return lignes, int(colonnes) if colonnes else lignes
 
 class JeuTaquin:
     
-    def __init__(self, k: int):
+    def __init__(self, k: int, colonnes: int | None = None, etat_final: dict | None = None):
         """
         @brief Initialise une nouvelle instance du jeu de taquin
-        @param k: Dimension du plateau de jeu (k x k)
-        @throws ValueError si k < 2
+        @param k: Nombre de lignes du plateau de jeu
+        @param colonnes: Nombre de colonnes du plateau de jeu (défaut: k, plateau carré)
+        @param etat_final: Position finale de chaque tuile (défaut: etat_final_standard)
+        @throws ValueError si le plateau a moins de 2 lignes ou colonnes, ou si l'état final n'est pas valide
         
-        Initialise un nouveau jeu avec un plateau de taille k x k.
-        Les positions finales sont calculées pour chaque tuile,
-        avec la case vide (0) placée en bas à droite.
+        Initialise un nouveau jeu avec un plateau de taille k x colonnes.
+        Sans état final fourni, les tuiles sont rangées dans l'ordre avec la
+        case vide (0) placée en bas à droite. Les cases finales de chaque
+        tuile sont précalculées dans final_cases, final_rows et final_columns.
         """
-        if k < 2:
+        colonnes = colonnes or k
+        if k < 2 or colonnes < 2:
             raise ValueError("La taille doit etre supérieure ou égal à 2.")
-        self.k = k
-        self.size = self.k * self.k
+        self.lignes = k
+        self.colonnes = colonnes
+        self.size = self.lignes * self.colonnes
         self.current_state = None
         self.empty_pos = None
-        self.solution_path = []
-        self.final_positions = {i: ((i-1)//self.k, (i-1)%self.k) for i in range(1, self.size)}
-        self.final_positions[0] = (self.k-1, self.k-1)
+        self.solution_path = ""
+        self.solution_depart = None
+        self.statistiques = None
+        self.codage = CodageEtat(self.lignes, self.colonnes)
+        final_positions = etat_final_standard(self.lignes, self.colonnes) if etat_final is None else dict(etat_final)
+        self.verifier_etat(final_positions)
+        self.final_positions = final_positions
+        self.final_cases = [0] * self.size
+        for val, (i, j) in final_positions.items():
+            self.final_cases[val] = i * self.colonnes + j
+        self.final_rows = [case // self.colonnes for case in self.final_cases]
+        self.final_columns = [case % self.colonnes for case in self.final_cases]
         
     def display_final_grid(self):
         """
@@ -29,7 +96,7 @@ class JeuTaquin:
         Affiche la disposition finale attendue du plateau où chaque tuile
         est à sa position cible.
         """
-        grid = [[0] * self.k for _ in range(self.k)]
+        grid = [[0] * self.colonnes for _ in range(self.lignes)]
         for val, (i, j) in self.final_positions.items():
             grid[i][j] = val
         
@@ -38,28 +105,85 @@ class JeuTaquin:
                 print(case, end=' ')
             print()
         
-    def get_k(self) -> int:
+    def get_dimensions(self) -> tuple:
+        """
+        @brief Retourne les dimensions du plateau
+        @return: Couple (lignes, colonnes)
+        """
+        return self.lignes, self.colonnes
+
+    def verifier_etat(self, state: dict) -> None:
+        """
+        @brief Vérifie qu'un état place chaque tuile de 0 à size - 1 dans une case distincte du plateau
+        @param state: Dictionnaire associant les valeurs des tuiles à leurs positions
+        @throws ValueError si l'état n'est pas une configuration du plateau
         """
-        @brief Retourne la dimension du plateau
-        @return: La dimension k du plateau k x k
+        if sorted(state) != list(range(self.size)):
+            raise ValueError(f"L'état doit contenir les valeurs de 0 à {self.size - 1}.")
+        cases = {tuple(pos) for pos in state.values()}
+        if len(cases) != self.size or not all(0 <= i < self.lignes and 0 <= j < self.colonnes for i, j in cases):
+            raise ValueError(f"L'état doit occuper chaque case d'une grille {self.lignes}x{self.colonnes} une seule fois.")
+
+    def encoder_etat(self, state: dict) -> int:
+        """
+        @brief Convertit un état au format dictionnaire en code compact
+        @param state: Dictionnaire associant les valeurs des tuiles à leurs positions
+        @return: Code entier de l'état (voir CodageEtat)
         """
-        return self.k
+        return self.codage.encoder(state)
 
-    def generate_random_state(self) -> dict:
+    def decoder_etat(self, code: int) -> dict:
+        """
+        @brief Convertit un code compact en état au format dictionnaire
+        @param code: Code entier de l'état (voir CodageEtat)
+        @return: Dictionnaire associant les valeurs des tuiles à leurs positions
+        """
+        return self.codage.decoder(code)
+
+    def generate_random_state(self, generateur: random.Random | None = None) -> dict:
         """
         @brief Génère un état initial aléatoire résolvable
+        @param generateur: Générateur aléatoire à utiliser, pour des tirages reproductibles (défaut: module random)
         @return: Dictionnaire représentant un état initial valide et résolvable
         
-        Génère une configuration aléatoire du plateau qui garantit
-        l'existence d'une solution vers l'état final.
-        """
-        while True:
-            positions = [(i, j) for i in range(self.k) for j in range(self.k)]
-            random.shuffle(positions)
-            state = {i: positions[i] for i in range(self.size)}
-            if self.resolvable_grille(state):
-                self.set_current_state(state)
-                return state
+        Tire une permutation uniforme des cases en O(n). Si elle n'est pas
+        résolvable, échanger deux tuiles (hors case vide) change la parité de
+        la permutation sans déplacer la case vide et la rend résolvable : les
+        états résolvables restent équiprobables, sans tirage rejeté.
+        """
+        generateur = generateur or random
+        positions = [(i, j) for i in range(self.lignes) for j in range(self.colonnes)]
+        generateur.shuffle(positions)
+        state = {i: positions[i] for i in range(self.size)}
+        if not self.resolvable_grille(state):
+            state[1], state[2] = state[2], state[1]
+        self.set_current_state(state)
+        return state
+
+    def generate_random_walk_state(self, longueur: int, generateur: random.Random | None = None) -> dict:
+        """
+        @brief Génère un état par une marche aléatoire depuis l'état final
+        @param longueur: Nombre de mouvements de la marche
+        @param generateur: Générateur aléatoire à utiliser, pour des tirages reproductibles (défaut: module random)
+        @return: Dictionnaire représentant un état résolvable en au plus longueur mouvements
+        
+        La case vide ne revient jamais immédiatement sur la case qu'elle vient
+        de quitter : la distance optimale de l'état obtenu est au plus longueur,
+        de même parité, et croît avec la longueur de la marche.
+        """
+        generateur = generateur or random
+        codage = self.codage
+        code = codage.encoder(self.final_positions)
+        vide = codage.case_vide(code)
+        precedente = None
+        for _ in range(longueur):
+            case = generateur.choice([voisine for voisine in codage.voisins[vide] if voisine != precedente])
+            valeur = codage.valeur(code, case)
+            code += (valeur << codage.decalages[vide]) - (valeur << codage.decalages[case])
+            precedente, vide = vide, case
+        state = codage.decoder(code)
+        self.set_current_state(state)
+        return state
 
     def set_current_state(self, state: dict) -> None:
         """
@@ -94,7 +218,7 @@ class JeuTaquin:
         possible_moves = [(-1, 0), (1, 0), (0, -1), (0, 1)]
         for posi, posj in possible_moves:
             new_i, new_j = i + posi, j + posj
-            if 0 <= new_i < self.k and 0 <= new_j < self.k:
+            if 0 <= new_i < self.lignes and 0 <= new_j < self.colonnes:
                 new_pos = (new_i, new_j)
                 value = self.get_position_value(new_pos)
                 if value is not None:
@@ -116,23 +240,21 @@ class JeuTaquin:
         @param state: État à vérifier
         @return: True si l'état est résolvable, False sinon
         
-        Utilise le théorème des inversions pour déterminer
-        si une configuration peut être résolue.
+        Utilise le théorème des inversions, relatif à l'état final : chaque
+        mouvement change à la fois la parité de la permutation qui envoie
+        chaque case sur la case finale de sa tuile et celle de la distance de
+        Manhattan entre la case vide et sa case finale. Un état est résolvable
+        si et seulement si ces deux parités sont égales, quelles que soient
+        les dimensions du plateau et l'état final. La parité est obtenue par
+        décomposition en cycles, en O(n).
         """
-        inversions = 0
-        values = [val for i in range(self.k) for j in range(self.k) for val, pos in state.items() if pos == (i, j) and val != 0]
-        
-        # Compter les inversions
-        for i in range(len(values)-1):
-            for j in range(i+1, len(values)):
-                if values[i] > values[j]:
-                    inversions += 1
+        plateau = [0] * self.size
+        for val, (i, j) in state.items():
+            plateau[i * self.colonnes + j] = self.final_cases[val]
         
-        if self.k % 2 == 1:
-            return inversions % 2 == 0
-        else:
-            empty_row = state[0][0]
-            return (inversions + empty_row) % 2 == 1
+        empty_i, empty_j = state[0]
+        distance_vide = abs(empty_i - self.final_rows[0]) + abs(empty_j - self.final_columns[0])
+        return parite_permutation(plateau) == distance_vide % 2
 
     def is_final_state(self, state=None) -> bool:
         """
@@ -163,11 +285,11 @@ class JeuTaquin:
         
         if (direction == 'haut' or direction == 'h') and i > 0:
             new_pos = (i - 1, j)
-        elif (direction == 'bas' or direction == 'b') and i < self.k - 1:
+        elif (direction == 'bas' or direction == 'b') and i < self.lignes - 1:
             new_pos = (i + 1, j)
         elif (direction == 'gauche' or direction == 'g') and j > 0:
             new_pos = (i, j - 1)
-        elif (direction == 'droite' or direction == 'd') and j < self.k - 1:
+        elif (direction == 'droite' or direction == 'd') and j < self.colonnes - 1:
             new_pos = (i, j + 1)
         
         if new_pos:
@@ -192,29 +314,51 @@ class JeuTaquin:
         new_state[0] = pos2
         return new_state
     
+    def enregistrer_solution(self, etat_initial: dict, mouvements: str) -> None:
+        """
+        @brief Enregistre la solution trouvée par un algorithme de recherche
+        @param etat_initial: État de départ de la solution
+        @param mouvements: Déplacements successifs de la case vide ('h', 'b', 'g', 'd')
+        """
+        self.solution_depart = dict(etat_initial)
+        self.solution_path = mouvements
+
+    def etats_solution(self):
+        """
+        @brief Rejoue la solution depuis son état de départ
+        @return: Générateur des états traversés, départ compris
+        @throws ValueError si un mouvement de la solution est impossible
+        
+        Les états sont reconstruits à la demande avec moves : l'état actuel
+        du jeu suit la solution et vaut l'état final à la fin.
+        """
+        if self.solution_depart is None:
+            return
+        self.set_current_state(dict(self.solution_depart))
+        yield self.current_state
+        for direction in self.solution_path:
+            if not self.moves(direction):
+                raise ValueError(f"Mouvement impossible dans la solution : {direction}")
+            yield self.current_state
+
     def afficher_chemin_solution(self) -> None:
-        if not self.solution_path:
+        """
+        @brief Affiche chaque état du chemin de la solution
+        
+        solution_path contient les déplacements de la case vide depuis
+        solution_depart, rejoués un à un.
+        """
+        if self.solution_depart is None:
             print("Aucun chemin de solution disponible")
             return
         
         print("\nChemin de la solution: ")
-        for i in range(len(self.solution_path)):
-            state_str = self.solution_path[i]
-            state = {}
-
-            positions = state_str[1:-1].split(')(')
-
-            for index, pos in enumerate(positions):
-                coords = pos.split(',')
-                x = int(coords[0].strip())
-                y = int(coords[1].strip())
-                state[index] = (x, y)
-
+        print(f"Mouvements : {self.solution_path}")
+        for i, _ in enumerate(self.etats_solution()):
             print(f"\nÉtape {i}:")
-            self.set_current_state(state)
             self.afficher_etat()
 
-        print(f"\nNombre total de mouvements : {len(self.solution_path) - 1}")
+        print(f"\nNombre total de mouvements : {len(self.solution_path)}")
 
     def afficher_etat(self) -> None:
         """
@@ -227,7 +371,7 @@ class JeuTaquin:
             print("Aucun état actuel défini.")
             return
         
-        grid = [[0] * self.k for _ in range(self.k)]
+        grid = [[0] * self.colonnes for _ in range(self.lignes)]
         for val, (i, j) in self.current_state.items():
             grid[i][j] = val
 
@@ -1,33 +1,59 @@
 import sys
 import time
-from jeu.jeuTaquin import JeuTaquin
-from algorithme_recherche.astar import astar
-from algorithme_recherche.bfs import bfs
-from algorithme_recherche.dfs import dfs
-
-def calculate_final_state(k: int) -> dict:
-    """Calcule l'état final pour une grille de taille k."""
-    final_state = {i: ((i-1)//k, (i-1)%k) for i in range(1, k*k)}
-    final_state[0] = (k-1, k-1)
-    return final_state
+from jeu.jeuTaquin import JeuTaquin, lire_dimensions, etat_final_spirale, etat_depuis_plateau
+from algorithme_recherche.solveurs import resoudre
+from algorithme_recherche.cache import CacheSolutions
+from algorithme_recherche.heuristiques import HEURISTIQUES
 
 def main():
     try:
-        k = int(input("Entrez la taille de la grille (k x k): "))
-        if k < 2:
+        lignes, colonnes = lire_dimensions(input("Entrez la taille de la grille (k pour k x k, ou LxC): "))
+        if lignes < 2 or colonnes < 2:
             raise ValueError("La taille de la grille doit être d'au moins 2.")
+
+        print("États finaux disponibles : standard (s), case vide en haut à gauche (v), spirale (sp)")
+        goal = input("Entrez l'état final (vide pour standard): ").strip().lower()
+        if goal in ['', 's', 'standard']:
+            etat_final = None
+        elif goal in ['v', 'vide']:
+            etat_final = etat_depuis_plateau(list(range(lignes * colonnes)), colonnes)
+        elif goal in ['sp', 'spirale']:
+            etat_final = etat_final_spirale(lignes, colonnes)
+        else:
+            raise ValueError("État final invalide sélectionné.")
         
         print("Sélectionnez la stratégie de recherche:")
         print("1. A* Search (entrez 'astar' ou 'a')")
-        print("2. Breadth-First Search (entrez 'bfs' ou 'b')")
-        print("3. Depth-First Search (entrez 'dfs' ou 'd')")
-        print("4. Jeu humain (entrez 'h')")
-        strategy = input("Entrez la stratégie de recherche (astar/bfs/dfs/h): ").strip().lower()
+        print("2. A* à poids décroissants, meilleure solution dans le temps imparti (entrez 'arastar' ou 'ar')")
+        print("3. Breadth-First Search (entrez 'bfs' ou 'b')")
+        print("4. Depth-First Search (entrez 'dfs' ou 'd')")
+        print("5. Iterative-Deepening DFS (entrez 'iddfs' ou 'id')")
+        print("6. IDA* Search (entrez 'idastar' ou 'i')")
+        print("7. SMA*, A* à mémoire bornée (entrez 'smastar' ou 'sm')")
+        print("8. Bidirectional BFS (entrez 'bibfs' ou 'bb')")
+        print("9. A* parallèle (entrez 'hdastar' ou 'p')")
+        print("10. Table précalculée, grilles d'au plus 10 cases (entrez 'table' ou 't')")
+        print("11. Jeu humain (entrez 'h')")
+        strategy = input("Entrez la stratégie de recherche (astar/arastar/bfs/dfs/iddfs/idastar/smastar/bibfs/hdastar/table/h): ").strip().lower()
 
-        if strategy not in ['astar', 'bfs', 'dfs', 'h', 'a', 'b', 'd']:
+        if strategy not in ['astar', 'arastar', 'bfs', 'dfs', 'iddfs', 'idastar', 'smastar', 'bibfs', 'hdastar', 'table', 'h', 'a', 'ar', 'b', 'd', 'id', 'i', 'sm', 'bb', 'p', 't']:
             print("Stratégie invalide sélectionnée.")
             sys.exit(1)
 
+        options = {}
+        if strategy in ['astar', 'a', 'arastar', 'ar', 'idastar', 'i', 'smastar', 'sm', 'hdastar', 'p']:
+            print(f"Heuristiques disponibles : {', '.join(HEURISTIQUES)}")
+            heuristique = input("Entrez l'heuristique (vide pour celle par défaut): ").strip().lower()
+            if heuristique:
+                if heuristique not in HEURISTIQUES:
+                    print("Heuristique invalide sélectionnée.")
+                    sys.exit(1)
+                options['heuristique'] = heuristique
+        if strategy in ['smastar', 'sm']:
+            memoire = input("Entrez le budget mémoire en Mo (vide pour 1 000 000 nœuds): ").strip()
+            if memoire:
+                options['memoire_mo'] = float(memoire)
+
         show_path = input("Voulez-vous voir le chemin de la solution de la grille? (o/n): ").strip().lower()
         stocker_chemin = show_path in ['o', 'oui', 'y', 'yes']
 
@@ -35,12 +61,12 @@ def main():
         print(f"Erreur: {e}")
         sys.exit(1)
 
-    jeu = JeuTaquin(k)
+    jeu = JeuTaquin(lignes, colonnes, etat_final)
 
     initial_state = jeu.generate_random_state()
     jeu.set_current_state(initial_state)
 
-    final_state = calculate_final_state(k)
+    final_state = jeu.final_positions
 
     print("\nÉtat initial:")
     jeu.afficher_etat()
@@ -49,23 +75,50 @@ def main():
     print()
 
     if strategy != 'h':
+        # Les solutions déjà calculées (ou celles de leur image par symétrie) sont relues sur disque
+        cache = CacheSolutions()
         start_time = time.time()
         result = None
         
         if strategy in ['bfs', 'b']:
             print("Lancement de la recherche BFS:")
-            result = bfs(jeu, initial_state, final_state, stocker_chemin=stocker_chemin)
+            result = resoudre('bfs', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin)
         elif strategy in ['astar', 'a']:
             print("Lancement de la recherche A*:")
-            result = astar(jeu, initial_state, final_state, stocker_chemin=stocker_chemin)
+            result = resoudre('astar', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin, **options)
+        elif strategy in ['arastar', 'ar']:
+            print("Lancement de la recherche A* à poids décroissants:")
+            result = resoudre('arastar', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin, **options)
         elif strategy in ['dfs', 'd']:
             print("Lancement de la recherche DFS:")
-            result = dfs(jeu, initial_state, final_state, stocker_chemin=stocker_chemin)
+            result = resoudre('dfs', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin)
+        elif strategy in ['iddfs', 'id']:
+            print("Lancement de la recherche DFS itérative:")
+            result = resoudre('iddfs', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin)
+        elif strategy in ['smastar', 'sm']:
+            print("Lancement de la recherche SMA*:")
+            result = resoudre('smastar', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin, **options)
+        elif strategy in ['bibfs', 'bb']:
+            print("Lancement de la recherche BFS bidirectionnelle:")
+            result = resoudre('bibfs', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin)
+        elif strategy in ['hdastar', 'p']:
+            print("Lancement de la recherche A* parallèle:")
+            result = resoudre('hdastar', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin, **options)
+        elif strategy in ['idastar', 'i']:
+            print("Lancement de la recherche IDA*:")
+            result = resoudre('idastar', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin, **options)
+        elif strategy in ['table', 't']:
+            print("Lecture de la table précalculée:")
+            result = resoudre('table', jeu, initial_state, final_state, cache=cache, stocker_chemin=stocker_chemin)
         
         end_time = time.time()
         execution_time = end_time - start_time
         
         print(f"\nTemps d'exécution: {execution_time:.12f} secondes")
+        if jeu.statistiques is not None:
+            if jeu.statistiques.algorithme == "cache":
+                print("Solution lue dans le cache des solutions.")
+            print(f"Statistiques: {jeu.statistiques}")
 
         if result:
             print("\nSolution trouvée!")
@@ -73,7 +126,7 @@ def main():
             jeu.set_current_state(result)
             jeu.afficher_etat()
             
-            if stocker_chemin and jeu.solution_path:
+            if stocker_chemin and jeu.solution_depart is not None:
                 if show_path in ['o', 'oui', 'y', 'yes']:
                     jeu.afficher_chemin_solution()
         else:
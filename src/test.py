@@ -2,25 +2,42 @@ import time
 import os
 from datetime import datetime
 from jeu.jeuTaquin import JeuTaquin
-from algorithme_recherche.bfs import bfs
-from algorithme_recherche.dfs import dfs
-from algorithme_recherche.astar import astar
+from algorithme_recherche.solveurs import resoudre
+from algorithme_recherche.cache import CacheSolutions
+from algorithme_recherche.batch import solve_batch
 
 class Colors:
     ASTAR = '\033[94m'  # Bleu
     BFS = '\033[92m'    # Vert
     DFS = '\033[93m'    # Jaune
+    IDDFS = '\033[33m'  # Orange
+    IDASTAR = '\033[96m' # Cyan
+    BIBFS = '\033[95m'   # Magenta
+    TABLE = '\033[97m'   # Blanc
     FAIL = '\033[91m'   # Rouge
     END = '\033[0m'     # reset
 
 precision:int = 12
+# Heuristique utilisée par taille de grille (voir heuristiques.HEURISTIQUES)
+# Les bases de motifs sont construites au premier test puis réutilisées (voir pdb.py)
+heuristiques_astar:dict = {2: "manhattan", 3: "linear_conflict", 4: "manhattan_penalite"}
+heuristiques_idastar:dict = {2: "manhattan", 3: "pdb", 4: "pdb"}
+# Longueur des marches aléatoires depuis l'état final par taille de grille : un état uniforme
+# du 4x4 est en général hors de portée de A* dans sa limite de temps
+longueurs_marche:dict = {4: 40}
+# Nombre de processus utilisés pour les tests (1 : exécution séquentielle)
+workers:int = os.cpu_count() or 1
+# Relit les solutions déjà calculées lors des lancements précédents (exécution séquentielle uniquement) ;
+# les temps mesurés sont alors ceux de la lecture, à désactiver pour comparer les algorithmes
+utiliser_cache:bool = False
+cache:CacheSolutions | None = CacheSolutions() if utiliser_cache else None
 
 def test_bfs(jeu, initial_state, final_state=None):
     start_time = time.time()
     if final_state is None:
         return None
     try:
-        result = bfs(jeu, initial_state.copy(), final_state)
+        result = resoudre('bfs', jeu, initial_state.copy(), final_state, cache=cache)
         if result is None:
             return time.time() - start_time, False
         return time.time() - start_time, True
@@ -28,12 +45,25 @@ def test_bfs(jeu, initial_state, final_state=None):
         print(f"{Colors.FAIL}Erreur dans bfs : {e}{Colors.END}")
         return float('inf'), False
 
+def test_bidirectional_bfs(jeu, initial_state, final_state=None):
+    start_time = time.time()
+    if final_state is None:
+        return None
+    try:
+        result = resoudre('bibfs', jeu, initial_state.copy(), final_state, cache=cache)
+        if result is None:
+            return time.time() - start_time, False
+        return time.time() - start_time, True
+    except Exception as e:
+        print(f"{Colors.FAIL}Erreur dans bfs bidirectionnel : {e}{Colors.END}")
+        return float('inf'), False
+
 def test_dfs(jeu, initial_state, final_state=None):
     start_time = time.time()
     if final_state is None:
         return None
     try:
-        result = dfs(jeu, initial_state.copy(), final_state)
+        result = resoudre('dfs', jeu, initial_state.copy(), final_state, cache=cache)
         if result is None:
             return time.time() - start_time, False
         return time.time() - start_time, True
@@ -41,13 +71,26 @@ def test_dfs(jeu, initial_state, final_state=None):
         print(f"{Colors.FAIL}Erreur dans dfs : {e}{Colors.END}")
         return float('inf'), False
 
+def test_iddfs(jeu, initial_state, final_state=None):
+    start_time = time.time()
+    if final_state is None:
+        return None
+    try:
+        result = resoudre('iddfs', jeu, initial_state.copy(), final_state, cache=cache)
+        if result is None:
+            return time.time() - start_time, False
+        return time.time() - start_time, True
+    except Exception as e:
+        print(f"{Colors.FAIL}Erreur dans iddfs : {e}{Colors.END}")
+        return float('inf'), False
+
 def test_astar(jeu, initial_state, final_state=None):
     if final_state is None:
         return None, False
     
     start_time = time.time()
     try:
-        result = astar(jeu, initial_state.copy(), final_state)
+        result = resoudre('astar', jeu, initial_state.copy(), final_state, cache=cache, heuristique=heuristiques_astar.get(jeu.lignes, "manhattan"))
         if result is None:
             return time.time() - start_time, False
         return time.time() - start_time, True
@@ -55,37 +98,62 @@ def test_astar(jeu, initial_state, final_state=None):
         print(f"{Colors.FAIL}Erreur dans A* : {e}{Colors.END}")
         return float('inf'), False
 
+def test_idastar(jeu, initial_state, final_state=None):
+    if final_state is None:
+        return None, False
+    
+    start_time = time.time()
+    try:
+        result = resoudre('idastar', jeu, initial_state.copy(), final_state, cache=cache, heuristique=heuristiques_idastar.get(jeu.lignes, "manhattan"))
+        if result is None:
+            return time.time() - start_time, False
+        return time.time() - start_time, True
+    except Exception as e:
+        print(f"{Colors.FAIL}Erreur dans IDA* : {e}{Colors.END}")
+        return float('inf'), False
+
+def test_table(jeu, initial_state, final_state=None):
+    if final_state is None:
+        return None, False
+    
+    start_time = time.time()
+    try:
+        result = resoudre('table', jeu, initial_state.copy(), final_state, cache=cache)
+        if result is None:
+            return time.time() - start_time, False
+        return time.time() - start_time, True
+    except Exception as e:
+        print(f"{Colors.FAIL}Erreur dans table : {e}{Colors.END}")
+        return float('inf'), False
+
+def generer_instance(jeu, size):
+    if size in longueurs_marche:
+        return jeu.generate_random_walk_state(longueurs_marche[size])
+    return jeu.generate_random_state()
+
 def test(size, final_state=None):
     jeu = JeuTaquin(size)
-    initial_state = jeu.generate_random_state()
-    results = {'astar': [], 'bfs': [], 'dfs': []}
-    completed_tests = {'astar': 0, 'bfs': 0, 'dfs': 0}
-    failed_attempts = {'astar': 0, 'bfs': 0, 'dfs': 0}
+    initial_state = generer_instance(jeu, size)
+    results = {'astar': [], 'bfs': [], 'dfs': [], 'iddfs': [], 'idastar': [], 'bibfs': [], 'table': []}
+    completed_tests = {'astar': 0, 'bfs': 0, 'dfs': 0, 'iddfs': 0, 'idastar': 0, 'bibfs': 0, 'table': 0}
+    failed_attempts = {'astar': 0, 'bfs': 0, 'dfs': 0, 'iddfs': 0, 'idastar': 0, 'bibfs': 0, 'table': 0}
     
-    # Pour la taille 4, on ne teste que A*
+    # Pour la taille 4, bfs et dfs ne sont pas en mesure de résoudre le jeu
     if size == 4:
-        try:
-            jeu_copy = JeuTaquin(size)
-            jeu_copy.set_current_state(initial_state.copy())
-            time_result, success = test_astar(jeu_copy, initial_state.copy(), final_state)
-            if success and time_result is not None:
-                results['astar'].append(time_result)
-                completed_tests['astar'] += 1
-                print(f"{Colors.ASTAR}A* terminé en {time_result:{precision}f} secondes{Colors.END}")
-            else:
-                failed_attempts['astar'] += 1
-                print(f"{Colors.FAIL}A* : Solution non trouvée{Colors.END}")
-        except Exception as e:
-            print(f"{Colors.FAIL}Erreur inattendue : {e}{Colors.END}")
-            failed_attempts['astar'] += 1
-        return results, completed_tests, failed_attempts
-    
-    # Pour la taille 3, on teste tous les algorithmes
-    algorithms = [
-        ('astar', test_astar, Colors.ASTAR),
-        ('bfs', test_bfs, Colors.BFS),
-        ('dfs', test_dfs, Colors.DFS)
-    ]
+        algorithms = [
+            ('astar', test_astar, Colors.ASTAR),
+            ('idastar', test_idastar, Colors.IDASTAR)
+        ]
+    else:
+        algorithms = [
+            ('astar', test_astar, Colors.ASTAR),
+            ('bfs', test_bfs, Colors.BFS),
+            ('bibfs', test_bidirectional_bfs, Colors.BIBFS),
+            ('dfs', test_dfs, Colors.DFS),
+            ('iddfs', test_iddfs, Colors.IDDFS),
+            ('idastar', test_idastar, Colors.IDASTAR),
+            ('table', test_table, Colors.TABLE)
+        ]
     
     try:
         for name, test, color in algorithms:
@@ -106,10 +174,45 @@ def test(size, final_state=None):
     
     return results, completed_tests, failed_attempts
 
-def multiple_tests(size, num_tests=10, final_state=None):
-    combined_results = {'astar': [], 'bfs': [], 'dfs': []}
-    total_completed = {'astar': 0, 'bfs': 0, 'dfs': 0}
-    total_failed = {'astar': 0, 'bfs': 0, 'dfs': 0}
+def multiple_tests_paralleles(size, num_tests=10, final_state=None, workers=None):
+    combined_results = {'astar': [], 'bfs': [], 'dfs': [], 'iddfs': [], 'idastar': [], 'bibfs': [], 'table': []}
+    total_completed = {'astar': 0, 'bfs': 0, 'dfs': 0, 'iddfs': 0, 'idastar': 0, 'bibfs': 0, 'table': 0}
+    total_failed = {'astar': 0, 'bfs': 0, 'dfs': 0, 'iddfs': 0, 'idastar': 0, 'bibfs': 0, 'table': 0}
+    
+    jeu = JeuTaquin(size)
+    code_final = jeu.encoder_etat(final_state)
+    instances = [(jeu.get_dimensions(), jeu.encoder_etat(generer_instance(jeu, size)), code_final) for _ in range(num_tests)]
+    algorithms = ['astar', 'idastar'] if size == 4 else ['astar', 'bfs', 'bibfs', 'dfs', 'iddfs', 'idastar', 'table']
+    options = {
+        'astar': {'heuristique': heuristiques_astar.get(size, "manhattan")},
+        'idastar': {'heuristique': heuristiques_idastar.get(size, "manhattan")}
+    }
+    
+    try:
+        for resultat in solve_batch(instances, algorithms, workers=workers, options=options):
+            name = resultat['algorithme']
+            color = getattr(Colors, name.upper())
+            if resultat['resolu']:
+                combined_results[name].append(resultat['temps'])
+                total_completed[name] += 1
+                print(f"{color}Test #{resultat['instance']+1} : {name.upper()} terminé en {resultat['temps']:{precision}f} secondes{Colors.END}")
+            else:
+                total_failed[name] += 1
+                message = f" ({resultat['erreur']})" if resultat['erreur'] else ""
+                print(f"{Colors.FAIL}Test #{resultat['instance']+1} : {name.upper()} : Solution non trouvée{message}{Colors.END}")
+    
+    except KeyboardInterrupt:
+        print("\n\nInterruption détectée. Sauvegarde des résultats partiels...")
+    
+    return combined_results, total_completed, total_failed
+
+def multiple_tests(size, num_tests=10, final_state=None, workers=1):
+    if workers > 1:
+        return multiple_tests_paralleles(size, num_tests, final_state, workers)
+    
+    combined_results = {'astar': [], 'bfs': [], 'dfs': [], 'iddfs': [], 'idastar': [], 'bibfs': [], 'table': []}
+    total_completed = {'astar': 0, 'bfs': 0, 'dfs': 0, 'iddfs': 0, 'idastar': 0, 'bibfs': 0, 'table': 0}
+    total_failed = {'astar': 0, 'bfs': 0, 'dfs': 0, 'iddfs': 0, 'idastar': 0, 'bibfs': 0, 'table': 0}
     
     try:
         for i in range(num_tests):
@@ -159,7 +262,11 @@ def format_resultat(grid_results):
     colors = {
         'astar': "🟦",
         'bfs': "🟩",
-        'dfs': "🟨"
+        'dfs': "🟨",
+        'iddfs': "🟧",
+        'idastar': "🟪",
+        'bibfs': "🟥",
+        'table': "⬛"
     }
 
     for size, results in grid_results.items():
@@ -196,12 +303,6 @@ def save_file(formatted_results, filename):
     except Exception as e:
         print(f"{Colors.FAIL}Erreur lors de la sauvegarde des résultats: {str(e)}{Colors.END}")
 
-def calculate_final_state(k: int) -> dict:
-    """Calcule l'état final pour une grille de taille k."""
-    final_state = {i: ((i-1)//k, (i-1)%k) for i in range(1, k*k)}
-    final_state[0] = (k-1, k-1)
-    return final_state
-
 def main():
     taille_grille = [2,3,4]
     num_tests = 1000
@@ -211,8 +312,8 @@ def main():
         print("Démarrage des tests: ")
         for size in taille_grille:
             print(f"\nTests pour grille {size}x{size}")
-            final_state = calculate_final_state(size)
-            results, completed, failed = multiple_tests(size, num_tests, final_state)
+            final_state = JeuTaquin(size).final_positions
+            results, completed, failed = multiple_tests(size, num_tests, final_state, workers)
             all_results[size] = calculate_statistics(results, completed, failed)
             
     except KeyboardInterrupt as e: